@@ -5,9 +5,13 @@ from datetime import datetime
 import json
 import threading
 from projects.merger.factory import MergerFactory
+from projects.merger.base_merger import BaseMerger
 import os
 from projects.code_move_routes import code_move_bp 
+from projects.code_move_handler import preload_project_schemas
 from projects.sheet_updater_routes import sheet_updater_bp
+from projects.gitlab_webhook_routes import gitlab_webhook_bp
+from projects.mirror_sync import sync_mirror, progress as mirror_progress
 from core.config_manager import ConfigurationManager
 from core.string_constants import StringConstants
 from encryption.token_manager import TokenManager
@@ -20,10 +24,18 @@ scheduler.start()
 
 app.register_blueprint(code_move_bp)
 app.register_blueprint(sheet_updater_bp)
+app.register_blueprint(gitlab_webhook_bp)
 
-# Store active merger instances by ticket type
-active_mergers = {}
+# Warm the Mantis project schema cache in the background
+threading.Thread(target=preload_project_schemas, daemon=True).start()
 
+# Keep the local Mantis/GitLab mirror fresh
+common_config = ConfigurationManager(config_file="configs/common.json")
+if str(common_config.get("MIRROR_ENABLED", "false")).lower() == "true":
+    scheduler.add_job(
+        sync_mirror, "interval", minutes=int(common_config.get("MIRROR_SYNC_MINUTES", 15)),
+        id="mirror_sync", next_run_time=datetime.now(), max_instances=1, coalesce=True
+    )
 
 # Paths to log directories
 LOGS_DIRECTORY = "logs"
@@ -54,16 +66,18 @@ def save_config(new_config):
 
 config = load_config()
 
-# Function to run the merge automation
-def run_merge_automation(ticket_type):
+# Function to run the merge automation, the caller holds the run lock of the ticket type
+def run_merge_automation(ticket_type, full_sweep=False):
     try:
         merger = MergerFactory.get_merger(ticket_type)
-        active_mergers[ticket_type] = merger
-        merger.run()
+        MergerFactory.set_shared_merger(ticket_type, merger)
+        merger.run(full_sweep=full_sweep)
         print(f"{ticket_type.title()} job executed successfully at {datetime.now()}")
         
     except Exception as e:
         print(f"Error executing {ticket_type} job: {e}")
+    finally:
+        BaseMerger.run_lock(ticket_type).release()
 
 
 # # Function to update the job schedule
@@ -90,12 +104,13 @@ def trigger_job(ticket_type):
     """
     Endpoint to trigger the merge automation job for a specific ticket type.
     """
-    merger = active_mergers.get(ticket_type)
-
-    if merger and merger.progress["status"] == "running":
+    # Held by a running sweep or webhook merge, released by run_merge_automation otherwise
+    if not BaseMerger.run_lock(ticket_type).acquire(blocking=False):
         return jsonify({"status": "error", "message": f"{ticket_type} job is already running."}), 400
 
-    threading.Thread(target=run_merge_automation, args=(ticket_type,)).start()
+    # ?full_sweep=true ignores the incremental state and re-checks every ticket and MR
+    full_sweep = str(request.args.get("full_sweep", "false")).lower() == "true"
+    threading.Thread(target=run_merge_automation, args=(ticket_type, full_sweep)).start()
     return jsonify({"status": "success", "message": f"{ticket_type.title()} job started."})
 
 
@@ -106,7 +121,7 @@ def get_progress(ticket_type):
     """
     Fetch current progress of the job for a specific ticket type.
     """
-    merger = active_mergers.get(ticket_type)
+    merger = MergerFactory.get_shared_merger(ticket_type, create=False)
 
     if not merger:
         return jsonify({"status": "idle", "percentage": 0})  # fallback for first-time view
@@ -216,6 +231,23 @@ def view_log_file(ticket_type, filename):
     return render_template("log_viewer.html", ticket_type=ticket_type, filename=filename, content=content)
 
 
+@app.route("/mirror-sync", methods=["GET", "POST"])
+def trigger_mirror_sync():
+    """
+    Endpoint to refresh the local Mantis/GitLab mirror now.
+    """
+    if mirror_progress["status"] == "running":
+        return jsonify({"status": "error", "message": "Mirror sync is already running."}), 400
+
+    threading.Thread(target=sync_mirror).start()
+    return jsonify({"status": "success", "message": "Mirror sync started."})
+
+
+@app.route("/mirror-sync/progress", methods=["GET"])
+def get_mirror_sync_progress():
+    return jsonify(mirror_progress)
+
+
 # Token management endpoint
 @app.route("/token-ui", methods=["GET", "POST"])
 def token_ui():
@@ -2,8 +2,25 @@ import logging
 from logging.handlers import TimedRotatingFileHandler
 import atexit
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+# Ticket being processed by the current thread, see LoggerSetup.ticket_context()
+_log_context = threading.local()
+
+
+class TicketContextFilter(logging.Filter):
+    """
+    Adds the ticket being processed by the current thread to every record as %(ticket_context)s,
+    so the lines of tickets processed in parallel can be told apart.
+    """
+
+    def filter(self, record):
+        ticket_id = getattr(_log_context, "ticket_id", None)
+        record.ticket_context = f"[MT#{ticket_id}] " if ticket_id is not None else ""
+        return True
+
 
 class LoggerSetup:
     _handlers_to_close = []
@@ -45,12 +62,14 @@ class LoggerSetup:
             utc=True                 # Use UTC time for rotation
         )
         handler.suffix = "%Y-%m-%d"  # Suffix for the rotated log files
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(ticket_context)s%(message)s'))
+        handler.addFilter(TicketContextFilter())
         logger.addHandler(handler)
 
         # Console handler for debugging
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(ticket_context)s%(message)s'))
+        console_handler.addFilter(TicketContextFilter())
         logger.addHandler(console_handler)
 
         logger.propagate = False
@@ -61,6 +80,23 @@ class LoggerSetup:
 
         return logger
 
+    @staticmethod
+    @contextmanager
+    def ticket_context(ticket_id):
+        """
+        Prefix the lines logged by the current thread with the given ticket until the block exits.
+
+        Usage:
+            with LoggerSetup.ticket_context(ticket_id):
+                logger.info("Processing")  # ... - INFO - [MT#423574] Processing
+        """
+        previous = getattr(_log_context, "ticket_id", None)
+        _log_context.ticket_id = ticket_id
+        try:
+            yield
+        finally:
+            _log_context.ticket_id = previous
+
     @staticmethod
     def _close_all_handlers():
         """
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from core.logging_config import LoggerSetup
+
+routing_logger = LoggerSetup.setup_logger("module_routing", "logs/module_routing")
+
+
+class ModuleRoutingRegistry:
+    """
+    Read-only module -> (developer ID, QA name) routing tables backed by configs/module_routing.json.
+
+    The file is parsed once into an immutable mapping that every thread reads without locking.
+    The file's modification time is re-checked at most every check_interval seconds, and the
+    tables are rebuilt only when it changed, so owners can be reassigned without a code deploy.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config_file="configs/module_routing.json", check_interval=5):
+        """
+        Parameters:
+            config_file (str): Path to the routing JSON file.
+            check_interval (float): Minimum seconds between two checks of the file's modification time.
+        """
+        self.config_file = config_file
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0
+        self._routes = MappingProxyType({})
+        self._fallback_category = None
+        self._default_qa = "Unassigned"
+        self._refresh(force=True)
+
+    @classmethod
+    def shared(cls, config_file="configs/module_routing.json"):
+        """
+        Return the registry shared by every caller of the given routing file.
+        """
+        with cls._instances_lock:
+            registry = cls._instances.get(config_file)
+            if registry is None:
+                registry = cls(config_file)
+                cls._instances[config_file] = registry
+            return registry
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+
+        with self._reload_lock:
+            if not force and now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+
+            try:
+                mtime = os.path.getmtime(self.config_file)
+            except OSError as e:
+                routing_logger.error(f"Module routing file {self.config_file} is not accessible: {e}")
+                return
+
+            if mtime == self._mtime:
+                return
+
+            try:
+                with open(self.config_file, "r") as file:
+                    data = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                # Keep serving the previous tables rather than dropping every route
+                routing_logger.error(f"Failed to load module routing from {self.config_file}: {e}")
+                return
+
+            routes = {
+                module: (route.get("developer"), route.get("qa"))
+                for module, route in data.get("MODULES", {}).items()
+            }
+
+            # Each attribute is swapped as a whole, readers never see a half-built table
+            self._default_qa = data.get("DEFAULT_QA", "Unassigned")
+            self._fallback_category = data.get("FALLBACK_CATEGORY")
+            self._routes = MappingProxyType(routes)
+            self._mtime = mtime
+            routing_logger.info(f"Loaded {len(routes)} module routes from {self.config_file}")
+
+    @property
+    def routes(self):
+        """
+        Read-only mapping of module name -> (developer ID, QA name).
+        """
+        self._refresh()
+        return self._routes
+
+    def route(self, module_name):
+        """
+        Return the (developer ID, QA name) pair for a module.
+
+        Unknown modules use the route of FALLBACK_CATEGORY when one is configured,
+        otherwise (None, DEFAULT_QA).
+        """
+        routes = self.routes
+        route = routes.get(module_name)
+        if route is None and self._fallback_category:
+            route = routes.get(self._fallback_category)
+        if route is None:
+            return None, self._default_qa
+        developer, qa = route
+        return developer, qa or self._default_qa
+
+    def get_developer(self, module_name):
+        return self.route(module_name)[0]
+
+    def get_qa(self, module_name):
+        return self.route(module_name)[1]
+
+    def route_tickets(self, tickets):
+        """
+        Route many Mantis tickets in one call.
+
+        Parameters:
+            tickets (list[dict]): Mantis issues including their 'category'.
+
+        Returns:
+            dict: Ticket ID -> {"developer": ID or None, "qa": QA name}
+        """
+        results = {}
+        for ticket in tickets:
+            if not ticket:
+                continue
+            developer, qa = self.route((ticket.get("category") or {}).get("name"))
+            results[ticket["id"]] = {"developer": developer, "qa": qa}
+        return results
@@ -0,0 +1,180 @@
+import asyncio
+from core.logging_config import LoggerSetup
+from encryption.token_manager import TokenManager
+from operations.utils import get_target_project
+from core.config_manager import ConfigurationManager
+from core.string_constants import StringConstants
+from operations.async_http_transport import AsyncHttpTransport
+from operations.gitlab_operations import GitLabOperations
+from operations.merge_result import MergeResult
+from operations.mr_router import MergeRequestRouter
+
+git_logger = LoggerSetup.setup_logger("git", "logs/git")
+
+
+class AsyncGitLabOperations:
+    """
+    Asyncio counterpart of GitLabOperations with the same method names and return values.
+
+    Unlike the blocking client it keeps no MR cache and does not update the local mirror.
+
+        async with AsyncGitLabOperations(StringConstants.REGRESSION) as gitlab:
+            merge_requests = await gitlab.get_merge_requests(urls)
+    """
+
+    # Merge checks do no I/O and are shared with the blocking client
+    _check_mergeability = GitLabOperations._check_mergeability
+    _classify_merge_response = GitLabOperations._classify_merge_response
+
+    def __init__(self, project):
+        """
+        Initialize AsyncGitLabOperations with the GitLab API base URL and authentication token.
+        """
+        config = ConfigurationManager(config_file=f"configs/{project}.json")
+
+        self.gitlab_path = config.get("GITLAB_PATH")
+
+        token_manager = TokenManager(key_file=config.get("KEY_FILE"), token_file=f"credentials/{StringConstants.TOKEN_PREFIX}{project}.txt")
+        tokens = token_manager.get_tokens()
+        self.auth_token = tokens["gitlab_token"]
+
+        self.headers = {
+            'PRIVATE-TOKEN': self.auth_token,
+            'Content-Type': 'application/json'
+        }
+
+        self.http = AsyncHttpTransport.from_config("gitlab", self.gitlab_path, config)
+        self.bulk_page_size = max(1, min(100, int(config.get("GITLAB_BULK_PAGE_SIZE", 100))))
+
+    async def __aenter__(self):
+        await self.http.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def close(self):
+        await self.http.close()
+
+    async def get_merge_request(self, merge_request_url):
+        """
+        Fetch merge request data by its URL.
+
+        Returns:
+            dict: Merge request data or None if an error occurs.
+        """
+        merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+        target_project_id = get_target_project(merge_request_url)
+        if not target_project_id or merge_request_ref is None:
+            return None
+        merge_request_id = merge_request_ref.iid
+
+        read_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests/{merge_request_id}"
+        try:
+            response = await self.http.get(read_mr_url, headers=self.headers)
+        except Exception as e:
+            git_logger.error(f'Error fetching merge request: {e}')
+            return None
+
+        if response.status_code == 200:
+            return response.json()
+        git_logger.error(f'Error fetching merge request: {response.text}')
+        return None
+
+    async def get_merge_requests(self, merge_request_urls):
+        """
+        Fetch many merge requests with as few GitLab requests as possible.
+
+        URLs are grouped by target project and read through the project list endpoint with
+        iids[], up to GITLAB_BULK_PAGE_SIZE (at most 100) MRs per request; the requests of all
+        projects are sent at once.
+
+        Returns:
+            dict: Merge request URL -> merge request data, or None if it could not be fetched.
+        """
+        results = {}
+        pending = {}
+        for merge_request_url in merge_request_urls:
+            if merge_request_url in results:
+                continue
+            results[merge_request_url] = None
+
+            target_project_id = get_target_project(merge_request_url)
+            merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+            if target_project_id and merge_request_ref is not None:
+                pending.setdefault(str(target_project_id), {}).setdefault(merge_request_ref.iid, []).append(merge_request_url)
+
+        chunks = []
+        for target_project_id, urls_by_iid in pending.items():
+            iids = list(urls_by_iid)
+            for start in range(0, len(iids), self.bulk_page_size):
+                chunks.append((target_project_id, iids[start:start + self.bulk_page_size]))
+
+        listed = await asyncio.gather(*(self._list_merge_requests(target_project_id, iids) for target_project_id, iids in chunks))
+        for (target_project_id, _), merge_requests in zip(chunks, listed):
+            urls_by_iid = pending[target_project_id]
+            for merge_request_data in merge_requests:
+                for merge_request_url in urls_by_iid.get(merge_request_data.get("iid"), []):
+                    results[merge_request_url] = merge_request_data
+        return results
+
+    async def _list_merge_requests(self, target_project_id, iids):
+        """
+        Read up to 100 merge requests of one project by IID.
+
+        Returns:
+            list: The merge requests GitLab returned; empty if the request failed.
+        """
+        list_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests"
+        params = [("iids[]", iid) for iid in iids] + [("state", "all"), ("per_page", len(iids))]
+        try:
+            response = await self.http.get(list_mr_url, headers=self.headers, params=params)
+        except Exception as e:
+            git_logger.error(f"Error fetching merge requests {iids} of project {target_project_id}: {e}")
+            return []
+
+        if response.status_code != 200:
+            git_logger.error(f"Error fetching merge requests {iids} of project {target_project_id}: {response.text}")
+            return []
+        return response.json()
+
+    async def merge_merge_request(self, merge_request_url, retries=3, delay=1, max_delay=8):
+        """
+        Merge a GitLab merge request after checking that it can be merged.
+
+        Returns:
+            MergeResult: The outcome; truthy only if the MR was merged.
+        """
+        merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+        target_project_id = get_target_project(merge_request_url)
+        if not target_project_id or merge_request_ref is None:
+            return MergeResult(MergeResult.NOT_MERGEABLE, "unknown target project")
+        merge_request_id = merge_request_ref.iid
+
+        merge_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests/{merge_request_id}/merge"
+
+        result = MergeResult(MergeResult.TRANSIENT_FAILURE, "not attempted")
+        for attempt in range(1, retries + 1):
+            result = self._check_mergeability(await self.get_merge_request(merge_request_url))
+
+            if result is None:
+                try:
+                    response = await self.http.put(merge_mr_url, headers=self.headers)
+                    result = self._classify_merge_response(merge_request_id, response)
+                except Exception as e:
+                    result = MergeResult(MergeResult.TRANSIENT_FAILURE, str(e))
+            if result:
+                return result
+
+            if result.outcome != MergeResult.TRANSIENT_FAILURE:
+                git_logger.error(f"Merge request {merge_request_id} cannot be merged: {result}")
+                return result
+
+            if attempt < retries:
+                wait = min(max_delay, delay * (2 ** (attempt - 1)))
+                git_logger.info(f"Attempt {attempt}: merge request {merge_request_id} not ready ({result}), retrying in {wait} seconds...")
+                await asyncio.sleep(wait)
+
+        git_logger.error(f"Exceeded maximum retry attempts. Merge request {merge_request_id} could not be merged: {result}")
+        return result
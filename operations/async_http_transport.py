@@ -0,0 +1,202 @@
+import asyncio
+import json
+import random
+import time
+import aiohttp
+from urllib.parse import urlparse
+from core.logging_config import LoggerSetup
+from operations.rate_limiter import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+
+http_logger = LoggerSetup.setup_logger("http", "logs/http")
+
+
+class AsyncResponse:
+    """
+    Fully read HTTP response, exposing the parts of requests.Response the clients use.
+    """
+
+    __slots__ = ("status_code", "text", "headers")
+
+    def __init__(self, status_code, text, headers):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHttpTransport:
+    """
+    aiohttp based counterpart of HttpTransport for clients running on an event loop.
+
+    One transport holds one aiohttp.ClientSession with a bounded keep-alive connection pool.
+    At most max_in_flight requests are sent at once; the rest wait on a semaphore instead of
+    opening more connections. With a rate limiter, every request also waits for a token of the
+    host's AdaptiveRateLimiter, the same one the sync HttpTransport uses, and reports its outcome
+    back to it. Answers with 429/503 are retried after the server's Retry-After delay or a
+    jittered exponential backoff. The session is bound to the event loop it was created on, so
+    the transport must be closed with close() (or used via "async with").
+    """
+
+    def __init__(self, name, base_url, pool_size=20, max_in_flight=100, connect_timeout=5,
+                 read_timeout=60, throttle_retries=3, backoff_base=1.0, backoff_cap=60.0, verify=False,
+                 rate_limiter=None):
+        """
+        Parameters:
+            name (str): Backend name used in logs and metrics (e.g. "mantis", "gitlab").
+            base_url (str): Base URL of the backend.
+            pool_size (int): Maximum number of open connections to the backend.
+            max_in_flight (int): Maximum number of requests awaiting a response at once.
+            connect_timeout (float): Connect timeout in seconds.
+            read_timeout (float): Read timeout in seconds.
+            throttle_retries (int): Retries of a request answered with 429/503.
+            backoff_base (float): Base delay in seconds of the exponential backoff.
+            backoff_cap (float): Maximum backoff delay in seconds.
+            verify (bool): Whether to verify TLS certificates.
+            rate_limiter (AdaptiveRateLimiter): Optional limiter of the backend's host.
+        """
+        self.name = name
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.throttle_retries = throttle_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.verify = verify
+        self.rate_limiter = rate_limiter
+
+        self._session = None
+        self._semaphore = None
+        self._metrics = {"requests": 0, "errors": 0, "throttled": 0, "total_time": 0.0, "by_status": {}}
+
+    @classmethod
+    def from_config(cls, name, base_url, config):
+        """
+        Build a transport from the HTTP_* and <NAME>_ASYNC_MAX_IN_FLIGHT configuration keys.
+        Setting <NAME>_RATE_LIMIT_ENABLED to "true" routes the backend through the adaptive
+        rate limiter of its host, shared with the sync transport.
+        """
+        rate_limiter = None
+        prefix = name.upper()
+        if str(config.get(f"{prefix}_RATE_LIMIT_ENABLED", "false")).lower() == "true":
+            host = urlparse(base_url).netloc or base_url
+            rate_limiter = AdaptiveRateLimiter.for_host(host, config, prefix=prefix)
+        return cls(
+            name,
+            base_url,
+            pool_size=int(config.get("HTTP_POOL_SIZE", 20)),
+            max_in_flight=int(config.get(f"{prefix}_ASYNC_MAX_IN_FLIGHT", 100)),
+            connect_timeout=float(config.get("HTTP_CONNECT_TIMEOUT", 5)),
+            read_timeout=float(config.get("HTTP_READ_TIMEOUT", 60)),
+            throttle_retries=int(config.get(f"{prefix}_THROTTLE_RETRIES", 3)),
+            rate_limiter=rate_limiter,
+        )
+
+    def _ensure_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=None if self.verify else False)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def request(self, method, url, **kwargs):
+        """
+        Send a request and read its body.
+
+        Returns:
+            AsyncResponse: The last response. Network errors are re-raised to the caller.
+        """
+        attempt = 0
+        while True:
+            response = await self._send(method, url, **kwargs)
+            if response.status_code not in THROTTLE_STATUSES or attempt >= self.throttle_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.backoff_delay(attempt, retry_after)
+            elif retry_after is not None:
+                delay = min(self.backoff_cap, retry_after)
+            else:
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+            http_logger.warning(
+                f"[{self.name}] {method} {url} returned {response.status_code}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.throttle_retries})"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, method, url, **kwargs):
+        session = self._ensure_session()
+        start = time.monotonic()
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            response = None
+            try:
+                async with session.request(method, url, **kwargs) as raw_response:
+                    response = AsyncResponse(raw_response.status, await raw_response.text(), raw_response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record(None, time.monotonic() - start)
+                http_logger.error(f"[{self.name}] {method} {url} failed: {e}")
+                raise
+            finally:
+                if self.rate_limiter is not None:
+                    throttled = response is not None and response.status_code in THROTTLE_STATUSES
+                    self.rate_limiter.release(
+                        throttled=throttled,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After")) if throttled else None,
+                        failed=response is None
+                    )
+        self._record(response, time.monotonic() - start)
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request("PATCH", url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    def _record(self, response, elapsed):
+        # Only touched from the event loop thread, no lock needed
+        self._metrics["requests"] += 1
+        self._metrics["total_time"] += elapsed
+        if response is None:
+            self._metrics["errors"] += 1
+            return
+        status = response.status_code
+        self._metrics["by_status"][status] = self._metrics["by_status"].get(status, 0) + 1
+        if status in THROTTLE_STATUSES:
+            self._metrics["throttled"] += 1
+
+    def get_metrics(self):
+        """
+        Return a snapshot of the request counters for this backend.
+        """
+        snapshot = dict(self._metrics)
+        snapshot["by_status"] = dict(self._metrics["by_status"])
+        return snapshot
@@ -0,0 +1,250 @@
+import asyncio
+from core.logging_config import LoggerSetup
+from encryption.token_manager import TokenManager
+from core.config_manager import ConfigurationManager
+from core.string_constants import StringConstants
+from operations.async_http_transport import AsyncHttpTransport
+from operations.mantis_operations import MantisOperations
+
+mantis_logger = LoggerSetup.setup_logger("mantis", "logs/mantis")
+
+
+class AsyncMantisOperations:
+    """
+    Asyncio counterpart of MantisOperations for the request-heavy calls.
+
+    The coroutines mirror the names, arguments and return values of the blocking client, so a
+    caller can keep hundreds of fetches and writes in flight on one event loop. Writes are sent
+    one by one: there is no batch(), no skipped-write statistics and no local mirror to keep in
+    sync. Use it as an async context manager so the underlying HTTP session is closed on exit:
+
+        async with AsyncMantisOperations(StringConstants.REGRESSION) as mantis:
+            tickets, errors = await mantis.get_tickets_data(ticket_ids, fields="merger")
+    """
+
+    # Field projection and tag helpers do no I/O and are shared with the blocking client
+    _select_query = MantisOperations._select_query
+    _resolve_fields = MantisOperations._resolve_fields
+    normalize_filter_ids = staticmethod(MantisOperations.normalize_filter_ids)
+    _known_tag_ids = MantisOperations._known_tag_ids
+
+    def __init__(self, project):
+        """
+        Initialize AsyncMantisOperations with the Mantis API base URL and authentication token.
+        """
+        config = ConfigurationManager(config_file=f"configs/{project}.json")
+
+        self.mantis_path = config.get("MANTIS_PATH")
+        token_manager = TokenManager(key_file=config.get("KEY_FILE"), token_file=f"credentials/{StringConstants.TOKEN_PREFIX}{project}.txt")
+        tokens = token_manager.get_tokens()
+        self.auth_token = tokens["mantis_token"]
+
+        self.headers = {
+            'Authorization': self.auth_token,
+            'Content-Type': 'application/json'
+        }
+
+        self.http = AsyncHttpTransport.from_config("mantis", self.mantis_path, config)
+        self.page_size = int(config.get("MANTIS_PAGE_SIZE", 50))
+
+    async def __aenter__(self):
+        await self.http.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def close(self):
+        await self.http.close()
+
+    def get_ticket_url(self, ticket_number):
+        return f"{self.mantis_path}/view.php?id={ticket_number}"
+
+    async def get_ticket_data(self, ticket_number, fields=None):
+        """
+        Fetch ticket data by ticket number.
+        """
+        ticket_data, error = await self._fetch_ticket(ticket_number, fields)
+        if error:
+            mantis_logger.error(f'Error fetching ticket: {error}')
+        return ticket_data
+
+    async def _fetch_ticket(self, ticket_number, fields=None):
+        ticket_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}{self._select_query(fields, '?')}"
+        try:
+            response = await self.http.get(ticket_url, headers=self.headers)
+            if response.status_code == 200:
+                return response.json()['issues'][0], None
+            return None, response.text
+        except Exception as e:
+            return None, str(e)
+
+    async def get_tickets_data(self, ticket_numbers, fields=None):
+        """
+        Fetch many tickets at once.
+
+        Returns:
+            tuple: (tickets, errors) with tickets in the order of ticket_numbers (None for
+                failures) and errors mapping each failed ticket ID to the failure reason.
+        """
+        ticket_numbers = list(ticket_numbers)
+        results = await asyncio.gather(*(self._fetch_ticket(ticket_number, fields) for ticket_number in ticket_numbers))
+
+        tickets = []
+        errors = {}
+        for ticket_number, (ticket_data, error) in zip(ticket_numbers, results):
+            tickets.append(ticket_data)
+            if error:
+                errors[ticket_number] = error
+        return tickets, errors
+
+    async def get_tickets_from_filter(self, filter_ids, page_size=None, fields=None):
+        """
+        Get ticket data from one or more Mantis filters, reading the filters concurrently.
+
+        Returns:
+            list: Combined list of ticket data from all provided filters, without duplicates.
+        """
+        limit = page_size or self.page_size
+        select = self._select_query(fields)
+        pages_per_filter = await asyncio.gather(
+            *(self._fetch_filter(filter_id, limit, select) for filter_id in self.normalize_filter_ids(filter_ids))
+        )
+
+        tickets = []
+        seen_ids = set()
+        for issues in pages_per_filter:
+            for issue in issues:
+                if issue["id"] not in seen_ids:
+                    seen_ids.add(issue["id"])
+                    tickets.append(issue)
+        return tickets
+
+    async def _fetch_filter(self, filter_id, limit, select=""):
+        issues = []
+        page = 1
+        while True:
+            filter_url = f"{self.mantis_path}/api/rest/issues?filter_id={filter_id}&page={page}&limit={limit}{select}"
+            try:
+                response = await self.http.get(filter_url, headers=self.headers)
+                if response.status_code != 200:
+                    mantis_logger.error(f"[Filter {filter_id}] Error fetching tickets: {response.text}")
+                    return issues
+                page_issues = response.json().get("issues", [])
+            except Exception as e:
+                mantis_logger.error(f"[Filter {filter_id}] Exception while fetching tickets: {e}")
+                return issues
+
+            issues.extend(page_issues)
+            if len(page_issues) < limit:
+                return issues
+            page += 1
+
+    async def add_note_to_ticket(self, ticket_number, note_text):
+        """
+        Add a note to a specific ticket.
+        """
+        note_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/notes"
+        response = await self.http.post(note_url, headers=self.headers, json={"text": note_text})
+        if response.status_code != 201:
+            mantis_logger.error(f'Error while adding note to ticket {ticket_number}: {response.text}')
+
+    async def patch_issue(self, ticket_id, payload, error_message=None):
+        """
+        Send one PATCH with the given field changes to an issue.
+
+        Returns:
+            bool: True if Mantis accepted the update, False otherwise.
+        """
+        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
+        response = await self.http.patch(update_url, headers=self.headers, json=payload)
+        if response.status_code != 200:
+            mantis_logger.error(f'{error_message or f"Failed to update Ticket ID {ticket_id}"}: {response.text}')
+            return False
+        return True
+
+    async def close_ticket(self, ticket_number):
+        return await self.patch_issue(ticket_number, {"status": {"name": "closed"}}, f'Error while closing ticket {ticket_number}')
+
+    async def update_status_to_fixed(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"resolution": {"name": "Fixed"}}, f'Failed to update status for Ticket ID {ticket_id}')
+
+    async def update_owner(self, ticket_id, owner_id):
+        return await self.patch_issue(ticket_id, {"handler": {"id": owner_id}}, f'Failed to update owner for Ticket ID {ticket_id}')
+
+    async def update_status_to_new(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"resolution": {"name": "New"}}, f'Failed to update status for Ticket ID {ticket_id}')
+
+    async def update_status_to_doh(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"resolution": {"name": "Deployable on Hold"}}, f'Failed to update status for Ticket ID {ticket_id}')
+
+    async def update_status_to_for_qa(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"resolution": {"name": "For QA"}}, f'Failed to update status for Ticket ID {ticket_id}')
+
+    async def update_qa_status_to_assigned(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"status": {"name": "assigned"}}, f'Failed to update QA status for Ticket ID {ticket_id}')
+
+    async def update_qa_status_to_accepted(self, ticket_id):
+        return await self.patch_issue(ticket_id, {"status": {"name": "confirmed"}}, f'Failed to update QA status for Ticket ID {ticket_id}')
+
+    async def update_title(self, ticket_id, new_title):
+        return await self.patch_issue(ticket_id, {"summary": new_title}, f'Failed to update title for Ticket ID {ticket_id}')
+
+    async def update_description(self, ticket_id, new_description):
+        return await self.patch_issue(ticket_id, {"description": new_description}, f'Failed to update description for Ticket ID {ticket_id}')
+
+    async def add_tags_to_ticket(self, ticket_number, tag_ids):
+        """
+        Add tags to a specific ticket.
+        """
+        tags_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/tags"
+        payload = {"tags": [{"id": tag_id} for tag_id in tag_ids]}
+        response = await self.http.post(tags_url, headers=self.headers, json=payload)
+        if response.status_code != 201:
+            mantis_logger.error(f'Error while adding tags to ticket {ticket_number}: {response.text}')
+            return False
+        return True
+
+    async def detach_tags_from_ticket(self, ticket_number, tag_ids):
+        """
+        Detach tags from a specific ticket, one DELETE per tag sent concurrently.
+        """
+        async def detach(tag_id):
+            tag_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/tags/{tag_id}"
+            response = await self.http.delete(tag_url, headers=self.headers)
+            if response.status_code != 200:
+                mantis_logger.error(f"Error while detaching tag ID {tag_id} from ticket {ticket_number}: {response.text}")
+                return False
+            return True
+
+        return all(await asyncio.gather(*(detach(tag_id) for tag_id in tag_ids)))
+
+    async def ensure_tags_attached(self, issue, tag_ids):
+        """
+        Attach only the tags that the loaded issue does not already carry.
+        """
+        known_tags = self._known_tag_ids(issue)
+        missing = [tag_id for tag_id in tag_ids if known_tags is None or str(tag_id) not in known_tags]
+        if not missing:
+            return True
+
+        success = await self.add_tags_to_ticket(issue["id"], missing)
+        if success and known_tags is not None:
+            issue["tags"] = list(issue.get("tags") or []) + [{"id": tag_id} for tag_id in missing]
+        return success
+
+    async def ensure_tags_detached(self, issue, tag_ids):
+        """
+        Detach only the tags that the loaded issue actually carries.
+        """
+        known_tags = self._known_tag_ids(issue)
+        attached = [tag_id for tag_id in tag_ids if known_tags is None or str(tag_id) in known_tags]
+        if not attached:
+            return True
+
+        success = await self.detach_tags_from_ticket(issue["id"], attached)
+        if success and known_tags is not None:
+            removed = {str(tag_id) for tag_id in attached}
+            issue["tags"] = [tag for tag in issue.get("tags") or [] if str(tag.get("id")) not in removed]
+        return success
@@ -0,0 +1,42 @@
+class CustomFieldIndex:
+    """
+    Read-only lookup view over the custom fields of a Mantis issue.
+
+    Built once per issue, it maps custom field names and IDs to their values so that
+    repeated lookups do not rescan issue['custom_fields'].
+    """
+
+    __slots__ = ("by_name", "by_id")
+
+    def __init__(self, issue):
+        """
+        Parameters:
+            issue (dict): The Mantis issue data (expected to include custom fields).
+        """
+        self.by_name = {}
+        self.by_id = {}
+
+        for custom_field in issue.get("custom_fields") or []:
+            field = custom_field.get("field") or {}
+            value = custom_field.get("value", "")
+
+            # Keep the first occurrence, matching a front-to-back scan
+            if field.get("name") is not None:
+                self.by_name.setdefault(field["name"], value)
+            if field.get("id") is not None:
+                self.by_id.setdefault(field["id"], value)
+
+    def get(self, field_name, default=""):
+        """
+        Return the value of a custom field by name, or default if the issue does not have it.
+        """
+        return self.by_name.get(field_name, default)
+
+    def get_by_id(self, field_id, default=""):
+        """
+        Return the value of a custom field by ID, or default if the issue does not have it.
+        """
+        return self.by_id.get(int(field_id), default)
+
+    def __contains__(self, field_name):
+        return field_name in self.by_name
@@ -1,13 +1,43 @@
-import requests
 from core.logging_config import LoggerSetup
+import json
 import time
 from encryption.token_manager import TokenManager
 from operations.utils import get_target_project
 from core.config_manager import ConfigurationManager
 from core.string_constants import StringConstants
+from operations.http_transport import HttpTransport
+from operations.local_mirror import LocalMirror
+from operations.merge_request_cache import MergeRequestCache
+from operations.merge_result import MergeResult
+from operations.mr_router import MergeRequestRouter
 
 git_logger = LoggerSetup.setup_logger("git", "logs/git")
 
+# detailed_merge_status / merge_status values, grouped by what merge_merge_request does about them
+TRANSIENT_MERGE_STATUSES = ("checking", "unchecked", "preparing", "approvals_syncing", "cannot_be_merged_recheck")
+CONFLICT_MERGE_STATUSES = ("conflict", "need_rebase")
+PIPELINE_MERGE_STATUSES = ("ci_must_pass", "ci_still_running")
+APPROVAL_MERGE_STATUSES = ("not_approved", "requested_changes")
+
+# Fields read by get_merge_request_statuses, just what the mergers and the sheet updater look at
+MERGE_REQUEST_STATUS_FRAGMENT = """
+fragment MergeRequestStatus on MergeRequest {
+  iid
+  projectId
+  state
+  webUrl
+  updatedAt
+  targetBranch
+  detailedMergeStatus
+  conflicts
+  draft
+  labels { nodes { title } }
+  assignees { nodes { name username } }
+  author { name username }
+  headPipeline { status }
+}
+"""
+
 class GitLabOperations:
     def __init__(self, project):
         """
@@ -28,12 +58,36 @@ class GitLabOperations:
             'Content-Type': 'application/json'
         }
 
-    def get_merge_request(self, merge_request_url):
+        # Keep-alive connection pool shared by every GitLab client
+        self.http = HttpTransport.for_backend("gitlab", self.gitlab_path, config=config)
+
+        # Optional local SQLite copy of merge requests, read when a caller passes max_age
+        self.mirror = LocalMirror.from_config(config)
+
+        # Merged/closed MRs cached for good, opened ones for GITLAB_MR_TTL seconds
+        self.mr_cache = MergeRequestCache.for_backend(self.gitlab_path, config)
+
+        # MRs requested per call by get_merge_requests, GitLab caps it at 100
+        self.bulk_page_size = max(1, min(100, int(config.get("GITLAB_BULK_PAGE_SIZE", 100))))
+
+        # Status-only lookups go through GraphQL, GITLAB_GRAPHQL_BATCH_SIZE MRs per query
+        self.graphql_enabled = str(config.get("GITLAB_GRAPHQL_ENABLED", "false")).lower() == "true"
+        self.graphql_batch_size = max(1, min(100, int(config.get("GITLAB_GRAPHQL_BATCH_SIZE", 50))))
+        self.graphql_headers = {
+            'Authorization': f'Bearer {self.auth_token}',
+            'Content-Type': 'application/json'
+        }
+
+    def get_merge_request(self, merge_request_url, max_age=None, use_cache=True):
         """
         Fetch merge request data by its URL.
 
         Parameters:
             merge_request_url (str): The URL of the merge request.
+            max_age (float): Serve the MR from the local mirror if its copy is at most this many
+                seconds old.
+            use_cache (bool): Serve the MR from the shared MR cache when possible. When False
+                the MR is always read from GitLab (and the cache refreshed).
 
         Returns:
             dict: Merge request data or None if an error occurs.
@@ -43,46 +97,376 @@ class GitLabOperations:
         if not target_project_id:
             return None
 
+        if max_age is not None and self.mirror is not None:
+            merge_request_data = self.mirror.get_merge_request(target_project_id, merge_request_id, max_age)
+            if merge_request_data is not None:
+                return merge_request_data
+
+        def load(etag):
+            return self._fetch_merge_request(merge_request_url, target_project_id, merge_request_id, etag)
+
+        if not use_cache:
+            self.mr_cache.invalidate(target_project_id, merge_request_id)
+        return self.mr_cache.get(target_project_id, merge_request_id, load)
+
+    def get_merge_requests(self, merge_request_urls, use_cache=True):
+        """
+        Resolve many merge request URLs with as few GitLab requests as possible.
+
+        URLs are grouped by target project and read through the project list endpoint with
+        iids[], up to GITLAB_BULK_PAGE_SIZE (at most 100) MRs per request. MRs still valid in
+        the MR cache are not requested, and every MR read is stored back in the cache.
+
+        Parameters:
+            merge_request_urls (list): MR URLs, duplicates allowed.
+            use_cache (bool): Serve MRs from the MR cache when possible.
+
+        Returns:
+            dict: URL -> merge request data, or None for URLs that could not be resolved.
+        """
+        results = {}
+        pending = {}
+        for merge_request_url in merge_request_urls:
+            if merge_request_url in results:
+                continue
+            results[merge_request_url] = None
+
+            target_project_id = get_target_project(merge_request_url)
+            merge_request_id = merge_request_url.split('/')[-1]
+            if not target_project_id or not merge_request_id.isdigit():
+                continue
+
+            cached = self.mr_cache.peek(target_project_id, merge_request_id) if use_cache else None
+            if cached is not None:
+                results[merge_request_url] = cached
+            else:
+                pending.setdefault(str(target_project_id), {}).setdefault(int(merge_request_id), []).append(merge_request_url)
+
+        for target_project_id, urls_by_iid in pending.items():
+            iids = list(urls_by_iid)
+            for start in range(0, len(iids), self.bulk_page_size):
+                chunk = iids[start:start + self.bulk_page_size]
+                for merge_request_data in self._list_merge_requests(target_project_id, chunk):
+                    iid = merge_request_data.get("iid")
+                    if iid not in urls_by_iid:
+                        continue
+                    self.mr_cache.store(target_project_id, iid, merge_request_data)
+                    for merge_request_url in urls_by_iid[iid]:
+                        if self.mirror is not None:
+                            self.mirror.upsert_merge_request(target_project_id, iid, merge_request_data, url=merge_request_url)
+                        results[merge_request_url] = merge_request_data
+
+        return results
+
+    def get_merge_request_statuses(self, merge_request_urls):
+        """
+        Resolve the status fields of many merge requests with a few GraphQL queries.
+
+        Every query reads up to GITLAB_GRAPHQL_BATCH_SIZE MRs, across projects, with one aliased
+        project(fullPath:) field per project. Only the fields in MERGE_REQUEST_STATUS_FRAGMENT are
+        returned, normalized to the REST field names (state, labels, target_branch, assignee,
+        author, detailed_merge_status, has_conflicts, ...). MRs still valid in the MR cache are
+        not requested; MRs GraphQL could not resolve, or all of them when GITLAB_GRAPHQL_ENABLED
+        is off, are read with get_merge_requests() instead.
+
+        Parameters:
+            merge_request_urls (list): MR URLs, duplicates allowed.
+
+        Returns:
+            dict: URL -> merge request data, or None for URLs that could not be resolved.
+        """
+        results = {}
+        pending = {}
+        rest_urls = []
+        for merge_request_url in merge_request_urls:
+            if merge_request_url in results:
+                continue
+            results[merge_request_url] = None
+
+            target_project_id = get_target_project(merge_request_url)
+            merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+            if not target_project_id or merge_request_ref is None:
+                rest_urls.append(merge_request_url)
+                continue
+
+            cached = self.mr_cache.peek(target_project_id, merge_request_ref.iid)
+            if cached is not None:
+                results[merge_request_url] = cached
+            elif self.graphql_enabled:
+                full_path = f"{merge_request_ref.namespace}/{merge_request_ref.repo}"
+                pending.setdefault(full_path, {}).setdefault(merge_request_ref.iid, []).append(merge_request_url)
+            else:
+                rest_urls.append(merge_request_url)
+
+        # Split the MRs into queries of at most graphql_batch_size, filling each query across projects
+        queries = []
+        query = []
+        query_size = 0
+        for full_path, urls_by_iid in pending.items():
+            iids = list(urls_by_iid)
+            for start in range(0, len(iids), self.graphql_batch_size):
+                chunk = iids[start:start + self.graphql_batch_size]
+                if query and query_size + len(chunk) > self.graphql_batch_size:
+                    queries.append(query)
+                    query = []
+                    query_size = 0
+                query.append((full_path, chunk))
+                query_size += len(chunk)
+        if query:
+            queries.append(query)
+
+        for query in queries:
+            resolved = self._query_merge_request_statuses(query)
+            for full_path, iids in query:
+                for iid in iids:
+                    merge_request_data = resolved.get((full_path, iid))
+                    if merge_request_data is None:
+                        rest_urls.extend(pending[full_path][iid])
+                        continue
+                    for merge_request_url in pending[full_path][iid]:
+                        results[merge_request_url] = merge_request_data
+
+        if rest_urls:
+            if self.graphql_enabled:
+                git_logger.info(f"Resolving {len(rest_urls)} merge requests through REST")
+            results.update(self.get_merge_requests(rest_urls))
+        return results
+
+    def _query_merge_request_statuses(self, projects):
+        """
+        Run one aliased GraphQL query for the given MRs.
+
+        Parameters:
+            projects (list): (project full path, list of IIDs) pairs.
+
+        Returns:
+            dict: (project full path, IID) -> normalized merge request data; empty if the query failed.
+        """
+        fields = [
+            f"p{index}: project(fullPath: {json.dumps(full_path)}) "
+            f"{{ mergeRequests(iids: {json.dumps([str(iid) for iid in iids])}, first: {len(iids)}) {{ nodes {{ ...MergeRequestStatus }} }} }}"
+            for index, (full_path, iids) in enumerate(projects)
+        ]
+        query = "query {\n" + "\n".join(fields) + "\n}\n" + MERGE_REQUEST_STATUS_FRAGMENT
+
+        try:
+            response = self.http.post(f"{self.gitlab_path}/api/graphql", headers=self.graphql_headers, json={"query": query})
+        except Exception as e:
+            git_logger.error(f"Error querying merge request statuses: {e}")
+            return {}
+
+        if response.status_code != 200:
+            git_logger.error(f"Error querying merge request statuses: {response.text}")
+            return {}
+
+        body = response.json()
+        if body.get("errors"):
+            # GraphQL answers partially, e.g. a project the token cannot read is null while the others resolve
+            git_logger.error(f"Errors while querying merge request statuses: {body['errors']}")
+
+        data = body.get("data") or {}
+        resolved = {}
+        for index, (full_path, _) in enumerate(projects):
+            project_data = data.get(f"p{index}")
+            if not project_data:
+                continue
+            for node in (project_data.get("mergeRequests") or {}).get("nodes") or []:
+                resolved[(full_path, int(node["iid"]))] = self._normalize_merge_request_status(node)
+        return resolved
+
+    @staticmethod
+    def _normalize_merge_request_status(node):
+        """
+        Convert a GraphQL MergeRequest node to the field names and values of the REST API.
+        """
+        assignees = (node.get("assignees") or {}).get("nodes") or []
+        head_pipeline = node.get("headPipeline")
+        detailed_merge_status = node.get("detailedMergeStatus")
+        return {
+            "iid": int(node["iid"]),
+            "project_id": int(node["projectId"]),
+            "state": node.get("state"),
+            "web_url": node.get("webUrl"),
+            "updated_at": node.get("updatedAt"),
+            "target_branch": node.get("targetBranch"),
+            "detailed_merge_status": detailed_merge_status.lower() if detailed_merge_status else None,
+            "has_conflicts": node.get("conflicts"),
+            "draft": node.get("draft"),
+            "labels": [label["title"] for label in (node.get("labels") or {}).get("nodes") or []],
+            "assignee": assignees[0] if assignees else None,
+            "assignees": assignees,
+            "author": node.get("author"),
+            "head_pipeline": {"status": head_pipeline["status"].lower()} if head_pipeline and head_pipeline.get("status") else None
+        }
+
+    def _list_merge_requests(self, target_project_id, iids):
+        """
+        Read up to 100 merge requests of one project by IID.
+
+        Returns:
+            list: The merge requests GitLab returned; empty if the request failed.
+        """
+        list_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests"
+        params = [("iids[]", iid) for iid in iids] + [("state", "all"), ("per_page", len(iids))]
+        try:
+            response = self.http.get(list_mr_url, headers=self.headers, params=params)
+        except Exception as e:
+            git_logger.error(f"Error fetching merge requests {iids} of project {target_project_id}: {e}")
+            return []
+
+        if response.status_code != 200:
+            git_logger.error(f"Error fetching merge requests {iids} of project {target_project_id}: {response.text}")
+            return []
+        return response.json()
+
+    def _fetch_merge_request(self, merge_request_url, target_project_id, merge_request_id, etag=None):
+        """
+        Read a merge request from GitLab, revalidating with If-None-Match when an ETag is known.
+
+        Returns:
+            tuple: (status, data, etag) with status "ok", "not_modified" or "error".
+        """
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+
         read_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests/{merge_request_id}"
-        response = requests.get(read_mr_url, headers=self.headers, verify=False)
+        response = self.http.get(read_mr_url, headers=headers)
 
+        if response.status_code == 304:
+            return "not_modified", None, etag
         if response.status_code == 200:
-            return response.json()
-        else:
-            git_logger.error(f'Error fetching merge request: {response.text}')
-            return None
+            merge_request_data = response.json()
+            if self.mirror is not None:
+                self.mirror.upsert_merge_request(target_project_id, merge_request_id, merge_request_data, url=merge_request_url)
+            return "ok", merge_request_data, response.headers.get("ETag")
+
+        git_logger.error(f'Error fetching merge request: {response.text}')
+        return "error", None, None
 
-    def merge_merge_request(self, merge_request_url, retries=3, delay=5):
+    def merge_merge_request(self, merge_request_url, retries=3, delay=1, max_delay=8):
         """
-        Try to merge a GitLab merge request with retries.
+        Merge a GitLab merge request after checking that it can be merged.
+
+        The MR is read fresh first. Conflicts, missing approvals, drafts and other states that
+        waiting cannot fix fail immediately without sleeping. States GitLab is still computing
+        ("checking", "unchecked", ...) and transient merge errors are retried with exponential
+        backoff, starting at delay seconds and capped at max_delay.
 
         Parameters:
             merge_request_url (str): The URL of the merge request.
-            retries (int): Number of retries in case of failure.
-            delay (int): Delay (in seconds) between retries.
+            retries (int): Maximum number of attempts for transient states.
+            delay (float): Initial backoff in seconds.
+            max_delay (float): Maximum backoff in seconds.
 
         Returns:
-            bool: True if the merge is successful, False otherwise.
+            MergeResult: The outcome; truthy only if the MR was merged.
         """
         merge_request_id = merge_request_url.split('/')[-1]
         target_project_id = get_target_project(merge_request_url)
         if not target_project_id:
-            return False
+            return MergeResult(MergeResult.NOT_MERGEABLE, "unknown target project")
 
         merge_mr_url = f"{self.gitlab_path}/api/v4/projects/{target_project_id}/merge_requests/{merge_request_id}/merge"
 
+        if self.mirror is not None:
+            self.mirror.invalidate_merge_request(target_project_id, merge_request_id)
+
+        result = MergeResult(MergeResult.TRANSIENT_FAILURE, "not attempted")
         for attempt in range(1, retries + 1):
-            response = requests.put(merge_mr_url, headers=self.headers, verify=False)
+            merge_request_data = self.get_merge_request(merge_request_url, use_cache=False)
+            result = self._check_mergeability(merge_request_data)
+
+            if result is None:
+                result = self._put_merge(merge_mr_url, target_project_id, merge_request_id)
+            if result:
+                return result
+
+            if result.outcome != MergeResult.TRANSIENT_FAILURE:
+                git_logger.error(f"Merge request {merge_request_id} cannot be merged: {result}")
+                return result
+
+            if attempt < retries:
+                wait = min(max_delay, delay * (2 ** (attempt - 1)))
+                git_logger.info(f"Attempt {attempt}: merge request {merge_request_id} not ready ({result}), retrying in {wait} seconds...")
+                time.sleep(wait)
+
+        git_logger.error(f"Exceeded maximum retry attempts. Merge request {merge_request_id} could not be merged: {result}")
+        return result
+
+    def _check_mergeability(self, merge_request_data):
+        """
+        Classify an MR before merging it.
+
+        Returns:
+            MergeResult: Why the MR cannot be merged now, or None if it looks mergeable.
+        """
+        if not merge_request_data:
+            return MergeResult(MergeResult.TRANSIENT_FAILURE, "merge request could not be read")
+
+        if merge_request_data.get("state") == "merged":
+            return MergeResult(MergeResult.MERGED, "already merged", merge_request_data)
+        if merge_request_data.get("state") != "opened":
+            return MergeResult(MergeResult.NOT_MERGEABLE, f"state is {merge_request_data.get('state')}")
+
+        if merge_request_data.get("has_conflicts"):
+            return MergeResult(MergeResult.CONFLICT, "has conflicts")
+
+        # detailed_merge_status is only returned by newer GitLab versions, merge_status by all
+        status = merge_request_data.get("detailed_merge_status")
+        if status is None:
+            legacy_status = merge_request_data.get("merge_status")
+            if legacy_status == "cannot_be_merged":
+                return MergeResult(MergeResult.CONFLICT, legacy_status)
+            if legacy_status in TRANSIENT_MERGE_STATUSES:
+                return MergeResult(MergeResult.TRANSIENT_FAILURE, legacy_status)
+            return None
+
+        if status == "mergeable":
+            return None
+        if status in TRANSIENT_MERGE_STATUSES:
+            return MergeResult(MergeResult.TRANSIENT_FAILURE, status)
+        if status in CONFLICT_MERGE_STATUSES:
+            return MergeResult(MergeResult.CONFLICT, status)
+        if status in PIPELINE_MERGE_STATUSES:
+            pipeline = merge_request_data.get("head_pipeline") or merge_request_data.get("pipeline") or {}
+            return MergeResult(MergeResult.PIPELINE_PENDING, f"{status}, pipeline {pipeline.get('status', 'unknown')}")
+        if status in APPROVAL_MERGE_STATUSES:
+            return MergeResult(MergeResult.NOT_APPROVED, status)
+        return MergeResult(MergeResult.NOT_MERGEABLE, status)
+
+    def _put_merge(self, merge_mr_url, target_project_id, merge_request_id):
+        """
+        Send the merge request and keep the MR cache in step with the answer.
+        """
+        try:
+            response = self.http.put(merge_mr_url, headers=self.headers)
+        except Exception as e:
+            return MergeResult(MergeResult.TRANSIENT_FAILURE, str(e))
+
+        result = self._classify_merge_response(merge_request_id, response)
+        if result:
+            self.mr_cache.store(target_project_id, merge_request_id, result.merge_request)
+        else:
+            self.mr_cache.invalidate(target_project_id, merge_request_id)
+        return result
+
+    def _classify_merge_response(self, merge_request_id, response):
+        """
+        Turn GitLab's answer to PUT .../merge into a MergeResult, checking the status before the body.
+        """
+        if response.status_code == 200:
             response_body = response.json()
-            if response.status_code == 200 and response_body.get("state") == "merged":
-                # git_logger.info(f"Merge request {merge_request_id} merged successfully.")
-                return True
-            else:
-                git_logger.error(f"Attempt {attempt}: Error merging merge request {merge_request_id}: {response.text}")
-                if attempt < retries:
-                    git_logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                else:
-                    git_logger.error("Exceeded maximum retry attempts. Merge request could not be merged.")
-
-        return False
+            if response_body.get("state") == "merged":
+                return MergeResult(MergeResult.MERGED, merge_request=response_body)
+            # Accepted but merged later, e.g. when the pipeline succeeds
+            return MergeResult(MergeResult.PIPELINE_PENDING, f"state is {response_body.get('state')}")
+
+        git_logger.error(f"Error merging merge request {merge_request_id}: {response.status_code} {response.text}")
+        if response.status_code in (401, 403):
+            return MergeResult(MergeResult.NOT_APPROVED, response.text)
+        if response.status_code == 406:
+            return MergeResult(MergeResult.CONFLICT, response.text)
+        if response.status_code == 409 or response.status_code >= 500:
+            return MergeResult(MergeResult.TRANSIENT_FAILURE, response.text)
+        return MergeResult(MergeResult.NOT_MERGEABLE, response.text)
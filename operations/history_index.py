@@ -0,0 +1,108 @@
+from collections import defaultdict
+
+CHANGESET_FIELD = "Source_changeset_attached"
+CHANGESET_MESSAGE = "Changeset attached"
+
+
+class TicketHistoryIndex:
+    """
+    Compact, read-only index over the 'history' list of a Mantis ticket.
+
+    Built once per ticket, it groups history entries by field name and stores each change as
+    an (old_value, new_value, user, message) tuple, so questions such as "did the resolution go
+    from A to B by user U" or "is a changeset attached for branch B" do not rescan the raw
+    history and its nested dicts.
+    """
+
+    __slots__ = ("transitions", "_transition_keys", "changesets", "_branch_matches")
+
+    def __init__(self, history):
+        """
+        Parameters:
+            history (list): The 'history' field from a Mantis ticket JSON response.
+        """
+        self.transitions = defaultdict(list)
+        self._transition_keys = set()
+        self.changesets = []
+        self._branch_matches = {}
+
+        for entry in history or []:
+            field = (entry.get("field") or {}).get("name", "")
+            message = entry.get("message", "")
+
+            if field == CHANGESET_FIELD and message == CHANGESET_MESSAGE:
+                value = entry.get("new_value") or ""
+                self.changesets.append(value)
+                continue
+
+            change = (
+                self._value_name(entry.get("old_value")),
+                self._value_name(entry.get("new_value")),
+                (entry.get("user") or {}).get("name", ""),
+                message
+            )
+            self.transitions[field].append(change)
+            self._transition_keys.add((field,) + change)
+
+    @staticmethod
+    def _value_name(value):
+        if isinstance(value, dict):
+            return value.get("name", "")
+        return "" if value is None else str(value)
+
+    def has_transition(self, field, from_value, to_value, user=None, message=None):
+        """
+        Check whether a field changed from from_value to to_value.
+
+        Parameters:
+            field (str): History field name (e.g. "resolution", "status").
+            from_value (str): The previous value name.
+            to_value (str): The new value name.
+            user (str): Only count changes made by this user; any user when None.
+            message (str): Only count entries with this history message; any message when None.
+
+        Returns:
+            bool: True if a matching change exists.
+        """
+        if user is not None and message is not None:
+            return (field, from_value, to_value, user, message) in self._transition_keys
+
+        for old_value, new_value, change_user, change_message in self.transitions.get(field, ()):
+            if (old_value == from_value and new_value == to_value and
+                    (user is None or change_user == user) and
+                    (message is None or change_message == message)):
+                return True
+        return False
+
+    def has_changeset(self, branch):
+        """
+        Check whether a changeset is attached for the given branch.
+        """
+        if branch not in self._branch_matches:
+            self._branch_matches[branch] = any(branch in value for value in self.changesets)
+        return self._branch_matches[branch]
+
+    def has_changeset_for_any(self, branches):
+        """
+        Check whether a changeset is attached for at least one of the given branches.
+        """
+        return any(self.has_changeset(branch) for branch in branches)
+
+
+def audit_histories(tickets, checks, index_for):
+    """
+    Run the same history checks over many tickets.
+
+    Parameters:
+        tickets (list[dict]): Mantis tickets loaded with their history.
+        checks (dict): Check name -> callable taking a TicketHistoryIndex and returning a bool.
+        index_for (callable): Returns the TicketHistoryIndex of a ticket.
+
+    Returns:
+        dict: Ticket ID -> {check name: result}
+    """
+    results = {}
+    for ticket in tickets:
+        index = index_for(ticket)
+        results[ticket["id"]] = {name: bool(check(index)) for name, check in checks.items()}
+    return results
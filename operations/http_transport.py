@@ -0,0 +1,203 @@
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from core.logging_config import LoggerSetup
+from operations.rate_limiter import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+
+http_logger = LoggerSetup.setup_logger("http", "logs/http")
+
+
+class HttpTransport:
+    """
+    Pooled keep-alive HTTP transport shared by the Mantis and GitLab clients.
+
+    One transport (and therefore one requests.Session) exists per backend, so every
+    MantisOperations / GitLabOperations instance talking to the same server reuses the
+    same TCP+TLS connections. Authentication headers stay with the caller and are sent
+    per request, which lets clients with different tokens share a single pool.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, name, base_url, pool_size=10, connect_timeout=5, read_timeout=60, max_retries=2, verify=False,
+                 rate_limiter=None, throttle_retries=3):
+        """
+        Parameters:
+            name (str): Backend name used in logs and metrics (e.g. "mantis", "gitlab").
+            base_url (str): Base URL of the backend.
+            pool_size (int): Maximum number of keep-alive connections kept per host.
+            connect_timeout (float): Default connect timeout in seconds.
+            read_timeout (float): Default read timeout in seconds.
+            max_retries (int): Retries on connection errors for idempotent requests.
+            verify (bool): Whether to verify TLS certificates.
+            rate_limiter (AdaptiveRateLimiter): Optional limiter every request goes through.
+            throttle_retries (int): Retries of a request answered with 429/503 when a limiter is set.
+        """
+        self.name = name
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter
+        self.throttle_retries = throttle_retries
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=0,
+            backoff_factor=0.5,
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "DELETE"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.verify = verify
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._hooks = []
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"requests": 0, "errors": 0, "total_time": 0.0, "by_status": {}}
+
+    @classmethod
+    def for_backend(cls, name, base_url, config=None):
+        """
+        Return the shared transport for a backend, creating it on first use.
+
+        Parameters:
+            name (str): Backend name (e.g. "mantis", "gitlab").
+            base_url (str): Base URL of the backend.
+            config (ConfigurationManager): Optional configuration providing the
+                HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT and HTTP_MAX_RETRIES keys.
+                Setting <NAME>_RATE_LIMIT_ENABLED to "true" routes the backend through the
+                adaptive rate limiter of its host.
+
+        Returns:
+            HttpTransport: The transport shared by every client of that backend.
+        """
+        key = (name, base_url)
+        with cls._instances_lock:
+            transport = cls._instances.get(key)
+            if transport is None:
+                settings = {}
+                if config is not None:
+                    settings = {
+                        "pool_size": int(config.get("HTTP_POOL_SIZE", 10)),
+                        "connect_timeout": float(config.get("HTTP_CONNECT_TIMEOUT", 5)),
+                        "read_timeout": float(config.get("HTTP_READ_TIMEOUT", 60)),
+                        "max_retries": int(config.get("HTTP_MAX_RETRIES", 2)),
+                    }
+                    prefix = name.upper()
+                    if str(config.get(f"{prefix}_RATE_LIMIT_ENABLED", "false")).lower() == "true":
+                        host = urlparse(base_url).netloc or base_url
+                        settings["rate_limiter"] = AdaptiveRateLimiter.for_host(host, config, prefix=prefix)
+                        settings["throttle_retries"] = int(config.get(f"{prefix}_THROTTLE_RETRIES", 3))
+                transport = cls(name, base_url, **settings)
+                cls._instances[key] = transport
+            return transport
+
+    def add_hook(self, hook):
+        """
+        Register a callable invoked after every request.
+
+        The hook is called as hook(method, url, response, elapsed, error), where response
+        is None when the request raised and error is the raised exception (or None).
+        """
+        self._hooks.append(hook)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the pooled session, applying the default timeout.
+
+        With a rate limiter, the request waits for its turn and a 429/503 answer is retried
+        after the server's Retry-After delay (or a jittered exponential backoff), up to
+        throttle_retries times. The last response is returned either way.
+
+        Returns:
+            requests.Response: The response. Network errors are re-raised to the caller.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            response = self._send(method, url, **kwargs)
+            if (self.rate_limiter is None or response.status_code not in THROTTLE_STATUSES or
+                    attempt >= self.throttle_retries):
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = self.rate_limiter.backoff_delay(attempt, retry_after)
+            http_logger.warning(
+                f"[{self.name}] {method} {url} returned {response.status_code}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.throttle_retries})"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self, method, url, **kwargs):
+        start = time.monotonic()
+        response = None
+        error = None
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        try:
+            response = self.session.request(method, url, **kwargs)
+            return response
+        except requests.RequestException as e:
+            error = e
+            http_logger.error(f"[{self.name}] {method} {url} failed: {e}")
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            if self.rate_limiter is not None:
+                throttled = response is not None and response.status_code in THROTTLE_STATUSES
+                self.rate_limiter.release(
+                    throttled=throttled,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")) if throttled else None,
+                    failed=response is None
+                )
+            self._record(response, elapsed, error)
+            for hook in self._hooks:
+                try:
+                    hook(method, url, response, elapsed, error)
+                except Exception as e:
+                    http_logger.error(f"[{self.name}] Request hook failed: {e}")
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def _record(self, response, elapsed, error):
+        with self._metrics_lock:
+            self._metrics["requests"] += 1
+            self._metrics["total_time"] += elapsed
+            if error is not None:
+                self._metrics["errors"] += 1
+            else:
+                status = response.status_code
+                self._metrics["by_status"][status] = self._metrics["by_status"].get(status, 0) + 1
+
+    def get_metrics(self):
+        """
+        Return a snapshot of the request counters for this backend.
+        """
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+            snapshot["by_status"] = dict(self._metrics["by_status"])
+        if self.rate_limiter is not None:
+            snapshot["rate_limiter"] = self.rate_limiter.get_metrics()
+        return snapshot
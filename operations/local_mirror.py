@@ -0,0 +1,259 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from core.logging_config import LoggerSetup
+from operations.mr_router import MergeRequestRouter
+
+mirror_logger = LoggerSetup.setup_logger("mirror", "logs/mirror")
+
+# MR URLs in note texts, with or without the "/-/" of current GitLab URLs
+NOTE_MERGE_REQUEST_PATTERN = r"https?://[^\s\"'<>]+?/merge_requests/\d+"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS merge_requests (
+    project_id TEXT NOT NULL,
+    iid INTEGER NOT NULL,
+    url TEXT,
+    state TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (project_id, iid)
+);
+CREATE TABLE IF NOT EXISTS filters (
+    filter_id INTEGER PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS filter_members (
+    filter_id INTEGER NOT NULL,
+    ticket_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (filter_id, ticket_id)
+);
+"""
+
+
+class LocalMirror:
+    """
+    Local SQLite copy of Mantis tickets, GitLab merge requests and filter memberships.
+
+    Every row carries the time it was synced, and every read takes a max_age in seconds: rows
+    older than that are treated as missing, so callers fall back to the live server. Tickets
+    are stored as full issues and projected on read, so one copy serves every field profile.
+    One mirror (and one connection, in WAL mode) is shared per database file.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        """
+        Parameters:
+            db_path (str): Path of the SQLite database file, created if missing.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, db_path):
+        """
+        Return the mirror shared by every caller of the given database file.
+        """
+        with cls._instances_lock:
+            mirror = cls._instances.get(db_path)
+            if mirror is None:
+                mirror = cls(db_path)
+                cls._instances[db_path] = mirror
+            return mirror
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Return the shared mirror if MIRROR_ENABLED is "true" in the configuration, None otherwise.
+        """
+        if str(config.get("MIRROR_ENABLED", "false")).lower() != "true":
+            return None
+        return cls.shared(config.get("MIRROR_DB", "data/mirror.sqlite3"))
+
+    def _execute(self, query, params=()):
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            self._conn.commit()
+        return rows
+
+    def _executemany(self, query, rows):
+        with self._lock:
+            self._conn.executemany(query, rows)
+            self._conn.commit()
+
+    # Tickets
+
+    def upsert_tickets(self, tickets):
+        """
+        Store Mantis issues (full, or with the "mirror" field profile), replacing older copies.
+        """
+        now = time.time()
+        rows = [(ticket["id"], ticket.get("updated_at"), json.dumps(ticket), now) for ticket in tickets if ticket]
+        if rows:
+            self._executemany("INSERT OR REPLACE INTO tickets (id, updated_at, data, synced_at) VALUES (?, ?, ?, ?)", rows)
+
+    def get_ticket(self, ticket_id, max_age):
+        """
+        Return the stored issue if it was synced less than max_age seconds ago, None otherwise.
+        """
+        return self.get_tickets([ticket_id], max_age).get(int(ticket_id))
+
+    def get_tickets(self, ticket_ids, max_age):
+        """
+        Return the stored issues synced less than max_age seconds ago.
+
+        Returns:
+            dict: Ticket ID -> issue, only for the tickets found fresh.
+        """
+        ticket_ids = [int(ticket_id) for ticket_id in ticket_ids]
+        if not ticket_ids:
+            return {}
+
+        oldest = time.time() - max_age
+        tickets = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(ticket_ids), 500):
+            chunk = ticket_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._execute(
+                f"SELECT id, data FROM tickets WHERE id IN ({placeholders}) AND synced_at >= ?",
+                (*chunk, oldest)
+            )
+            tickets.update((ticket_id, json.loads(data)) for ticket_id, data in rows)
+        return tickets
+
+    def invalidate_ticket(self, ticket_id):
+        """
+        Drop the stored copy of a ticket, e.g. after it was updated.
+        """
+        self._execute("DELETE FROM tickets WHERE id = ?", (int(ticket_id),))
+
+    def find_tickets_by_merge_request(self, merge_request_url):
+        """
+        Return the IDs of the stored tickets whose notes link the given MR, however old their copy is.
+        The MR may be linked with a URL of another form, e.g. without the "/-/" GitLab puts in it.
+        """
+        ref = MergeRequestRouter.parse(merge_request_url)
+        if ref is None:
+            return []
+        repo = ref.repo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{repo}%/merge_requests/{ref.iid}"
+        rows = self._execute("SELECT id, data FROM tickets WHERE data LIKE ? ESCAPE '\\'", (f"%{pattern}%",))
+
+        # LIKE also matches other MRs of the repository, e.g. longer IIDs (.../merge_requests/12 for .../merge_requests/1)
+        ticket_ids = []
+        for ticket_id, data in rows:
+            ticket = json.loads(data)
+            if any(MergeRequestRouter.parse(url) == ref
+                   for note in ticket.get("notes") or []
+                   for url in re.findall(NOTE_MERGE_REQUEST_PATTERN, note.get("text") or "")):
+                ticket_ids.append(ticket_id)
+        return ticket_ids
+
+    # Filters
+
+    def is_filter_member(self, filter_ids, ticket_id):
+        """
+        Check whether a ticket was matched by any of the filters at their last sync.
+
+        Returns:
+            bool: True or False, or None if none of the filters was ever synced.
+        """
+        filter_ids = [int(filter_id) for filter_id in filter_ids]
+        if not filter_ids:
+            return None
+        placeholders = ", ".join("?" for _ in filter_ids)
+        if not self._execute(f"SELECT 1 FROM filters WHERE filter_id IN ({placeholders})", filter_ids):
+            return None
+        rows = self._execute(
+            f"SELECT 1 FROM filter_members WHERE filter_id IN ({placeholders}) AND ticket_id = ?", filter_ids + [int(ticket_id)]
+        )
+        return bool(rows)
+
+
+    def set_filter_members(self, filter_id, ticket_ids):
+        """
+        Replace the list of tickets matched by a filter, keeping their order.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM filter_members WHERE filter_id = ?", (int(filter_id),))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO filter_members (filter_id, ticket_id, position) VALUES (?, ?, ?)",
+                [(int(filter_id), int(ticket_id), position) for position, ticket_id in enumerate(ticket_ids)]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO filters (filter_id, synced_at) VALUES (?, ?)", (int(filter_id), now))
+            self._conn.commit()
+
+    def get_filter_tickets(self, filter_id, max_age):
+        """
+        Return the issues of a filter, or None if the filter or any of its tickets is not fresh.
+        """
+        rows = self._execute(
+            "SELECT synced_at FROM filters WHERE filter_id = ? AND synced_at >= ?", (int(filter_id), time.time() - max_age)
+        )
+        if not rows:
+            return None
+
+        ticket_ids = [ticket_id for (ticket_id,) in self._execute(
+            "SELECT ticket_id FROM filter_members WHERE filter_id = ? ORDER BY position", (int(filter_id),)
+        )]
+        tickets = self.get_tickets(ticket_ids, max_age)
+        if len(tickets) != len(ticket_ids):
+            return None
+        return [tickets[ticket_id] for ticket_id in ticket_ids]
+
+    # Merge requests
+
+    def upsert_merge_request(self, project_id, iid, merge_request_data, url=None):
+        """
+        Store a GitLab merge request, replacing the older copy.
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO merge_requests (project_id, iid, url, state, data, synced_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (str(project_id), int(iid), url, merge_request_data.get("state"), json.dumps(merge_request_data), time.time())
+        )
+
+    def get_merge_request(self, project_id, iid, max_age):
+        """
+        Return the stored merge request if it was synced less than max_age seconds ago, None otherwise.
+        """
+        rows = self._execute(
+            "SELECT data FROM merge_requests WHERE project_id = ? AND iid = ? AND synced_at >= ?",
+            (str(project_id), int(iid), time.time() - max_age)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def invalidate_merge_request(self, project_id, iid):
+        """
+        Drop the stored copy of a merge request, e.g. after it was merged.
+        """
+        self._execute("DELETE FROM merge_requests WHERE project_id = ? AND iid = ?", (str(project_id), int(iid)))
+
+    def get_stats(self):
+        """
+        Return the number of stored tickets, merge requests and filters.
+        """
+        return {
+            "tickets": self._execute("SELECT COUNT(*) FROM tickets")[0][0],
+            "merge_requests": self._execute("SELECT COUNT(*) FROM merge_requests")[0][0],
+            "filters": self._execute("SELECT COUNT(*) FROM filters")[0][0],
+        }
@@ -1,13 +1,49 @@
-import requests
 from core.logging_config import LoggerSetup
 from encryption.token_manager import TokenManager
 from core.config_manager import ConfigurationManager
 from core.string_constants import StringConstants
+from operations.http_transport import HttpTransport
+from operations.custom_field_index import CustomFieldIndex
+from operations.history_index import TicketHistoryIndex, audit_histories
+from operations.mantis_write_batch import MantisWriteBatch
+from core.module_routing import ModuleRoutingRegistry
+from operations.local_mirror import LocalMirror
+from collections import OrderedDict, Counter
+import threading
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 mantis_logger = LoggerSetup.setup_logger("mantis", "logs/mantis")
 
+# Named field projections for issue fetches, sent to Mantis REST as select=<fields>.
+# Fetching only what a workflow reads avoids downloading full history/attachment payloads.
+FIELD_PROFILES = {
+    "merger": ["id", "description", "status", "resolution", "tags", "notes", "custom_fields", "updated_at"],
+    "sheet_updater": ["id", "notes"],
+    "code_move_clone": [
+        "id", "summary", "description", "category", "view_state", "priority", "severity",
+        "reproducibility", "sticky", "project_version", "handler", "custom_fields",
+        "additional_information", "steps_to_reproduce", "tags"
+    ],
+    "sprint_planner": ["id", "summary", "category", "handler", "resolution", "custom_fields"],
+    "relationships": ["id", "relationships"],
+}
+# Tickets synced into the local mirror carry every field of the other profiles, so a mirrored
+# ticket can be served to any of them without downloading history or attachments
+FIELD_PROFILES["mirror"] = list(dict.fromkeys(field for profile in FIELD_PROFILES.values() for field in profile))
+
+# Branches whose attached changesets has_attached_changeset looks for
+CHANGESET_TARGET_BRANCHES = ("NS70SS01-BO", "NS70SS01-C3", "NS70SS01-C4", "NS70SS01-APP")
+
+# Number of per-issue custom field and history indexes kept by each MantisOperations instance
+INDEX_CACHE_SIZE = 64
+
 class MantisOperations:
+
+    # Project custom-field schemas shared by every instance: (mantis_path, project_id) -> (loaded_at, schema)
+    _project_schemas = {}
+    _project_schema_lock = threading.Lock()
     
     def __init__(self, project):
         """
@@ -26,17 +62,160 @@ class MantisOperations:
             'Content-Type': 'application/json'
         }
 
-    def get_ticket_data(self, ticket_number):
+        # Keep-alive connection pool shared by every Mantis client
+        self.http = HttpTransport.for_backend("mantis", self.mantis_path, config=config)
+
+        # Filter listing settings
+        self.page_size = int(config.get("MANTIS_PAGE_SIZE", 50))
+        self.fetch_workers = max(1, int(config.get("MANTIS_FETCH_WORKERS", 4)))
+        self.concurrent_fetch = str(config.get("MANTIS_CONCURRENT_FETCH", "false")).lower() == "true"
+        self.bulk_fetch_workers = max(1, int(config.get("MANTIS_BULK_FETCH_WORKERS", 8)))
+
+        # Seconds a cached project custom-field schema stays valid
+        self.schema_ttl = float(config.get("MANTIS_SCHEMA_TTL", 3600))
+
+        # Writes sent and skipped by the state-aware helpers
+        self._write_stats = Counter()
+        self._write_stats_lock = threading.Lock()
+
+        # Per-issue custom field and history indexes, most recently used last
+        self._field_indexes = OrderedDict()
+        self._history_indexes = OrderedDict()
+        self._index_lock = threading.Lock()
+
+        # Module -> developer/QA routing, shared and reloaded when the file changes
+        self.module_routing = ModuleRoutingRegistry.shared(config.get("MODULE_ROUTING_FILE", "configs/module_routing.json"))
+
+        # Optional local SQLite copy of tickets and filters, read when a caller passes max_age
+        self.mirror = LocalMirror.from_config(config)
+
+    def get_ticket_data(self, ticket_number, fields=None, max_age=None):
         """
         Fetch ticket data by ticket number.
+
+        Parameters:
+            ticket_number (int or str): The ticket ID.
+            fields (str or list[str]): Optional projection, either a FIELD_PROFILES name or a
+                list of issue fields. The full issue is returned when omitted.
+            max_age (float): Serve the ticket from the local mirror if its copy is at most this
+                many seconds old. Mantis is always queried when omitted or when the mirror is disabled.
         """
-        ticket_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}"
-        response = requests.get(ticket_url, headers=self.headers, verify=False)
-        if response.status_code == 200:
-            return response.json()['issues'][0]
-        else:
-            mantis_logger.error(f'Error fetching ticket: {response.text}')
+        if max_age is not None and self.mirror is not None:
+            ticket_data = self.mirror.get_ticket(ticket_number, max_age)
+            if ticket_data is not None:
+                return self._project(ticket_data, fields)
+
+        ticket_data, error = self._fetch_ticket(ticket_number, fields)
+        if error:
+            mantis_logger.error(f'Error fetching ticket: {error}')
+        return ticket_data
+
+    def _fetch_ticket(self, ticket_number, fields=None):
+        """
+        Fetch a single ticket without logging failures.
+
+        Returns:
+            tuple: (ticket_data, error). ticket_data is None and error holds the reason when
+                the fetch failed.
+        """
+        ticket_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}{self._select_query(fields, '?')}"
+        try:
+            response = self.http.get(ticket_url, headers=self.headers)
+            if response.status_code == 200:
+                ticket_data = response.json()['issues'][0]
+                # Only full issues and the mirror profile are mirrored, other projections would leave fields out
+                if self.mirror is not None and (not fields or fields == "mirror"):
+                    self.mirror.upsert_tickets([ticket_data])
+                return ticket_data, None
+            return None, response.text
+        except Exception as e:
+            return None, str(e)
+
+    def get_tickets_data(self, ticket_numbers, fields=None, max_workers=None, max_age=None):
+        """
+        Fetch many tickets concurrently.
+
+        Parameters:
+            ticket_numbers (list): Ticket IDs to fetch.
+            fields (str or list[str]): Optional FIELD_PROFILES name or list of issue fields.
+            max_workers (int): Maximum number of requests in flight. Defaults to MANTIS_BULK_FETCH_WORKERS.
+            max_age (float): Serve tickets whose mirror copy is at most this many seconds old from
+                the local mirror and only fetch the rest from Mantis.
+
+        Returns:
+            tuple: (tickets, errors)
+                - tickets: List of ticket data in the same order as ticket_numbers, with None
+                  for tickets that could not be fetched
+                - errors: Dict mapping each failed ticket ID to the failure reason
+        """
+        ticket_numbers = list(ticket_numbers)
+        if not ticket_numbers:
+            return [], {}
+
+        mirrored = {}
+        if max_age is not None and self.mirror is not None:
+            mirrored = self.mirror.get_tickets(ticket_numbers, max_age)
+        missing = [ticket_number for ticket_number in ticket_numbers if int(ticket_number) not in mirrored]
+
+        results = {}
+        if missing:
+            workers = max(1, min(max_workers or self.bulk_fetch_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = dict(zip(missing, executor.map(lambda ticket_number: self._fetch_ticket(ticket_number, fields), missing)))
+
+        tickets = []
+        errors = {}
+        for ticket_number in ticket_numbers:
+            if int(ticket_number) in mirrored:
+                tickets.append(self._project(mirrored[int(ticket_number)], fields))
+                continue
+            ticket_data, error = results[ticket_number]
+            tickets.append(ticket_data)
+            if error:
+                errors[ticket_number] = error
+
+        return tickets, errors
+
+    def _select_query(self, fields, separator="&"):
+        """
+        Build the select= query string part for a field projection.
+
+        Parameters:
+            fields (str or list[str]): A FIELD_PROFILES name, a list of issue fields, or None.
+            separator (str): "?" or "&", depending on whether the URL already has a query.
+
+        Returns:
+            str: The query string part, or an empty string when no projection is requested.
+        """
+        fields = self._resolve_fields(fields)
+        if not fields:
+            return ""
+        return f"{separator}select={','.join(fields)}"
+
+    def _resolve_fields(self, fields):
+        """
+        Turn a FIELD_PROFILES name or a list of issue fields into a list of fields (None for all).
+        """
+        if not fields:
             return None
+        if isinstance(fields, str):
+            if fields not in FIELD_PROFILES:
+                raise ValueError(f"Unknown Mantis field profile: {fields}")
+            return FIELD_PROFILES[fields]
+        return list(fields)
+
+    def _project(self, issue, fields):
+        """
+        Apply a field projection to a full issue, as Mantis would for select=<fields>.
+        """
+        fields = self._resolve_fields(fields)
+        if fields is None:
+            return issue
+        return {field: issue[field] for field in fields if field in issue}
+
+    def _invalidate_mirror(self, ticket_id):
+        if self.mirror is not None:
+            self.mirror.invalidate_ticket(ticket_id)
 
     def get_ticket_url(self, ticket_number):
         ticket_url = f"{self.mantis_path}/view.php?id={ticket_number}"
@@ -45,34 +224,180 @@ class MantisOperations:
     def add_note_to_ticket(self, ticket_number, note_text):
         """
         Add a note to a specific ticket.
+
+        Returns:
+            bool: True if Mantis accepted the note, False otherwise.
         """
         note_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/notes"
         payload = {"text": note_text}
-        response = requests.post(note_url, headers=self.headers, json=payload, verify=False)
+        response = self.http.post(note_url, headers=self.headers, json=payload)
+        self._invalidate_mirror(ticket_number)
         if response.status_code != 201:
             mantis_logger.error(f'Error while adding note to ticket {ticket_number}: {response.text}')
+            return False
+        return True
+
+    def patch_issue(self, ticket_id, payload, error_message=None):
+        """
+        Send one PATCH with the given field changes to an issue.
+
+        Parameters:
+            ticket_id (int or str): The ticket ID.
+            payload (dict): Issue fields to change, in Mantis REST format.
+            error_message (str): Message logged (followed by the response) if the update fails.
+
+        Returns:
+            bool: True if Mantis accepted the update, False otherwise.
+        """
+        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
+        response = self.http.patch(update_url, headers=self.headers, json=payload)
+        self._invalidate_mirror(ticket_id)
+        if response.status_code != 200:
+            mantis_logger.error(f'{error_message or f"Failed to update Ticket ID {ticket_id}"}: {response.text}')
+            return False
+        return True
+
+    def batch(self, known_issues=None):
+        """
+        Start a unit of work that coalesces field changes into one PATCH per ticket.
+
+        Parameters:
+            known_issues (list[dict]): Optional issues already loaded in memory. Changes that
+                would not alter their current state are dropped at flush time.
+
+        Usage:
+            with mantis.batch(known_issues=[ticket_data]) as batch:
+                batch.set_resolution(ticket_id, "Fixed")
+                batch.set_status(ticket_id, "assigned")
+            written = all(batch.results.values())
+        """
+        return MantisWriteBatch(self, known_issues=known_issues)
 
     def close_ticket(self, ticket_number):
         """
         Close a specific ticket.
         """
-        close_ticket_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}"
         payload = {"status": {"name": "closed"}}
-        response = requests.patch(close_ticket_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Error while closing ticket {ticket_number}: {response.text}')
+        return self.patch_issue(ticket_number, payload, f'Error while closing ticket {ticket_number}')
 
-    def get_tickets_from_filter(self, filter_ids):
+    def get_tickets_from_filter(self, filter_ids, page_size=None, concurrent=None, fields=None, max_age=None):
         """
         Get ticket data from one or more Mantis filters.
 
         Parameters:
             filter_ids (int or list[int]): A single filter ID or a list of filter IDs.
+            page_size (int): Number of issues requested per page. Defaults to MANTIS_PAGE_SIZE.
+            concurrent (bool): Fetch all filters in parallel and pipeline their pages through a
+                bounded worker pool. Defaults to MANTIS_CONCURRENT_FETCH.
+            fields (str or list[str]): Optional FIELD_PROFILES name or list of issue fields.
+            max_age (float): Read the filters from the local mirror if they were synced at most
+                this many seconds ago.
 
         Returns:
-            list: Combined list of ticket data from all provided filters.
+            list: Combined list of ticket data from all provided filters, without duplicates.
+        """
+        return list(self.iter_tickets_from_filter(filter_ids, page_size=page_size, concurrent=concurrent, fields=fields, max_age=max_age))
+
+    def iter_tickets_from_filter(self, filter_ids, page_size=None, concurrent=None, stats=None, fields=None, max_age=None):
+        """
+        Yield tickets from one or more Mantis filters as soon as each page arrives.
+
+        The next page is requested before the current one is handed to the caller, so
+        processing a page overlaps with downloading the following one.
+
+        Parameters:
+            filter_ids (int or list[int]): A single filter ID or a list of filter IDs.
+            page_size (int): Number of issues requested per page. Defaults to MANTIS_PAGE_SIZE.
+            concurrent (bool): Fetch all filters in parallel. Defaults to MANTIS_CONCURRENT_FETCH.
+            fields (str or list[str]): Optional FIELD_PROFILES name or list of issue fields.
+            stats (dict): Optional dict updated in place with "fetched" (tickets yielded so far),
+                "total" (total reported by Mantis, or an estimate while pages are still
+                outstanding) and "complete" (True once every page has been read).
+            max_age (float): Read the filters from the local mirror if they were synced at most
+                this many seconds ago; Mantis is queried if any of them is not.
+
+        Yields:
+            dict: Ticket data, each ticket at most once.
         """
+        filter_ids = self.normalize_filter_ids(filter_ids)
+
+        mirrored = self._get_mirrored_filters(filter_ids, max_age)
+        if mirrored is not None:
+            if stats is None:
+                stats = {}
+            stats.update({"fetched": 0, "total": len(mirrored), "complete": True})
+            for issue in mirrored:
+                stats["fetched"] += 1
+                yield self._project(issue, fields)
+            return
+
+        limit = page_size or self.page_size
+        select = self._select_query(fields)
+        if concurrent is None:
+            concurrent = self.concurrent_fetch
+
+        if stats is None:
+            stats = {}
+        stats.update({"fetched": 0, "total": 0, "complete": False})
+
+        if concurrent and filter_ids:
+            pages = self._iter_filter_pages_concurrently(filter_ids, limit, select)
+        else:
+            pages = self._iter_filter_pages_serially(filter_ids, limit, select)
+
+        fetched_per_filter = [0] * len(filter_ids)
+        reported_totals = {}
+        finished_filters = set()
+        seen_ids = set()
+
+        for index, issues, total_count, is_last in pages:
+            fetched_per_filter[index] += len(issues)
+            if total_count is not None:
+                reported_totals[index] = total_count
+            if is_last:
+                finished_filters.add(index)
+
+            # Unfinished filters are assumed to have at least one more full page
+            stats["total"] = sum(
+                reported_totals.get(i, count if i in finished_filters else count + limit)
+                for i, count in enumerate(fetched_per_filter)
+            )
+
+            for issue in issues:
+                # The same ticket can be matched by more than one filter
+                if issue["id"] in seen_ids:
+                    continue
+                seen_ids.add(issue["id"])
+                stats["fetched"] += 1
+                yield issue
 
+        stats["total"] = stats["fetched"]
+        stats["complete"] = True
+
+    def _get_mirrored_filters(self, filter_ids, max_age):
+        """
+        Return the deduplicated tickets of the filters from the mirror, or None if any filter is not fresh.
+        """
+        if max_age is None or self.mirror is None or not filter_ids:
+            return None
+
+        tickets = []
+        seen_ids = set()
+        for filter_id in filter_ids:
+            filter_tickets = self.mirror.get_filter_tickets(filter_id, max_age)
+            if filter_tickets is None:
+                return None
+            for issue in filter_tickets:
+                if issue["id"] not in seen_ids:
+                    seen_ids.add(issue["id"])
+                    tickets.append(issue)
+        return tickets
+
+    @staticmethod
+    def normalize_filter_ids(filter_ids):
+        """
+        Accept a single filter ID, a comma-separated string or a list and return a list of IDs.
+        """
         # Handle comma-separated strings
         if isinstance(filter_ids, str):
             filter_ids = [int(fid.strip()) for fid in filter_ids.split(",") if fid.strip().isdigit()]
@@ -80,127 +405,167 @@ class MantisOperations:
         if isinstance(filter_ids, int):
             filter_ids = [filter_ids]  # Convert single ID to list
 
-        all_tickets = []
+        return list(filter_ids or [])
 
-        for filter_id in filter_ids:
-            tickets = []
-            page = 1
-            limit = 50
-
-            while True:
-                filter_url = f"{self.mantis_path}/api/rest/issues?filter_id={filter_id}&page={page}&limit={limit}"
-                try:
-                    response = requests.get(filter_url, headers=self.headers, verify=False)
-                    if response.status_code != 200:
-                        mantis_logger.error(f"[Filter {filter_id}] Error fetching tickets: {response.text}")
-                        break
-
-                    ticket_data = response.json()
-                    issues = ticket_data.get("issues", [])
-                    tickets.extend(issues)
-
-                    if len(issues) < limit:
-                        break
+    def _fetch_filter_page(self, filter_id, page, limit, select=""):
+        """
+        Fetch a single page of a Mantis filter.
+
+        Returns:
+            tuple: (issues, total_count). issues is None if the request failed; total_count is
+                None unless Mantis reports it.
+        """
+        filter_url = f"{self.mantis_path}/api/rest/issues?filter_id={filter_id}&page={page}&limit={limit}{select}"
+        try:
+            response = self.http.get(filter_url, headers=self.headers)
+            if response.status_code != 200:
+                mantis_logger.error(f"[Filter {filter_id}] Error fetching tickets: {response.text}")
+                return None, None
+
+            ticket_data = response.json()
+            return ticket_data.get("issues", []), ticket_data.get("total_count")
+
+        except Exception as e:
+            mantis_logger.error(f"[Filter {filter_id}] Exception while fetching tickets: {e}")
+            return None, None
+
+    def _iter_filter_pages_serially(self, filter_ids, limit, select=""):
+        """
+        Yield (filter_index, issues, total_count, is_last) for every page of every filter in
+        order, keeping one page request in flight ahead of the caller.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for index, filter_id in enumerate(filter_ids):
+                page = 1
+                future = executor.submit(self._fetch_filter_page, filter_id, page, limit, select)
+
+                while future is not None:
+                    issues, total_count = future.result()
+                    is_last = issues is None or len(issues) < limit
+
+                    # Request the next page before handing this one over
                     page += 1
+                    future = None if is_last else executor.submit(self._fetch_filter_page, filter_id, page, limit, select)
 
-                except Exception as e:
-                    mantis_logger.error(f"[Filter {filter_id}] Exception while fetching tickets: {e}")
-                    break
+                    yield index, issues or [], total_count, is_last
 
-            all_tickets.extend(tickets)
+    def _iter_filter_pages_concurrently(self, filter_ids, limit, select=""):
+        """
+        Fetch all filters in parallel, keeping a window of page requests in flight per filter.
 
-        return all_tickets
+        A filter stops issuing new page requests as soon as one of its pages comes back short
+        (or fails); pages beyond that point which were already in flight are discarded. Pages
+        are yielded as (filter_index, issues, total_count, is_last) in page order within each
+        filter, while different filters interleave.
+        """
+        buffered = {}
+        last_page = {}
+        next_page = {}
+        next_to_yield = {index: 1 for index in range(len(filter_ids))}
+        pending = {}
+        read_ahead = max(1, self.fetch_workers // len(filter_ids))
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers)
+
+        def submit(index):
+            page = next_page.get(index, 1)
+            future = executor.submit(self._fetch_filter_page, filter_ids[index], page, limit, select)
+            pending[future] = (index, page)
+            next_page[index] = page + 1
 
+        try:
+            for index in range(len(filter_ids)):
+                for _ in range(read_ahead):
+                    submit(index)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, page = pending.pop(future)
+                    issues, total_count = future.result()
+
+                    if index in last_page and page > last_page[index]:
+                        continue
+
+                    is_last = issues is None or len(issues) < limit
+                    if is_last:
+                        last_page[index] = min(page, last_page.get(index, page))
+                    elif index not in last_page:
+                        submit(index)
+                    buffered[(index, page)] = (issues or [], total_count, is_last)
+
+                    # Hand over every page of this filter that is now contiguous
+                    while (index, next_to_yield[index]) in buffered:
+                        page_to_yield = next_to_yield[index]
+                        if index in last_page and page_to_yield > last_page[index]:
+                            break
+                        page_issues, page_total, page_is_last = buffered.pop((index, page_to_yield))
+                        next_to_yield[index] = page_to_yield + 1
+                        yield index, page_issues, page_total, page_is_last
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def update_status_to_fixed(self, ticket_id):
         """
         Update ticket status to 'Fixed'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"resolution": {"name": "Fixed"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update status for Ticket ID {ticket_id}')
 
     def update_owner(self, ticket_id,owner_id):
         """
         Changing the ticket owner.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"handler": {"id": owner_id}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update owner for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update owner for Ticket ID {ticket_id}')
 
     def update_status_to_new(self, ticket_id):
         """
         Update ticket status to 'New'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"resolution": {"name": "New"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update status for Ticket ID {ticket_id}')
 
     def update_status_to_doh(self, ticket_id):
         """
         Update ticket status to 'Deployable on Hold'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"resolution": {"name": "Deployable on Hold"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update status for Ticket ID {ticket_id}')
 
     def update_status_to_for_qa(self, ticket_id):
         """
         Update ticket status to 'For QA'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"resolution": {"name": "For QA"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update status for Ticket ID {ticket_id}')
 
     def update_qa_status_to_assigned(self, ticket_id):
         """
         Update ticket status to 'assigned'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"status": {"name": "assigned"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update QA status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update QA status for Ticket ID {ticket_id}')
 
     def update_qa_status_to_accepted(self, ticket_id):
         """
         Update ticket status to 'QA Accepted'.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"status": {"name": "confirmed"}}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update QA status for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update QA status for Ticket ID {ticket_id}')
 
     def update_title(self, ticket_id, new_title):
         """
         Update ticket title/summary.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"summary": new_title}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update title for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update title for Ticket ID {ticket_id}')
 
     def update_description(self, ticket_id, new_description):
         """
         Update ticket description.
         """
-        update_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}"
         payload = {"description": new_description}
-        response = requests.patch(update_url, headers=self.headers, json=payload, verify=False)
-        if response.status_code != 200:
-            mantis_logger.error(f'Failed to update description for Ticket ID {ticket_id}: {response.text}')
+        return self.patch_issue(ticket_id, payload, f'Failed to update description for Ticket ID {ticket_id}')
 
     def add_tags_to_ticket(self, ticket_number, tag_ids):
         """
@@ -208,7 +573,8 @@ class MantisOperations:
         """
         tags_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/tags"
         payload = {"tags": [{"id": tag_id} for tag_id in tag_ids]}
-        response = requests.post(tags_url, headers=self.headers, json=payload, verify=False)
+        response = self.http.post(tags_url, headers=self.headers, json=payload)
+        self._invalidate_mirror(ticket_number)
         if response.status_code != 201:
             mantis_logger.error(f'Error while adding tags to ticket {ticket_number}: {response.text}')
             return False
@@ -219,15 +585,145 @@ class MantisOperations:
         Detach tags from a specific ticket.
         """
         success = True
+        self._invalidate_mirror(ticket_number)
         for tag_id in tag_ids:
             tag_url = f"{self.mantis_path}/api/rest/issues/{ticket_number}/tags/{tag_id}"
-            response = requests.delete(tag_url, headers=self.headers, verify=False)
+            response = self.http.delete(tag_url, headers=self.headers)
             if response.status_code != 200:
                 mantis_logger.error(f"Error while detaching tag ID {tag_id} from ticket {ticket_number}: {response.text}")
                 success = False
         return success
 
 
+    def ensure_tags_attached(self, issue, tag_ids):
+        """
+        Attach only the tags that the loaded issue does not already carry.
+
+        Parameters:
+            issue (dict): The Mantis issue data; its "tags" list is used as the known state and
+                is updated in place after a successful write. If the issue was loaded without
+                tags, every tag is sent.
+            tag_ids (list): IDs of the tags that should be attached.
+
+        Returns:
+            bool: True if every tag is attached (or already was), False otherwise.
+        """
+        known_tags = self._known_tag_ids(issue)
+        missing = [tag_id for tag_id in tag_ids if known_tags is None or str(tag_id) not in known_tags]
+        self.record_write("tag_attach", skipped=len(tag_ids) - len(missing))
+        if not missing:
+            return True
+
+        self.record_write("tag_attach", sent=len(missing))
+        success = self.add_tags_to_ticket(issue["id"], missing)
+        if success and known_tags is not None:
+            issue["tags"] = list(issue.get("tags") or []) + [{"id": tag_id} for tag_id in missing]
+        return success
+
+    def ensure_tags_detached(self, issue, tag_ids):
+        """
+        Detach only the tags that the loaded issue actually carries.
+
+        Parameters:
+            issue (dict): The Mantis issue data; its "tags" list is used as the known state and
+                is updated in place after a successful write. If the issue was loaded without
+                tags, every tag is sent.
+            tag_ids (list): IDs of the tags that should not be attached.
+
+        Returns:
+            bool: True if none of the tags remain attached, False otherwise.
+        """
+        known_tags = self._known_tag_ids(issue)
+        attached = [tag_id for tag_id in tag_ids if known_tags is None or str(tag_id) in known_tags]
+        self.record_write("tag_detach", skipped=len(tag_ids) - len(attached))
+        if not attached:
+            return True
+
+        self.record_write("tag_detach", sent=len(attached))
+        success = self.detach_tags_from_ticket(issue["id"], attached)
+        if success and known_tags is not None:
+            removed = {str(tag_id) for tag_id in attached}
+            issue["tags"] = [tag for tag in issue.get("tags") or [] if str(tag.get("id")) not in removed]
+        return success
+
+    def _known_tag_ids(self, issue):
+        """
+        Return the set of tag IDs (as strings) on a loaded issue, or None if tags were not loaded.
+        """
+        if "tags" not in issue:
+            return None
+        return {str(tag.get("id")) for tag in issue.get("tags") or []}
+
+    def record_write(self, kind, sent=0, skipped=0):
+        """
+        Count Mantis writes sent and writes skipped because the ticket was already in the desired state.
+        """
+        with self._write_stats_lock:
+            if sent:
+                self._write_stats[f"{kind}_sent"] += sent
+            if skipped:
+                self._write_stats[f"{kind}_skipped"] += skipped
+
+    def get_write_stats(self):
+        """
+        Return a snapshot of the write counters, e.g. {"tag_detach_sent": 2, "tag_detach_skipped": 40}.
+        """
+        with self._write_stats_lock:
+            return dict(self._write_stats)
+
+    def get_skipped_write_count(self):
+        """
+        Return the total number of writes skipped because they would not change anything.
+        """
+        with self._write_stats_lock:
+            return sum(count for key, count in self._write_stats.items() if key.endswith("_skipped"))
+
+    def get_rate_limit_metrics(self):
+        """
+        Return the current request rate, concurrency limit and throttling counters for the Mantis host,
+        or None when rate limiting is disabled.
+        """
+        return self.http.get_metrics().get("rate_limiter")
+
+    def get_field_index(self, issue):
+        """
+        Return the CustomFieldIndex for an issue, building it on first use.
+
+        Indexes are cached per issue object, so every getter called on the same ticket
+        shares one index.
+        """
+        return self._get_cached_index(self._field_indexes, issue, CustomFieldIndex)
+
+    def get_history_index(self, ticket):
+        """
+        Return the TicketHistoryIndex for a ticket (or for a bare 'history' list), building it on first use.
+        """
+        history = ticket if isinstance(ticket, list) else ticket.get("history", [])
+        return self._get_cached_index(self._history_indexes, history, TicketHistoryIndex)
+
+    def _get_cached_index(self, cache, source, factory):
+        """
+        Look up or build the index of a source object in one of the per-object LRU caches.
+
+        The cache keeps a reference to the source, which guarantees the identity check cannot
+        match a different object reusing the same id().
+        """
+        key = id(source)
+        with self._index_lock:
+            cached = cache.get(key)
+            if cached is not None and cached[0] is source:
+                cache.move_to_end(key)
+                return cached[1]
+
+        index = factory(source)
+
+        with self._index_lock:
+            cache[key] = (source, index)
+            while len(cache) > INDEX_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return index
+
     def get_custom_field(self, issue, field_name):
         """
         Retrieve the value of a custom field from a Mantis issue.
@@ -240,26 +736,95 @@ class MantisOperations:
             str: The value of the custom field, or an empty string if not found or an error occurs.
         """
         try:
-            # Check if the issue has custom fields
-            if 'custom_fields' in issue:
-                for custom_field in issue['custom_fields']:
-                    if custom_field.get('field', {}).get('name') == field_name:
-                        return custom_field.get('value', "")
+            return self.get_field_index(issue).get(field_name)
         except Exception as e:
-            mantis_logger.error(f"Error while getting custom field {field_name} from ticket {issue["id"]}")
+            mantis_logger.error(f"Error while getting custom field {field_name} from ticket {(issue or {}).get('id')}: {e}")
+        return ""
+
+    def get_custom_field_by_id(self, issue, field_id):
+        """
+        Retrieve the value of a custom field from a Mantis issue by its field ID.
+
+        Returns:
+            str: The value of the custom field, or an empty string if not found or an error occurs.
+        """
+        try:
+            return self.get_field_index(issue).get_by_id(field_id)
+        except Exception as e:
+            mantis_logger.error(f"Error while getting custom field {field_id} from ticket {(issue or {}).get('id')}: {e}")
         return ""
 
     def get_custom_fields_for_project(self, project_id):
         """
         Fetch valid custom field IDs for a specific Mantis project.
+        Served from the project schema cache.
+        """
+        return list(self.get_project_schema(project_id).keys())
+
+    def get_project_schema(self, project_id, force_refresh=False):
+        """
+        Return the custom-field schema of a Mantis project, cached for MANTIS_SCHEMA_TTL seconds.
+
+        The cache is shared by every MantisOperations instance pointing at the same Mantis server.
+
+        Parameters:
+            project_id (int or str): The Mantis project ID.
+            force_refresh (bool): Ignore any cached schema and fetch it again.
+
+        Returns:
+            dict: Field ID -> {"id", "name", "type"}, in the order Mantis returns them.
+                Empty if the schema could not be fetched (failures are not cached).
+        """
+        key = (self.mantis_path, str(project_id))
+        if not force_refresh:
+            with MantisOperations._project_schema_lock:
+                cached = MantisOperations._project_schemas.get(key)
+            if cached and time.monotonic() - cached[0] < self.schema_ttl:
+                return cached[1]
+
+        schema = self._fetch_project_schema(project_id)
+        if schema:
+            with MantisOperations._project_schema_lock:
+                MantisOperations._project_schemas[key] = (time.monotonic(), schema)
+        return schema
+
+    def get_project_field_id(self, project_id, field_name):
+        """
+        Return the ID of a project custom field by name, or None if the project has no such field.
+        """
+        for field_id, field in self.get_project_schema(project_id).items():
+            if field["name"] == field_name:
+                return field_id
+        return None
+
+    def invalidate_project_schema(self, project_id=None):
+        """
+        Drop the cached schema of one project, or of every project on this Mantis server.
+        """
+        with MantisOperations._project_schema_lock:
+            for key in list(MantisOperations._project_schemas):
+                if key[0] == self.mantis_path and (project_id is None or key[1] == str(project_id)):
+                    del MantisOperations._project_schemas[key]
+
+    def preload_project_schemas(self, project_ids):
+        """
+        Fetch and cache the schemas of the given projects, e.g. at application startup.
+        """
+        for project_id in project_ids:
+            if not self.get_project_schema(project_id, force_refresh=True):
+                mantis_logger.error(f"Could not preload the custom field schema of project {project_id}")
+
+    def _fetch_project_schema(self, project_id):
+        """
+        Fetch the custom fields of a Mantis project.
         Cleans up garbage HTML after valid JSON in the response.
         """
         url = f"{self.mantis_path}/api/rest/projects/{project_id}/custom_fields"
         try:
-            response = requests.get(url, headers=self.headers, verify=False)
+            response = self.http.get(url, headers=self.headers)
             if response.status_code != 200:
                 mantis_logger.error(f"Error fetching custom fields: {response.text}")
-                return []
+                return {}
 
             # Clean up HTML/PHP warnings by truncating to last valid JSON bracket
             text = response.text
@@ -267,14 +832,17 @@ class MantisOperations:
 
             try:
                 project_data = json.loads(json_text)
-                return [field['id'] for field in project_data['projects'][0].get('custom_fields', [])]
+                return {
+                    field['id']: {"id": field['id'], "name": field.get('name'), "type": field.get('type')}
+                    for field in project_data['projects'][0].get('custom_fields', [])
+                }
             except json.JSONDecodeError as je:
                 mantis_logger.error(f"JSON decode error after cleanup: {je}")
-                return []
+                return {}
 
         except Exception as e:
             mantis_logger.error(f"Exception in get_custom_fields_for_project: {e}")
-            return []
+            return {}
 
         
     def relate_issues(self, original_issue_id, related_issue_id):
@@ -286,78 +854,211 @@ class MantisOperations:
             "issue": {"id": related_issue_id},
             "type": {"name": "related-to"}
         }
+        self._invalidate_mirror(original_issue_id)
         try:
-            response = requests.post(url, headers=self.headers, json=payload, verify=False)
+            response = self.http.post(url, headers=self.headers, json=payload)
             if response.status_code != 201:
                 mantis_logger.error(f"Failed to relate issues {original_issue_id} -> {related_issue_id}: {response.text}")
         except Exception as e:
             mantis_logger.error(f"Exception while relating issues {original_issue_id} -> {related_issue_id}: {e}")
 
     
-    def unrelate_issues(self, original_issue_id, related_issue_id):
+    def get_relationships(self, ticket_id, issue=None):
+        """
+        Return the relationships of a ticket.
+
+        Parameters:
+            ticket_id (int or str): The ticket ID.
+            issue (dict): Optional issue already loaded in memory. Its "relationships" are used
+                when present; otherwise only the relationships projection is fetched.
+
+        Returns:
+            list: The relationships, or None if they could not be fetched.
+        """
+        if issue is not None and "relationships" in issue:
+            return issue.get("relationships") or []
+
+        issue_data = self.get_ticket_data(ticket_number=ticket_id, fields="relationships")
+        if issue_data is None:
+            return None
+        return issue_data.get("relationships", [])
+
+    def _delete_relationship(self, ticket_id, relationship_id):
+        """
+        Delete one relationship without logging.
+
+        Returns:
+            str: None on success, otherwise the failure reason.
+        """
+        delete_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}/relationships/{relationship_id}"
+        self._invalidate_mirror(ticket_id)
+        try:
+            response = self.http.delete(delete_url, headers=self.headers)
+            if response.status_code != 200:
+                return response.text
+            return None
+        except Exception as e:
+            return str(e)
+
+    def unrelate_issues(self, original_issue_id, related_issue_id, issue=None):
         """
         Remove the relationship between two issues.
+
+        Parameters:
+            original_issue_id (int or str): The ticket holding the relationship.
+            related_issue_id (int or str): The related ticket.
+            issue (dict): Optional already loaded data of the original ticket.
+
+        Returns:
+            bool: True if the relationship was removed, False otherwise.
         """
         try:
             # First, get all relationships for the original issue
-            issue_data = self.get_ticket_data(ticket_number=original_issue_id)
-            relationships = issue_data.get("relationships", [])
+            relationships = self.get_relationships(original_issue_id, issue=issue)
+            if relationships is None:
+                mantis_logger.error(f"Could not read relationships of {original_issue_id}.")
+                return False
 
             # Find the relationship to the related_issue_id
-            relationship_id = None
-            for relation in relationships:
-                if relation.get("issue").get("id") == related_issue_id:
-                    relationship_id = relation.get("id")
-                    break
+            relationship_id = self._find_relationship_id(relationships, related_issue_id)
 
             if not relationship_id:
                 mantis_logger.info(f"No relationship found between {original_issue_id} and {related_issue_id}.")
-                return
+                return False
 
             # Now delete the relationship
-            delete_url = f"{self.mantis_path}/api/rest/issues/{original_issue_id}/relationships/{relationship_id}"
-            delete_response = requests.delete(delete_url, headers=self.headers, verify=False)
-            if delete_response.status_code != 200:
-                mantis_logger.error(f"Failed to delete relationship {relationship_id}: {delete_response.text}")
-            else:
-                mantis_logger.info(f"Successfully removed relationship between {original_issue_id} and {related_issue_id}")
+            error = self._delete_relationship(original_issue_id, relationship_id)
+            if error:
+                mantis_logger.error(f"Failed to delete relationship {relationship_id}: {error}")
+                return False
+
+            mantis_logger.info(f"Successfully removed relationship between {original_issue_id} and {related_issue_id}")
+            return True
 
         except Exception as e:
             mantis_logger.error(f"Exception while unrelating issues {original_issue_id} -> {related_issue_id}: {e}")
+            return False
+
+    def _find_relationship_id(self, relationships, related_issue_id):
+        """
+        Return the ID of the relationship pointing at related_issue_id, or None.
+        """
+        for relation in relationships:
+            if str((relation.get("issue") or {}).get("id")) == str(related_issue_id):
+                return relation.get("id")
+        return None
+
+    def unrelate_issues_bulk(self, ticket_ids, related_issue_id, issues=None, max_workers=None):
+        """
+        Remove the relationship to related_issue_id (e.g. a control ticket) from many tickets.
+
+        Relationships of tickets not passed in issues are fetched concurrently with the
+        relationships projection, then every DELETE is sent concurrently.
+
+        Parameters:
+            ticket_ids (list): Tickets to unrelate.
+            related_issue_id (int or str): The ticket to unrelate them from.
+            issues (list[dict]): Optional already loaded ticket data.
+            max_workers (int): Maximum number of requests in flight. Defaults to MANTIS_BULK_FETCH_WORKERS.
+
+        Returns:
+            dict: {"removed": [ticket IDs], "not_related": [ticket IDs], "failed": {ticket ID: reason}}
+        """
+        loaded = {str(issue["id"]): issue for issue in issues or [] if issue}
+        to_fetch = [ticket_id for ticket_id in ticket_ids if str(ticket_id) not in loaded]
+        fetched, fetch_errors = self.get_tickets_data(to_fetch, fields="relationships", max_workers=max_workers)
+        for ticket_id, issue in zip(to_fetch, fetched):
+            if issue is not None:
+                loaded[str(ticket_id)] = issue
+
+        result = {"removed": [], "not_related": [], "failed": dict(fetch_errors)}
+        deletes = []
+        for ticket_id in ticket_ids:
+            issue = loaded.get(str(ticket_id))
+            if issue is None:
+                continue
+            relationship_id = self._find_relationship_id(issue.get("relationships") or [], related_issue_id)
+            if relationship_id:
+                deletes.append((ticket_id, relationship_id))
+            else:
+                result["not_related"].append(ticket_id)
+
+        errors = self._delete_relationships_concurrently(deletes, max_workers)
+        for (ticket_id, relationship_id), error in zip(deletes, errors):
+            if error:
+                result["failed"][ticket_id] = error
+            else:
+                result["removed"].append(ticket_id)
+
+        mantis_logger.info(
+            f"Unrelated {len(result['removed'])} tickets from {related_issue_id}, "
+            f"{len(result['not_related'])} were not related, {len(result['failed'])} failed."
+        )
+        return result
+
+    def _delete_relationships_concurrently(self, deletes, max_workers=None):
+        """
+        Send DELETEs for (ticket_id, relationship_id) pairs on a bounded thread pool.
+
+        Returns:
+            list: The failure reason (or None) for each pair, in input order.
+        """
+        if not deletes:
+            return []
+        workers = max(1, min(max_workers or self.bulk_fetch_workers, len(deletes)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda pair: self._delete_relationship(*pair), deletes))
 
-    def delete_all_relationships(self, ticket_id):
+    def delete_all_relationships(self, ticket_id, issue=None, max_workers=None):
         """
         Delete all relationships from the specified ticket.
+
+        Parameters:
+            ticket_id (int or str): The ticket ID.
+            issue (dict): Optional already loaded ticket data.
+            max_workers (int): Maximum number of DELETEs in flight. Defaults to MANTIS_BULK_FETCH_WORKERS.
+
+        Returns:
+            dict: {"deleted": [relationship IDs], "failed": {relationship ID: reason}}
         """
+        result = {"deleted": [], "failed": {}}
         try:
-            # Fetch ticket data including relationships
-            issue_data = self.get_ticket_data(ticket_number=ticket_id)
-            relationships = issue_data.get("relationships", [])
+            # Fetch the relationships unless they are already loaded
+            relationships = self.get_relationships(ticket_id, issue=issue)
+            if relationships is None:
+                mantis_logger.error(f"Could not read relationships of ticket {ticket_id}.")
+                return result
 
             if not relationships:
                 mantis_logger.info(f"No relationships found for ticket {ticket_id}.")
-                return
+                return result
 
+            deletes = []
             for relation in relationships:
-                related_issue_id = relation.get("issue", {}).get("id")
+                related_issue_id = (relation.get("issue") or {}).get("id")
                 relationship_id = relation.get("id")
 
                 if not relationship_id or not related_issue_id:
                     mantis_logger.warning(f"Invalid relationship structure found in ticket {ticket_id}. Skipping...")
                     continue
-
-                # Build the DELETE URL
-                delete_url = f"{self.mantis_path}/api/rest/issues/{ticket_id}/relationships/{relationship_id}"
-                delete_response = requests.delete(delete_url, headers=self.headers, verify=False)
-
-                if delete_response.status_code == 200:
-                    mantis_logger.info(f"Removed relationship {relationship_id} (related to issue {related_issue_id}) from ticket {ticket_id}.")
+                deletes.append((relationship_id, related_issue_id))
+
+            errors = self._delete_relationships_concurrently(
+                [(ticket_id, relationship_id) for relationship_id, _ in deletes], max_workers
+            )
+            for (relationship_id, related_issue_id), error in zip(deletes, errors):
+                if error:
+                    mantis_logger.error(f"Failed to delete relationship {relationship_id} from ticket {ticket_id}: {error}")
+                    result["failed"][relationship_id] = error
                 else:
-                    mantis_logger.error(f"Failed to delete relationship {relationship_id} from ticket {ticket_id}: {delete_response.text}")
+                    mantis_logger.info(f"Removed relationship {relationship_id} (related to issue {related_issue_id}) from ticket {ticket_id}.")
+                    result["deleted"].append(relationship_id)
 
         except Exception as e:
             mantis_logger.error(f"Exception while deleting all relationships from ticket {ticket_id}: {e}")
 
+        return result
+
 
 
     def has_attached_changeset(self,ticket_history):
@@ -370,19 +1071,7 @@ class MantisOperations:
         Returns:
             bool: True if changeset for a known target branch is attached, False otherwise.
         """
-        target_branches = {"NS70SS01-BO", "NS70SS01-C3", "NS70SS01-C4", "NS70SS01-APP"}
-
-        for entry in ticket_history:
-            field = entry.get("field", {}).get("name", "")
-            message = entry.get("message", "")
-            new_value = entry.get("new_value", "")
-
-            if field == "Source_changeset_attached" and message == "Changeset attached":
-                # Check if any known target branch is in the new_value
-                if any(branch in new_value for branch in target_branches):
-                    return True
-
-        return False
+        return self.get_history_index(ticket_history).has_changeset_for_any(CHANGESET_TARGET_BRANCHES)
 
     def has_status_changed(self,ticket,from_status,to_status,user):
         """
@@ -397,21 +1086,23 @@ class MantisOperations:
         Returns:
             bool: True if status changed from the from_status to the to_status, False otherwise.
         """
-        history = ticket.get("history", [])[::-1]  # Reverse the history list
-
-
-        for entry in history:
-            if (entry.get("field", {}).get("name") == "resolution" and
-                entry.get("message") == "Current Status"):
+        return self.get_history_index(ticket).has_transition(
+            "resolution", from_status, to_status, user=user, message="Current Status"
+        )
 
-                old_status = entry.get("old_value", {}).get("name", "")
-                new_status = entry.get("new_value", {}).get("name", "")
-                mantis_user = entry.get("user", {}).get("name", "")
+    def audit_ticket_histories(self, tickets, checks):
+        """
+        Run the same history checks over many tickets, building each ticket's index once.
 
-                if mantis_user==user and old_status == from_status and new_status == to_status:
-                    return True
+        Parameters:
+            tickets (list[dict]): Mantis tickets loaded with their history.
+            checks (dict): Check name -> callable taking a TicketHistoryIndex, e.g.
+                {"doh": lambda h: h.has_transition("resolution", "Partially Fixed", "Deployable on Hold")}
 
-        return False
+        Returns:
+            dict: Ticket ID -> {check name: bool}
+        """
+        return audit_histories(tickets, checks, self.get_history_index)
 
 
     def create_ticket(self, ticket_data):
@@ -420,7 +1111,7 @@ class MantisOperations:
         """
         url = f"{self.mantis_path}/api/rest/issues/"
         try:
-            response = requests.post(url, headers=self.headers, json=ticket_data, verify=False)
+            response = self.http.post(url, headers=self.headers, json=ticket_data)
             if response.status_code == 201:
                 return response.json()
             else:
@@ -432,121 +1123,25 @@ class MantisOperations:
             return None
 
     def get_developer_for_module(self,moduleName):
-        #   Map for getting dev name wrt module
-        devModuleMap = {
-        "Activities" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "Admin" : StringConstants.SYED_ZAIN_BADAR_UDDIN,
-        "AP" : StringConstants.OWAIS_UL_HAQ,
-        "AP Report" : StringConstants.OWAIS_UL_HAQ,
-        "AR" : StringConstants.OWAIS_UL_HAQ,
-        "Banquet" : StringConstants.SYED_MOIZ_ISMAIL,
-        "Banquet Report" : StringConstants.SYED_MOIZ_ISMAIL,
-        "Campaign" : StringConstants.MUHAMMAD_USAMA_HABIB_UR_REHMAN,
-        "Classes" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "Club Now" : StringConstants.FARAZ_ABBASI,
-        "Club View" : StringConstants.FARAZ_ABBASI,
-        "Compliance" : StringConstants.SIMON_ANTHONY,
-        "Concierge" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "Credit Card" : StringConstants.SYED_ZAIN_BADAR_UDDIN,
-        "Dashboard" : StringConstants.SYEDA_ZUNAIRA_AHMED,
-        "Dining" : StringConstants.SYED_MOIZ_ISMAIL,
-        "Employee App" : StringConstants.USAMA_SAJID,
-        "Events" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "F & B POS Report" : StringConstants.SHAHROZ_SHAHID_KHAN,
-        "FB POS" : StringConstants.SHAHROZ_SHAHID_KHAN,
-        "Front Desk" : StringConstants.AADESH_KUMAR,
-        "Gate House" : StringConstants.AADESH_KUMAR,
-        "General" : StringConstants.SYED_ZAIN_BADAR_UDDIN,
-        "GL" : StringConstants.OWAIS_UL_HAQ,
-        "GL Report" : StringConstants.OWAIS_UL_HAQ,
-        "HOA" : StringConstants.ZUBAIR_AHMED,
-        "Infrastructure" : StringConstants.SYED_ZAIN_BADAR_UDDIN,
-        "Inventory" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Inventory Report" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Liferay" : StringConstants.AHSAN_RAZA,
-        "Locker Reservation" : StringConstants.ALI_HASSAN,
-        "Marina" : StringConstants.ALI_HASSAN,
-        "Member Center" : StringConstants.MUHAMMAD_USAMA_HABIB_UR_REHMAN,
-        "Membership" : StringConstants.MUHAMMAD_USAMA_HABIB_UR_REHMAN,
-        "Membership Report" : StringConstants.MUHAMMAD_USAMA_HABIB_UR_REHMAN,
-        "Northstar Connect" : StringConstants.AHSAN_RAZA,
-        "POA" : StringConstants.SIMON_ANTHONY,
-        "POA Connect" : StringConstants.SIMON_ANTHONY,
-        "Purchasing" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Purchasing Report" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Resort Connect" : StringConstants.ALI_HASSAN,
-        "Retail POS" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Retail POS Reports" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Room Reservation" : StringConstants.ALI_HASSAN,
-        "Shopping Cart" : StringConstants.SYED_ZAIN_BADAR_UDDIN,
-        "Spa" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "Tableside POS" : StringConstants.SYED_MOIZ_ISMAIL,
-        "Tee Time" : StringConstants.SYED_KHURRAM_KAMRAN,
-        "Timekeeping" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "Timekeeping Report" : StringConstants.MUHAMMAD_MOIZ_PATUJO,
-        "WO Connect" : StringConstants.ALI_HASSAN,
-        "Work Order" : StringConstants.ALI_HASSAN,
-        }
-        return devModuleMap.get(moduleName)
-    
+        """
+        Return the developer ID owning a module, or None if it is not routed.
+        """
+        return self.module_routing.get_developer(moduleName)
+
     def get_qa_for_module(self,moduleName):
-        # Map for getting QA name wrt module
-        qaModuleMap = {
-        "Activities" : StringConstants.RIMSHA_MOIN,
-        "Admin" : StringConstants.SHABBIR_AHMED,
-        "AP" : StringConstants.MUHAMMAD_ZEESHAN,
-        "AP Report" : StringConstants.MUHAMMAD_ZEESHAN,
-        "AR" : StringConstants.MUHAMMAD_ZEESHAN,
-        "Banquet" : StringConstants.HAZIQ_JAMIL,
-        "Banquet Report" : StringConstants.HAZIQ_JAMIL,
-        "Campaign" : StringConstants.FARRUKH_FAHIM,
-        "Classes" : StringConstants.RIMSHA_MOIN,
-        "Club Now" : StringConstants.NIMRA_IFTIKHAR,
-        "Club View" : StringConstants.NIMRA_IFTIKHAR,
-        "Compliance" : StringConstants.HAFSA_YASEEN,
-        "Concierge" : StringConstants.RIMSHA_MOIN,
-        "Credit Card" : StringConstants.SHABBIR_AHMED,
-        "Dashboard" : StringConstants.AMMAR_BHAI,
-        "Dining" : StringConstants.HAZIQ_JAMIL,
-        "Employee App" : StringConstants.RIMSHA_MOIN,
-        "Events" : StringConstants.RIMSHA_MOIN,
-        "F & B POS Report" : StringConstants.KAUSAR_TASNEEM,
-        "FB POS" : StringConstants.KAUSAR_TASNEEM,
-        "Front Desk" : StringConstants.FARRUKH_FAHIM,
-        "Gate House" : StringConstants.FARRUKH_FAHIM,
-        "General" : StringConstants.MUHAMMAD_ZEESHAN,
-        "GL" : StringConstants.MUHAMMAD_ZEESHAN,
-        "GL Report" : StringConstants.MUHAMMAD_ZEESHAN,
-        "HOA" : StringConstants.HAFSA_YASEEN,
-        "Infrastructure" : StringConstants.SHABBIR_AHMED,
-        "Inventory" : StringConstants.ANUSHA_MAKHIJA,
-        "Inventory Report" : StringConstants.ANUSHA_MAKHIJA,
-        "Liferay" : StringConstants.GHULAM_SAKINA,
-        "Locker Reservation" : StringConstants.QAZI_HAMZA_AHMED,
-        "Marina" : StringConstants.QAZI_HAMZA_AHMED,
-        "Member Center" : StringConstants.FARRUKH_FAHIM,
-        "Membership" : StringConstants.FARRUKH_FAHIM,
-        "Membership Report" : StringConstants.FARRUKH_FAHIM,
-        "Northstar Connect" : StringConstants.GHULAM_SAKINA,
-        "POA" : StringConstants.HAFSA_YASEEN,
-        "POA Connect" : StringConstants.HAFSA_YASEEN,
-        "Purchasing" : StringConstants.ANUSHA_MAKHIJA,
-        "Purchasing Report" : StringConstants.ANUSHA_MAKHIJA,
-        "Resort Connect" : StringConstants.QAZI_HAMZA_AHMED,
-        "Retail POS" : StringConstants.ANUSHA_MAKHIJA,
-        "Retail POS Reports" : StringConstants.ANUSHA_MAKHIJA,
-        "Room Reservation" : StringConstants.QAZI_HAMZA_AHMED,
-        "Shopping Cart" : StringConstants.SHABBIR_AHMED,
-        "Spa" : StringConstants.RIMSHA_MOIN,
-        "Tableside POS" : StringConstants.HAZIQ_JAMIL,
-        "Tee Time" : StringConstants.ANUSHA_MAKHIJA,
-        "Timekeeping" : StringConstants.RIMSHA_MOIN,
-        "Timekeeping Report" : StringConstants.RIMSHA_MOIN,
-        "WO Connect" : StringConstants.QAZI_HAMZA_AHMED,
-        "Work Order" : StringConstants.QAZI_HAMZA_AHMED,
-            };
-
-        return qaModuleMap[moduleName] or "Unassigned";
+        """
+        Return the QA owning a module, or "Unassigned" if it is not routed.
+        """
+        return self.module_routing.get_qa(moduleName)
+
+    def route_tickets(self, tickets):
+        """
+        Resolve the developer and QA for many tickets from their category.
+
+        Returns:
+            dict: Ticket ID -> {"developer": ID or None, "qa": QA name}
+        """
+        return self.module_routing.route_tickets(tickets)
     
     def get_record_type(self,issue):
         return self.get_custom_field(issue,"Record Type")
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from core.logging_config import LoggerSetup
+
+mantis_logger = LoggerSetup.setup_logger("mantis", "logs/mantis")
+
+
+class MantisWriteBatch:
+    """
+    Unit of work that collects field changes per ticket and flushes one merged PATCH per ticket.
+
+    Changes to the same field of the same ticket overwrite each other, so only the last value
+    set before flush() is sent. When the current state of a ticket is known, changes that would
+    not alter it are dropped, and a ticket with nothing left to change gets no request at all.
+    Used as a context manager, the batch flushes when the block exits without an exception and
+    discards its changes otherwise; the outcome of every flush is kept in results.
+    """
+
+    def __init__(self, mantis, known_issues=None):
+        """
+        Parameters:
+            mantis (MantisOperations): The client used to send the PATCH requests.
+            known_issues (list[dict]): Optional issues already loaded in memory, used as the
+                current state and updated in place after a successful flush.
+        """
+        self.mantis = mantis
+        self._changes = OrderedDict()
+        self._known = {str(issue["id"]): issue for issue in known_issues or [] if issue}
+        # Ticket ID -> outcome of its last flushed update
+        self.results = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._changes.clear()
+        return False
+
+    def _set(self, ticket_id, field, value):
+        self._changes.setdefault(str(ticket_id), {})[field] = value
+        return self
+
+    def set_status(self, ticket_id, status_name):
+        """
+        Queue a status change (e.g. "assigned", "confirmed", "closed").
+        """
+        return self._set(ticket_id, "status", {"name": status_name})
+
+    def set_resolution(self, ticket_id, resolution_name):
+        """
+        Queue a resolution change (e.g. "Fixed", "For QA").
+        """
+        return self._set(ticket_id, "resolution", {"name": resolution_name})
+
+    def set_handler(self, ticket_id, handler_id):
+        """
+        Queue a change of the ticket owner.
+        """
+        return self._set(ticket_id, "handler", {"id": handler_id})
+
+    def set_summary(self, ticket_id, summary):
+        """
+        Queue a title/summary change.
+        """
+        return self._set(ticket_id, "summary", summary)
+
+    def set_description(self, ticket_id, description):
+        """
+        Queue a description change.
+        """
+        return self._set(ticket_id, "description", description)
+
+    def pending(self):
+        """
+        Return a copy of the queued changes, keyed by ticket ID.
+        """
+        return {ticket_id: dict(payload) for ticket_id, payload in self._changes.items()}
+
+    def flush(self):
+        """
+        Send one PATCH per ticket with all of its queued changes.
+
+        Returns:
+            dict: Ticket ID -> True if the update was accepted, False otherwise.
+        """
+        results = {}
+        while self._changes:
+            ticket_id, payload = self._changes.popitem(last=False)
+
+            known_issue = self._known.get(ticket_id)
+            unchanged = []
+            if known_issue is not None:
+                unchanged = [field for field, value in payload.items() if self._is_current(known_issue, field, value)]
+                for field in unchanged:
+                    del payload[field]
+
+            if not payload:
+                self.mantis.record_write("issue_patch", skipped=1)
+                results[ticket_id] = True
+                continue
+
+            # Fields dropped from a PATCH that is still sent are counted separately
+            self.mantis.record_write("issue_field", skipped=len(unchanged))
+            self.mantis.record_write("issue_patch", sent=1)
+            fields = ", ".join(payload)
+            try:
+                results[ticket_id] = self.mantis.patch_issue(
+                    ticket_id, payload, f"Failed to update {fields} for Ticket ID {ticket_id}"
+                )
+            except Exception as e:
+                # The remaining tickets of the batch are still sent
+                mantis_logger.error(f"Failed to update {fields} for Ticket ID {ticket_id}: {e}")
+                results[ticket_id] = False
+            if results[ticket_id] and known_issue is not None:
+                known_issue.update(payload)
+        self.results.update(results)
+        return results
+
+    def _is_current(self, issue, field, value):
+        """
+        Check whether a loaded issue already has the given field value.
+        Fields missing from the loaded issue are treated as unknown, i.e. not current.
+        """
+        current = issue.get(field)
+        if current is None:
+            return False
+
+        if field in ("status", "resolution"):
+            # Compare against both the enum name and the display label, case-insensitively
+            wanted = str(value["name"]).lower()
+            return wanted in (str(current.get("name", "")).lower(), str(current.get("label", "")).lower())
+
+        if field == "handler":
+            return current.get("id") == value["id"]
+
+        return current == value
@@ -0,0 +1,212 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from core.logging_config import LoggerSetup
+
+git_logger = LoggerSetup.setup_logger("git", "logs/git")
+
+# MR states that never change again
+TERMINAL_MR_STATES = ("merged", "closed")
+
+
+class MergeRequestCache:
+    """
+    Cache of GitLab merge requests keyed by (project ID, iid).
+
+    Merged and closed MRs rarely change, so they are kept until a fresh read shows otherwise and
+    appended to a JSON-lines file that is read back on start-up. A closed MR that is reopened is
+    appended again as a tombstone, and the file is rewritten with only the latest record of
+    every MR when it is loaded. Opened MRs are reused for ttl seconds; after that the
+    stored ETag is sent as If-None-Match, and a 304 answer renews the entry without a body.
+    Concurrent lookups of the same MR share a single request.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_file=None, ttl=60):
+        """
+        Parameters:
+            cache_file (str): JSON-lines file holding merged/closed MRs, or None to keep them in memory only.
+            ttl (float): Seconds an opened MR is served without contacting GitLab.
+        """
+        self.cache_file = cache_file
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._in_flight = {}
+        self._stats = {"hits": 0, "fetched": 0, "revalidated": 0, "shared": 0}
+        self._load()
+
+    @classmethod
+    def for_backend(cls, gitlab_path, config=None):
+        """
+        Return the cache shared by every client of a GitLab server, creating it on first use.
+
+        Parameters:
+            gitlab_path (str): Base URL of the GitLab server.
+            config (ConfigurationManager): Optional configuration providing GITLAB_MR_CACHE_FILE
+                and GITLAB_MR_TTL.
+        """
+        with cls._instances_lock:
+            cache = cls._instances.get(gitlab_path)
+            if cache is None:
+                settings = {}
+                if config is not None:
+                    settings = {
+                        "cache_file": config.get("GITLAB_MR_CACHE_FILE", "data/merge_requests.jsonl"),
+                        "ttl": float(config.get("GITLAB_MR_TTL", 60)),
+                    }
+                cache = cls(**settings)
+                cls._instances[gitlab_path] = cache
+            return cache
+
+    def _load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        lines = 0
+        with open(self.cache_file, "r") as file:
+            for line in file:
+                lines += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash only loses that MR
+                    continue
+                key = (str(record["project_id"]), int(record["iid"]))
+                if record.get("data") is None:
+                    # Tombstone of an MR that was reopened
+                    self._entries.pop(key, None)
+                else:
+                    self._entries[key] = {"data": record["data"], "etag": None, "fetched_at": 0, "terminal": True}
+        if lines > len(self._entries):
+            self._compact()
+
+    def _compact(self):
+        """
+        Rewrite the cache file with only the latest record of every merged/closed MR.
+        """
+        try:
+            directory = os.path.dirname(self.cache_file) or "."
+            # Write to a temporary file first so a crash never leaves a truncated cache behind
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                for (project_id, iid), entry in self._entries.items():
+                    file.write(json.dumps({"project_id": project_id, "iid": iid, "data": entry["data"]}) + "\n")
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            git_logger.error(f"Failed to compact the merge request cache {self.cache_file}: {e}")
+
+    def _persist(self, project_id, iid, merge_request_data):
+        """
+        Append a merged/closed MR to the cache file, or a tombstone (data None) for a reopened one.
+        """
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(self.cache_file, "a") as file:
+                file.write(json.dumps({"project_id": project_id, "iid": iid, "data": merge_request_data}) + "\n")
+        except OSError as e:
+            git_logger.error(f"Failed to persist merge request {project_id}!{iid}: {e}")
+
+    def get(self, project_id, iid, loader):
+        """
+        Return a merge request, loading it at most once for all concurrent callers.
+
+        Parameters:
+            project_id (str or int): GitLab project ID.
+            iid (str or int): Merge request IID within the project.
+            loader (callable): Called as loader(etag) and returning (status, data, etag), where
+                status is "ok", "not_modified" or "error".
+
+        Returns:
+            dict: The merge request data (shared, treat it as read-only), or None if it could not be loaded.
+        """
+        key = (str(project_id), int(iid))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry["terminal"] or time.monotonic() - entry["fetched_at"] < self.ttl):
+                self._stats["hits"] += 1
+                return entry["data"]
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._stats["shared"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            status, data, etag = loader(entry["etag"] if entry else None)
+            if status == "not_modified" and entry is not None:
+                data = entry["data"]
+                with self._lock:
+                    entry["fetched_at"] = time.monotonic()
+                    self._stats["revalidated"] += 1
+            elif status == "ok":
+                self.store(project_id, iid, data, etag)
+            else:
+                data = None
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def peek(self, project_id, iid):
+        """
+        Return a cached merge request that is still valid, without loading anything.
+        """
+        with self._lock:
+            entry = self._entries.get((str(project_id), int(iid)))
+            if entry is not None and (entry["terminal"] or time.monotonic() - entry["fetched_at"] < self.ttl):
+                self._stats["hits"] += 1
+                return entry["data"]
+        return None
+
+    def store(self, project_id, iid, merge_request_data, etag=None):
+        """
+        Store a freshly fetched merge request; merged/closed MRs are also written to disk, and a
+        stored MR that is no longer merged/closed is dropped from it.
+        """
+        key = (str(project_id), int(iid))
+        terminal = merge_request_data.get("state") in TERMINAL_MR_STATES
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = {"data": merge_request_data, "etag": etag, "fetched_at": time.monotonic(), "terminal": terminal}
+            self._stats["fetched"] += 1
+            was_terminal = bool(previous and previous["terminal"])
+        if terminal and not was_terminal:
+            self._persist(key[0], key[1], merge_request_data)
+        elif was_terminal and not terminal:
+            self._persist(key[0], key[1], None)
+
+    def invalidate(self, project_id, iid):
+        """
+        Forget an opened merge request, e.g. before merging it. Merged/closed entries are kept.
+        """
+        key = (str(project_id), int(iid))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry["terminal"]:
+                del self._entries[key]
+
+    def get_stats(self):
+        """
+        Return the hit, fetch, 304 revalidation and shared in-flight lookup counters.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._entries)
+        return stats
@@ -0,0 +1,44 @@
+class MergeResult:
+    """
+    Outcome of GitLabOperations.merge_merge_request.
+
+    Truthy only when the MR was merged, so callers that treat the result as a bool keep working,
+    while callers that care can branch on outcome (e.g. report conflicts to the author instead of
+    retrying on the next run).
+    """
+
+    MERGED = "merged"
+    CONFLICT = "conflict"
+    PIPELINE_PENDING = "pipeline_pending"
+    NOT_APPROVED = "not_approved"
+    NOT_MERGEABLE = "not_mergeable"
+    TRANSIENT_FAILURE = "transient_failure"
+
+    __slots__ = ("outcome", "message", "merge_request")
+
+    def __init__(self, outcome, message="", merge_request=None):
+        """
+        Parameters:
+            outcome (str): One of the outcome constants of this class.
+            message (str): Human readable detail, e.g. GitLab's detailed_merge_status.
+            merge_request (dict): The merged MR as returned by GitLab, when available.
+        """
+        self.outcome = outcome
+        self.message = message
+        self.merge_request = merge_request
+
+    @property
+    def is_retryable(self):
+        """
+        True if a later run may succeed without anyone changing the MR.
+        """
+        return self.outcome in (self.PIPELINE_PENDING, self.TRANSIENT_FAILURE)
+
+    def __bool__(self):
+        return self.outcome == self.MERGED
+
+    def __str__(self):
+        return f"{self.outcome}: {self.message}" if self.message else self.outcome
+
+    def __repr__(self):
+        return f"MergeResult({self.outcome!r}, {self.message!r})"
@@ -0,0 +1,157 @@
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from core.config_manager import ConfigurationManager
+
+MERGE_REQUEST_URL_PATTERN = re.compile(r"^https?://[^/]+/(?P<namespace>.+?)/(?P<repo>[^/]+?)(?:/-)?/merge_requests/(?P<iid>\d+)(?:[/?#].*)?$")
+
+# Used when MR_REPO_ROUTES is missing from the configuration: repo -> config keys of its project ID and target branch
+DEFAULT_REPO_ROUTES = {
+    "NS61x": {"project": "BO_PROJECT", "branch": "BackOffice"},
+    "NSConnect40": {"project": "C4_PROJECT", "branch": "Connect04"},
+    "nscp30": {"project": "C3_PROJECT", "branch": "Connect03"},
+    "ClubNow": {"project": "APP_PROJECT", "branch": "MobileApp"}
+}
+
+MergeRequestRef = namedtuple("MergeRequestRef", ["namespace", "repo", "iid"])
+
+
+class MergeRequestRouter:
+    """
+    Maps GitLab MR URLs to their project ID and to the target branch of each ticket type.
+
+    MR_REPO_ROUTES in configs/common.json names, for every repository, the config key holding
+    its project ID and the key holding its target branch in configs/<ticket type>.json. The
+    tables are built once per config file and rebuilt only when one of the files they were read
+    from changes; the files' modification times are checked at most every check_interval seconds.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config_dir="configs", check_interval=5):
+        """
+        Parameters:
+            config_dir (str): Directory holding common.json and the ticket type configs.
+            check_interval (float): Minimum seconds between two checks of the files' modification times.
+        """
+        self.config_dir = config_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._mtimes = {}
+        self._next_check = 0
+
+    @classmethod
+    def shared(cls, config_dir="configs"):
+        """
+        Return the router shared by every caller of the given config directory.
+        """
+        with cls._instances_lock:
+            router = cls._instances.get(config_dir)
+            if router is None:
+                router = cls(config_dir)
+                cls._instances[config_dir] = router
+            return router
+
+    @staticmethod
+    def parse(merge_request_url):
+        """
+        Split an MR URL into its namespace, repository and IID.
+
+        Returns:
+            MergeRequestRef: The parsed URL, or None if it is not an MR URL.
+        """
+        match = MERGE_REQUEST_URL_PATTERN.match(merge_request_url or "")
+        if not match:
+            return None
+        return MergeRequestRef(match.group("namespace"), match.group("repo"), int(match.group("iid")))
+
+    @classmethod
+    def same_merge_request(cls, first_url, second_url):
+        """
+        Tell whether two URLs point to the same MR, e.g. with and without the "/-/" GitLab adds to its URLs.
+        """
+        if first_url == second_url:
+            return True
+        first = cls.parse(first_url)
+        return first is not None and first == cls.parse(second_url)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            for path, mtime in self._mtimes.items():
+                if self._get_mtime(path) != mtime:
+                    # Tables are rebuilt on their next use
+                    self._tables = {}
+                    self._mtimes = {}
+                    return
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _get_table(self, ticket_type=None):
+        """
+        Return repo -> project ID (ticket_type None) or repo -> target branch of ticket_type.
+        """
+        self._refresh()
+        table = self._tables.get(ticket_type)
+        if table is not None:
+            return table
+
+        with self._lock:
+            table = self._tables.get(ticket_type)
+            if table is not None:
+                return table
+
+            common_file = os.path.join(self.config_dir, "common.json")
+            config_file = os.path.join(self.config_dir, f"{ticket_type}.json") if ticket_type else common_file
+            for path in (common_file, config_file):
+                self._mtimes[path] = self._get_mtime(path)
+
+            config = ConfigurationManager(config_file=config_file, common_file=common_file)
+            field = "branch" if ticket_type else "project"
+            table = MappingProxyType({
+                repo: config.get(route.get(field))
+                for repo, route in (config.get("MR_REPO_ROUTES") or DEFAULT_REPO_ROUTES).items()
+            })
+            tables = dict(self._tables)
+            tables[ticket_type] = table
+            self._tables = tables
+            return table
+
+    def _match(self, merge_request_url, table):
+        ref = self.parse(merge_request_url)
+        if ref is not None and ref.repo in table:
+            return table[ref.repo]
+
+        # URLs that do not follow the usual layout are matched on the repository name alone
+        for repo, value in table.items():
+            if repo in merge_request_url:
+                return value
+        return None
+
+    def get_target_project(self, merge_request_url):
+        """
+        Return the GitLab project ID of an MR, or None if its repository is not routed.
+        """
+        return self._match(merge_request_url, self._get_table())
+
+    def get_target_branch(self, merge_request_url, ticket_type):
+        """
+        Return the branch MRs of the given ticket type must target, or None if the repository is not routed.
+        """
+        return self._match(merge_request_url, self._get_table(ticket_type))
@@ -0,0 +1,235 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from core.logging_config import LoggerSetup
+
+http_logger = LoggerSetup.setup_logger("http", "logs/http")
+
+# Statuses that mean the server is pushing back rather than rejecting the request
+THROTTLE_STATUSES = frozenset([429, 503])
+
+# Seconds between two checks of an async caller waiting for an in-flight slot
+ASYNC_SLOT_POLL_INTERVAL = 0.05
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    Parameters:
+        value (str): The header value.
+        now (datetime): Current UTC time an HTTP date is compared to, the system clock by default.
+
+    Returns:
+        float: Seconds to wait, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with AIMD concurrency control, shared per host.
+
+    Requests take a token (refilled at the current rate) and an in-flight slot before they are
+    sent. Every successful response raises the rate and the concurrency limit additively; a
+    throttling response (429/503) cuts both multiplicatively and, when the server sent a
+    Retry-After header, holds every caller until that moment has passed.
+
+    Threads wait with acquire() and coroutines with acquire_async(); both draw from the same
+    bucket, so the sync and async clients of a host share one budget.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, host, rate=5.0, burst=10, min_rate=0.5, max_rate=50.0,
+                 max_concurrency=8, increase_step=0.5, decrease_factor=0.5,
+                 backoff_base=1.0, backoff_cap=60.0, clock=time.monotonic):
+        """
+        Parameters:
+            host (str): Host name used in logs and metrics.
+            rate (float): Initial requests per second.
+            burst (int): Maximum number of tokens the bucket can hold.
+            min_rate (float): Lowest rate the limiter backs off to.
+            max_rate (float): Highest rate the limiter grows to.
+            max_concurrency (int): Upper bound of concurrent in-flight requests.
+            increase_step (float): Requests per second added for each second's worth of successes.
+            decrease_factor (float): Multiplier applied to the rate and concurrency on pushback.
+            backoff_base (float): Base delay in seconds of the exponential backoff.
+            backoff_cap (float): Maximum backoff delay in seconds.
+            clock (callable): Monotonic clock in seconds, replaced in tests.
+        """
+        self.host = host
+        self.burst = max(1, int(burst))
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.increase_step = float(increase_step)
+        self.decrease_factor = float(decrease_factor)
+        self.backoff_base = float(backoff_base)
+        self.backoff_cap = float(backoff_cap)
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._rate = min(max(float(rate), self.min_rate), self.max_rate)
+        self._tokens = float(self.burst)
+        self._last_refill = self.clock()
+        self._concurrency = float(self.max_concurrency)
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._stats = {"acquired": 0, "throttled": 0, "waited": 0.0}
+
+    @classmethod
+    def for_host(cls, host, config=None, prefix="MANTIS"):
+        """
+        Return the limiter shared by every client of a host, creating it on first use.
+
+        Parameters:
+            host (str): The host name (e.g. "mantis.sibisoft.com").
+            config (ConfigurationManager): Optional configuration providing the <prefix>_RATE_LIMIT,
+                <prefix>_RATE_BURST, <prefix>_MIN_RATE, <prefix>_MAX_RATE and <prefix>_MAX_CONCURRENCY keys.
+            prefix (str): Key prefix of the backend in the configuration.
+        """
+        with cls._instances_lock:
+            limiter = cls._instances.get(host)
+            if limiter is None:
+                settings = {}
+                if config is not None:
+                    settings = {
+                        "rate": float(config.get(f"{prefix}_RATE_LIMIT", 5)),
+                        "burst": int(config.get(f"{prefix}_RATE_BURST", 10)),
+                        "min_rate": float(config.get(f"{prefix}_MIN_RATE", 0.5)),
+                        "max_rate": float(config.get(f"{prefix}_MAX_RATE", 50)),
+                        "max_concurrency": int(config.get(f"{prefix}_MAX_CONCURRENCY", 8)),
+                    }
+                limiter = cls(host, **settings)
+                cls._instances[host] = limiter
+            return limiter
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def _try_acquire(self, start):
+        """
+        Take a token and an in-flight slot if both are available. The caller holds self._cond.
+
+        Returns:
+            tuple: (acquired, wait) where wait is the number of seconds until a token frees up,
+                or None when the caller has to wait for an in-flight slot to be released.
+        """
+        now = self.clock()
+        self._refill(now)
+
+        if now < self._blocked_until:
+            return False, self._blocked_until - now
+        if self._in_flight >= max(1, int(self._concurrency)):
+            return False, None
+        if self._tokens < 1:
+            return False, (1 - self._tokens) / self._rate
+
+        self._tokens -= 1
+        self._in_flight += 1
+        self._stats["acquired"] += 1
+        self._stats["waited"] += now - start
+        return True, 0.0
+
+    def acquire(self):
+        """
+        Block until a token and an in-flight slot are available.
+        """
+        start = self.clock()
+        with self._cond:
+            while True:
+                acquired, wait = self._try_acquire(start)
+                if acquired:
+                    return
+                self._cond.wait(wait)
+
+    async def acquire_async(self):
+        """
+        Wait on the event loop until a token and an in-flight slot are available.
+
+        The bucket's lock is only held for the check itself, so the loop is never blocked.
+        """
+        start = self.clock()
+        while True:
+            with self._cond:
+                acquired, wait = self._try_acquire(start)
+            if acquired:
+                return
+            await asyncio.sleep(wait if wait is not None else ASYNC_SLOT_POLL_INTERVAL)
+
+    def release(self, throttled=False, retry_after=None, failed=False):
+        """
+        Return the in-flight slot and adapt the rate to the outcome of the request.
+
+        Parameters:
+            throttled (bool): The server answered 429/503.
+            retry_after (float): Seconds the server asked to wait, if any.
+            failed (bool): The request failed without a response; the rate is left unchanged.
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            now = self.clock()
+
+            if throttled:
+                self._stats["throttled"] += 1
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                # Responses to requests sent before the first cut carry no new information
+                if now - self._last_decrease >= 1.0:
+                    self._last_decrease = now
+                    self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+                    self._concurrency = max(1.0, self._concurrency * self.decrease_factor)
+                    self._tokens = min(self._tokens, 0.0)
+                    http_logger.warning(
+                        f"[{self.host}] Throttled by server, rate lowered to {self._rate:.2f}/s "
+                        f"and concurrency to {int(self._concurrency)}"
+                    )
+            elif not failed:
+                self._rate = min(self.max_rate, self._rate + self.increase_step / max(1.0, self._rate))
+                self._concurrency = min(float(self.max_concurrency), self._concurrency + 1.0 / self._concurrency)
+
+            self._cond.notify_all()
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        Delay before retrying a throttled request.
+
+        Uses the server's Retry-After when given, otherwise an exponential backoff with
+        full jitter so that concurrent callers do not retry in lockstep.
+        """
+        if retry_after is not None:
+            return min(self.backoff_cap, retry_after)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def get_metrics(self):
+        """
+        Return the current rate, concurrency limit and throttling counters.
+        """
+        with self._cond:
+            return {
+                "rate": round(self._rate, 3),
+                "concurrency": max(1, int(self._concurrency)),
+                "in_flight": self._in_flight,
+                "acquired": self._stats["acquired"],
+                "throttled": self._stats["throttled"],
+                "waited": round(self._stats["waited"], 3),
+            }
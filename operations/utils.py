@@ -1,7 +1,7 @@
 import re
 from core.logging_config import LoggerSetup
-from core.config_manager import ConfigurationManager
 from core.string_constants import StringConstants
+from operations.mr_router import MergeRequestRouter
 
 util_logger = LoggerSetup.setup_logger("utils", "logs/utils")
 
@@ -17,48 +17,26 @@ def get_target_branch(merge_request_url, project):
     Returns:
         str: The name of the target branch, or None if no match is found.
     """
-
-    # Initialize the configuration manager based on the project
-    config = ConfigurationManager(config_file=f"configs/{project}.json")
-
-    if 'NS61x' in merge_request_url:
-        return config.get("BackOffice")
-    elif 'NSConnect40' in merge_request_url:
-        return config.get("Connect04")
-    elif 'nscp30' in merge_request_url:
-        return config.get("Connect03")
-    elif 'ClubNow' in merge_request_url:
-        return config.get("MobileApp")
-    else:
+    target_branch = MergeRequestRouter.shared().get_target_branch(merge_request_url, project)
+    if target_branch is None:
         util_logger.error(f"Couldn't get a target branch for the merge request: {merge_request_url}")
-        return None
+    return target_branch
 
 
 def get_target_project(merge_request_url):
-        """
-        Get the target project ID based on the merge request URL.
-
-        Parameters:
-            merge_request_url (str): The URL of the merge request.
+    """
+    Get the target project ID based on the merge request URL.
 
-        Returns:
-            int: Target project ID or None if not found.
-        """
+    Parameters:
+        merge_request_url (str): The URL of the merge request.
 
-        # Initialize the configuration manager
-        config = ConfigurationManager(config_file="configs/common.json")
-        
-        if 'NS61x' in merge_request_url:
-            return config.get("BO_PROJECT")
-        elif 'NSConnect40' in merge_request_url:
-            return config.get("C4_PROJECT")
-        elif 'nscp30' in merge_request_url:
-            return config.get("C3_PROJECT")
-        elif 'ClubNow' in merge_request_url:
-            return config.get("APP_PROJECT")
-        else:
-            util_logger.error(f"Couldn't get a target project for the merge request: {merge_request_url}")
-            return None
+    Returns:
+        int: Target project ID or None if not found.
+    """
+    target_project_id = MergeRequestRouter.shared().get_target_project(merge_request_url)
+    if target_project_id is None:
+        util_logger.error(f"Couldn't get a target project for the merge request: {merge_request_url}")
+    return target_project_id
 
 def extract_ticket_id_from_description(description):
     """
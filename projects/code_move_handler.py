@@ -14,6 +14,12 @@ mantis = MantisOperations(StringConstants.REGRESSION)
 cm_logger = LoggerSetup.setup_logger("code_move_analytics", "logs/code_move_analytics")
 progress = {"status": "idle", "percentage": 0}
 
+def preload_project_schemas():
+    """
+    Warm the Mantis project schema cache used when building cloned tickets.
+    """
+    mantis.preload_project_schemas([config.get("REGRESSION_PROJECT_ID")])
+
 def clone_mantis_tickets(ticket_ids, er_date, target_version, target_patch, qa_owner, instructions, title_prefix):
     global progress
     progress["status"] = "running"
@@ -22,9 +28,19 @@ def clone_mantis_tickets(ticket_ids, er_date, target_version, target_patch, qa_o
     cm_logger.info(f"Started the cloning process for {len(ticket_ids)} tickets having the title {title_prefix}.")
 
     try:
-        for idx, ticket_id in enumerate(ticket_ids):
-            ticket_data = mantis.get_ticket_data(ticket_number=ticket_id)
-            valid_custom_field_ids = mantis.get_custom_fields_for_project(config.get("REGRESSION_PROJECT_ID"))
+        # Fetch every source ticket up front, concurrently
+        tickets_data, fetch_errors = mantis.get_tickets_data(ticket_ids, fields="code_move_clone")
+        valid_custom_field_ids = mantis.get_custom_fields_for_project(config.get("REGRESSION_PROJECT_ID"))
+        routing = mantis.route_tickets(tickets_data)
+
+        for idx, (ticket_id, ticket_data) in enumerate(zip(ticket_ids, tickets_data)):
+            if ticket_data is None:
+                error_msg = f"Failed to fetch ticket {ticket_id}: {fetch_errors.get(ticket_id)}"
+                cm_logger.error(error_msg)
+                progress["status"] = "error"
+                progress["percentage"] = 0
+                return {"status": "error", "percentage": 0, "error": error_msg}
+
 
             new_title = f"<b>{title_prefix}</b> {ticket_data['summary']}"
             new_title = new_title[:125] + "..." if len(new_title) > 128 else new_title
@@ -34,8 +50,7 @@ def clone_mantis_tickets(ticket_ids, er_date, target_version, target_patch, qa_o
             )
 
             new_description = ticket_data['description'] + "\n\n" + full_instructions
-            category_name = ticket_data['category']['name']
-            handler_id = mantis.get_developer_for_module(category_name)
+            handler_id = routing[ticket_data['id']]["developer"]
 
             date_obj = datetime.datetime.strptime(er_date, "%Y-%m-%d")
             unix_timestamp = int(time.mktime(date_obj.timetuple()))
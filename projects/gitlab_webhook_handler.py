@@ -0,0 +1,202 @@
+import hmac
+import queue
+import re
+import threading
+from datetime import datetime
+from core.logging_config import LoggerSetup
+from core.config_manager import ConfigurationManager
+from core.string_constants import StringConstants
+from operations.local_mirror import LocalMirror
+from operations.mr_router import MergeRequestRouter
+from operations.utils import get_target_branch
+from projects.merger.base_merger import BaseMerger
+from projects.merger.factory import MergerFactory
+from projects.merger.merge_watermark import MergeWatermark
+
+webhook_logger = LoggerSetup.setup_logger("gitlab_webhook", "logs/gitlab_webhook")
+
+# Merge request hook actions after which an MR may have become ready to merge (label changes arrive as "update")
+MERGE_REQUEST_ACTIONS = ("open", "reopen", "update", "approved", "approval")
+
+TICKET_TYPES = (StringConstants.REGRESSION, StringConstants.PROD_SUPPORT)
+
+# Mantis ticket references in an MR title or description, e.g. "MT#423574" or ".../view.php?id=423574"
+TICKET_REFERENCE_PATTERN = r"(?:MT|Mantis|view\.php\?id=|#)[\s#:=-]*(\d{5,7})(?!\d)"
+# Ticket numbers in a source branch name, e.g. "fix/423574-login"
+BRANCH_TICKET_PATTERN = r"(?<!\d)(\d{5,7})(?!\d)"
+MAX_CANDIDATE_TICKETS = 5
+
+# Event counters shown by /gitlab/webhook/status
+stats = {"received": 0, "queued": 0, "ignored": 0, "processed": 0, "merged": 0, "last_event_at": None}
+
+_events = queue.Queue()
+_pending_urls = set()
+_lock = threading.Lock()
+_worker = None
+
+
+def verify_token(token):
+    """
+    Check the X-Gitlab-Token header against GITLAB_WEBHOOK_SECRET. Every request is rejected while no secret is configured.
+    """
+    config = ConfigurationManager(config_file="configs/common.json")
+    secret = config.get("GITLAB_WEBHOOK_SECRET")
+    if not secret:
+        webhook_logger.error("GITLAB_WEBHOOK_SECRET is not configured, rejecting the webhook")
+        return False
+    return hmac.compare_digest(str(token or "").encode(), str(secret).encode())
+
+
+def check_event(payload):
+    """
+    Decide whether a webhook payload can lead to a merge.
+
+    Returns:
+        tuple: (accepted, message)
+    """
+    if payload.get("object_kind") != "merge_request":
+        return False, f"Ignoring {payload.get('object_kind')} event"
+
+    attributes = payload.get("object_attributes") or {}
+    if attributes.get("action") not in MERGE_REQUEST_ACTIONS:
+        return False, f"Ignoring merge request action {attributes.get('action')}"
+    if attributes.get("state") != "opened":
+        return False, f"Ignoring merge request in state {attributes.get('state')}"
+    if not attributes.get("url"):
+        return False, "Merge request URL missing from the payload"
+    if MergeRequestRouter.parse(attributes["url"]) is None:
+        return False, f"Unrecognized merge request URL {attributes['url']}"
+    return True, "queued"
+
+
+def enqueue_event(payload):
+    """
+    Queue the MR of a webhook payload for merging in the background.
+
+    Events for an MR that is already waiting are dropped, the queued entry reads the MR fresh anyway.
+
+    Returns:
+        tuple: (accepted, message)
+    """
+    with _lock:
+        stats["received"] += 1
+        stats["last_event_at"] = datetime.now().isoformat(timespec="seconds")
+
+    accepted, message = check_event(payload)
+    if not accepted:
+        with _lock:
+            stats["ignored"] += 1
+        return False, message
+
+    merge_request_url = payload["object_attributes"]["url"]
+    with _lock:
+        if merge_request_url in _pending_urls:
+            return True, "already queued"
+        _pending_urls.add(merge_request_url)
+        stats["queued"] += 1
+        _ensure_worker()
+    _events.put(payload)
+    webhook_logger.info(f"Queued merge request event for {merge_request_url}")
+    return True, message
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_process_events, name="gitlab-webhook", daemon=True)
+        _worker.start()
+
+
+def _process_events():
+    while True:
+        payload = _events.get()
+        merge_request_url = payload["object_attributes"]["url"]
+        # Released before processing so a change arriving meanwhile is processed again
+        with _lock:
+            _pending_urls.discard(merge_request_url)
+        try:
+            process_merge_request_event(payload)
+        except Exception:
+            webhook_logger.exception(f"Error while processing the webhook for {merge_request_url}")
+        finally:
+            _events.task_done()
+
+
+def find_ticket_candidates(payload):
+    """
+    Return the IDs of the Mantis tickets that may link the MR of a webhook payload.
+
+    Tickets of the local mirror whose notes link the MR come first, then ticket numbers found in
+    the MR title, description and source branch.
+    """
+    attributes = payload["object_attributes"]
+    ticket_ids = []
+
+    mirror = LocalMirror.from_config(ConfigurationManager(config_file="configs/common.json"))
+    if mirror is not None:
+        ticket_ids.extend(mirror.find_tickets_by_merge_request(attributes["url"]))
+
+    text = f"{attributes.get('title') or ''}\n{attributes.get('description') or ''}"
+    ticket_ids.extend(int(ticket_id) for ticket_id in re.findall(TICKET_REFERENCE_PATTERN, text))
+    ticket_ids.extend(int(ticket_id) for ticket_id in re.findall(BRANCH_TICKET_PATTERN, attributes.get("source_branch") or ""))
+
+    return list(dict.fromkeys(ticket_ids))[:MAX_CANDIDATE_TICKETS]
+
+
+def process_merge_request_event(payload):
+    """
+    Run the merger logic for the tickets that link the MR of a webhook payload.
+
+    The ticket type is the one whose target branch the MR targets. A candidate ticket is only
+    processed if its notes link the MR and, when the local mirror knows the merger's filter,
+    the ticket belongs to it. Sweeps and events of the same ticket type never run at once.
+
+    Returns:
+        int: Number of MRs merged.
+    """
+    attributes = payload["object_attributes"]
+    merge_request_url = attributes["url"]
+
+    ticket_types = []
+    for ticket_type in TICKET_TYPES:
+        expected_branch = get_target_branch(merge_request_url, ticket_type)
+        if expected_branch and expected_branch in (attributes.get("target_branch") or ""):
+            ticket_types.append(ticket_type)
+    if not ticket_types:
+        webhook_logger.info(f"No ticket type merges into {attributes.get('target_branch')}, ignoring {merge_request_url}")
+        return 0
+
+    ticket_ids = find_ticket_candidates(payload)
+    if not ticket_ids:
+        webhook_logger.info(f"No Mantis ticket found for {merge_request_url}, leaving it to the next sweep")
+        return 0
+
+    successful_merges = 0
+    for ticket_type in ticket_types:
+        with BaseMerger.run_lock(ticket_type):
+            # Shared with the sweeps of app.py, so /progress reports webhook merges too
+            merger = MergerFactory.get_shared_merger(ticket_type)
+            for ticket_id in ticket_ids:
+                ticket_data = merger.mantis.get_ticket_data(ticket_id, fields="merger")
+                if not ticket_data:
+                    continue
+                # The ticket's notes may link the MR with another form of its URL
+                ticket_urls = [url for url in MergeWatermark.extract_merge_request_urls(ticket_data)
+                               if MergeRequestRouter.same_merge_request(url, merge_request_url)]
+                if not ticket_urls:
+                    continue
+
+                membership = None
+                if merger.mantis.mirror is not None:
+                    membership = merger.mantis.mirror.is_filter_member(merger.mantis.normalize_filter_ids(merger.filter_id), ticket_id)
+                if membership is False or (membership is None and (ticket_data.get("status") or {}).get("name") == "closed"):
+                    webhook_logger.info(f"Ticket {ticket_id} is not in the {ticket_type} filter, ignoring {merge_request_url}")
+                    continue
+
+                webhook_logger.info(f"Processing ticket {ticket_id} ({ticket_type}) for {merge_request_url}")
+                successful_merges += merger.merge_ticket(ticket_data, ticket_urls[0])
+
+    with _lock:
+        stats["processed"] += 1
+        stats["merged"] += successful_merges
+    return successful_merges
@@ -0,0 +1,28 @@
+from flask import Blueprint, request, jsonify
+from projects.gitlab_webhook_handler import verify_token, enqueue_event, stats
+
+gitlab_webhook_bp = Blueprint('gitlab_webhook', __name__)
+
+
+@gitlab_webhook_bp.route("/gitlab/webhook", methods=["POST"])
+def receive_gitlab_webhook():
+    """
+    Receive GitLab merge request hooks and merge the MR's ticket(s) in the background.
+    """
+    if not verify_token(request.headers.get("X-Gitlab-Token")):
+        return jsonify({"status": "error", "message": "Invalid webhook token"}), 401
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"status": "error", "message": "Expected a JSON payload"}), 400
+
+    # GitLab only waits a few seconds for an answer, the merge itself runs on the worker thread
+    accepted, message = enqueue_event(payload)
+    if not accepted:
+        return jsonify({"status": "ignored", "message": message})
+    return jsonify({"status": "success", "message": message}), 202
+
+
+@gitlab_webhook_bp.route("/gitlab/webhook/status", methods=["GET"])
+def get_gitlab_webhook_status():
+    return jsonify(stats)
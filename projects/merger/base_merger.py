@@ -1,11 +1,22 @@
+import os
+import threading
 from core.logging_config import LoggerSetup
 from operations.mantis_operations import MantisOperations
 from operations.gitlab_operations import GitLabOperations
 from operations.google_sheets_operations import GoogleSheetsOperations
 from core.config_manager import ConfigurationManager
 from notifier.chat_notifier import ChatNotifier
+from operations.merge_result import MergeResult
+from operations.utils import get_target_project
+from operations.mr_router import MergeRequestRouter
+from .merge_watermark import MergeWatermark
+from .merge_queue import MergeQueue
+from .pipeline import MergePipeline
 
 class BaseMerger:
+    _run_locks = {}
+    _run_locks_guard = threading.Lock()
+
     def __init__(self, ticket_type, config_file, logger_name):
         self.ticket_type = ticket_type
         self.config = ConfigurationManager(config_file=config_file)
@@ -14,6 +25,14 @@ class BaseMerger:
         self.logger = LoggerSetup.setup_logger(logger_name, f"logs/{logger_name}")
         self.sheets = GoogleSheetsOperations()
         self.progress = {"status": "idle", "percentage": 0}
+        self.watermark = None
+        self.filter_id = None
+        self.merge_queue = None
+        self._queued_tickets = []
+        self._queued_tickets_lock = threading.Lock()
+        self._counted_merges = set()
+        # Tickets are processed in parallel, the spreadsheet client is not meant to be shared across threads
+        self.sheets_lock = threading.Lock()
 
         # Chat notification configuration
         self.enable_notifier = self.config.get("ENABLE_CHAT_NOTIFICATIONS", False)
@@ -31,5 +50,304 @@ class BaseMerger:
         else:
             self.chat_notifier = None
 
-    def run(self):
-        raise NotImplementedError("Subclasses must implement the run method")
+    def start_watermark(self, filter_ids, full_sweep=False):
+        """
+        Load the incremental-run state of the given filter for this run.
+
+        Parameters:
+            filter_ids (str): The filter ID(s) the run reads.
+            full_sweep (bool): Ignore the stored state and process every ticket and MR.
+        """
+        state_file = os.path.join(self.config.get("MERGE_STATE_DIR", "data"), f"{self.ticket_type}_merge_state.json")
+        self.watermark = MergeWatermark(
+            state_file,
+            filter_ids,
+            incremental=str(self.config.get("MERGE_INCREMENTAL", "false")).lower() == "true",
+            full_sweep_hours=self.config.get("MERGE_FULL_SWEEP_HOURS", 24),
+            full_sweep=full_sweep
+        )
+        mode = "full sweep" if self.watermark.full_sweep else f"incremental since {self.watermark.last_run_started_at}"
+        self.logger.info(f"Merge run mode: {mode}")
+
+    def get_merge_request(self, merge_request_url, statuses=None):
+        """
+        Return the MR data, from the statuses already read for the MR's chunk of tickets, from the
+        watermark for merged/closed MRs or from GitLab otherwise.
+        """
+        merge_request_data = (statuses or {}).get(merge_request_url)
+        if merge_request_data is None and self.watermark:
+            merge_request_data = self.watermark.get_merge_request(merge_request_url)
+            if merge_request_data is not None:
+                return merge_request_data
+        if merge_request_data is None:
+            merge_request_data = self.gitlab.get_merge_request(merge_request_url)
+        if self.watermark:
+            self.watermark.record_merge_request(merge_request_url, merge_request_data)
+        return merge_request_data
+
+    def record_write_failure(self, ticket_data):
+        """
+        Keep a ticket whose Mantis writes failed from being skipped by the next incremental run.
+        """
+        if self.watermark:
+            self.watermark.record_failure(ticket_data)
+
+    def finish_watermark(self):
+        """
+        Persist the incremental-run state and log what it saved.
+        """
+        self.watermark.save()
+        self.logger.info(f"Number of unchanged tickets skipped: {self.watermark.stats['skipped_tickets']}")
+        self.logger.info(f"Number of merged/closed MRs reused from the previous run: {self.watermark.stats['cached_mrs']}")
+
+    def start_merge_queue(self):
+        """
+        Create the per-branch merge queue used by this run.
+        """
+        self.merge_queue = MergeQueue(self.gitlab.merge_merge_request, max_branches=self.config.get("MERGE_QUEUE_MAX_BRANCHES", 4))
+        with self._queued_tickets_lock:
+            self._queued_tickets = []
+            self._counted_merges = set()
+
+    def queue_merge(self, merge_request_url, merge_request_data, target_branch):
+        """
+        Queue an opened MR for merging into its target branch.
+
+        Parameters:
+            merge_request_url (str): The URL of the merge request.
+            merge_request_data (dict): The MR data, whose target_branch selects the queue.
+            target_branch (str): The branch named in the Mantis note once the MR is merged.
+
+        Returns:
+            tuple: The queued merge, to be passed to defer_ticket().
+        """
+        target_project_id = get_target_project(merge_request_url)
+        future = self.merge_queue.submit(target_project_id, merge_request_data.get("target_branch"), merge_request_url)
+        return merge_request_url, merge_request_data, target_branch, future
+
+    def defer_ticket(self, ticket_data, queued_merges, resolve, code_move_ticket_id=None):
+        """
+        Finish a ticket once its queued merges are done.
+
+        Parameters:
+            ticket_data (dict): The ticket.
+            queued_merges (list): The merges returned by queue_merge() for this ticket.
+            resolve (bool): Whether every other MR of the ticket is already merged, so that the
+                ticket is resolved with complete_ticket() if the queued merges succeed.
+            code_move_ticket_id (int): The original ticket when ticket_data is a code move ticket.
+        """
+        if not queued_merges:
+            if resolve and not self.complete_ticket(ticket_data, code_move_ticket_id):
+                self.record_write_failure(ticket_data)
+            return
+        with self._queued_tickets_lock:
+            self._queued_tickets.append((ticket_data, queued_merges, resolve, code_move_ticket_id))
+
+    def complete_queued_tickets(self, wait=False):
+        """
+        Report the merges of every ticket whose queued MRs are done, with one Mantis note per
+        ticket, and resolve the tickets whose MRs are now all merged.
+
+        Parameters:
+            wait (bool): Wait for all queued merges instead of only handling finished tickets.
+
+        Returns:
+            int: Number of MRs merged, counting an MR shared by several tickets once.
+        """
+        # Tickets are deferred by the action stage while the finished ones are reported here
+        with self._queued_tickets_lock:
+            finished = []
+            remaining = []
+            for queued_ticket in self._queued_tickets:
+                if wait or all(future.done() for _, _, _, future in queued_ticket[1]):
+                    finished.append(queued_ticket)
+                else:
+                    remaining.append(queued_ticket)
+            self._queued_tickets = remaining
+
+        successful_merges = 0
+        for ticket_data, queued_merges, resolve, code_move_ticket_id in finished:
+            with LoggerSetup.ticket_context(ticket_data["id"]):
+                successful_merges = successful_merges + self._complete_queued_ticket(ticket_data, queued_merges, resolve, code_move_ticket_id)
+        return successful_merges
+
+    def _complete_queued_ticket(self, ticket_data, queued_merges, resolve, code_move_ticket_id):
+        successful_merges = 0
+        ticket_id = ticket_data["id"]
+        notes = []
+        for merge_request_url, merge_request_data, target_branch, future in queued_merges:
+            try:
+                merge_status = future.result()
+            except Exception as e:
+                merge_status = MergeResult(MergeResult.TRANSIENT_FAILURE, str(e))
+
+            if merge_status:
+                if self.watermark:
+                    self.watermark.record_merge_request(merge_request_url, dict(merge_request_data, state="merged"))
+                if code_move_ticket_id:
+                    self.logger.info(f"Merge request {merge_request_url} successfully merged. Code Move Ticket ID: {self.mantis.get_ticket_url(code_move_ticket_id)}")
+                    notes.append(f"The code move MR <b>{merge_request_url}</b> has been merged into <b>{target_branch}</b>.")
+                else:
+                    self.logger.info(f"Merge request {merge_request_url} successfully merged. Ticket ID: {self.mantis.get_ticket_url(ticket_id)}")
+                    notes.append(f"The MR <b>{merge_request_url}</b> has been merged into <b>{target_branch}</b>.")
+                # An MR linked from several tickets is merged once but reported on each of them
+                with self._queued_tickets_lock:
+                    first_report = future not in self._counted_merges
+                    self._counted_merges.add(future)
+                if first_report:
+                    successful_merges = successful_merges + 1
+            else:
+                self.logger.info(f"Unable to merge MR: {merge_request_url} despite trying, reason: {merge_status}")
+                self.logger.info(f"Skipping rest of the operations for ticket {ticket_id}")
+                resolve = False
+
+        written = True
+        if notes:
+            written = self.mantis.add_note_to_ticket(ticket_id, "<br/>".join(notes))
+        if resolve:
+            written = self.complete_ticket(ticket_data, code_move_ticket_id) and written
+        if not written:
+            self.record_write_failure(ticket_data)
+
+        return successful_merges
+
+    def finish_merge_queue(self):
+        """
+        Wait for the remaining merges, report them and log the throughput of every branch.
+
+        Returns:
+            int: Number of MRs merged by the tickets still waiting.
+        """
+        self.merge_queue.shutdown()
+        successful_merges = self.complete_queued_tickets(wait=True)
+        for branch, throughput in self.merge_queue.get_throughput().items():
+            self.logger.info(f"Merge queue {branch}: {throughput['merged']} merged, {throughput['failed']} failed in {throughput['seconds']}s ({throughput['per_minute']} MRs/min)")
+        return successful_merges
+
+    @classmethod
+    def run_lock(cls, ticket_type):
+        """
+        Return the lock that keeps sweeps and single-ticket merges of a ticket type from overlapping.
+        """
+        with cls._run_locks_guard:
+            return cls._run_locks.setdefault(ticket_type, threading.Lock())
+
+    def merge_ticket(self, ticket_data, merge_request_url=None):
+        """
+        Run the merge logic of a sweep for a single ticket, e.g. when GitLab reports a change to one of its MRs.
+
+        Parameters:
+            ticket_data (dict): The ticket, loaded with the "merger" field profile.
+            merge_request_url (str): The MR that changed, in any form of its URL; it is read fresh
+                instead of from the MR cache.
+
+        Returns:
+            int: Number of MRs merged.
+        """
+        statuses = {}
+        if merge_request_url:
+            merge_request_data = self.gitlab.get_merge_request(merge_request_url, use_cache=False)
+            # Keyed by the URLs of the ticket's notes, which the pipeline looks the MRs up with
+            for url in MergeWatermark.extract_merge_request_urls(ticket_data):
+                if MergeRequestRouter.same_merge_request(url, merge_request_url):
+                    statuses[url] = merge_request_data
+
+        with LoggerSetup.ticket_context(ticket_data["id"]):
+            self.logger.info(f"Ticket to process: {self.mantis.get_ticket_url(ticket_number=ticket_data['id'])}")
+        self.progress["status"] = "running"
+        self.progress["percentage"] = 0
+        self.start_merge_queue()
+        try:
+            self.process_ticket(ticket_data, statuses)
+        finally:
+            successful_merges = self.finish_merge_queue()
+            self.progress["status"] = "completed"
+            self.progress["percentage"] = 100
+        return successful_merges
+
+    def process_ticket(self, ticket_data, statuses=None):
+        """
+        Merge the ready MRs of one ticket and update the ticket, as a sweep does for every ticket of the filter.
+
+        Parameters:
+            ticket_data (dict): The ticket, loaded with the "merger" field profile.
+            statuses (dict): MR URL -> data already read for this ticket's MRs.
+        """
+        MergePipeline.from_config(self).process_ticket(ticket_data, statuses)
+
+    def classify_ticket(self, ticket_data):
+        """
+        Ticket-level rules, applied before the ticket's MRs are looked at.
+
+        Returns:
+            dict: Context passed to classify_merge_request() for every MR of the ticket. A callable
+                under "action" handles the ticket as a whole instead of merging its MRs, and
+                "code_move_ticket_id" is passed on to complete_ticket(). An action returns True
+                if every Mantis write succeeded.
+        """
+        return {}
+
+    def classify_merge_request(self, ticket_data, context, merge_request_url, merge_request_data):
+        """
+        Decide whether an opened or merged MR of a ticket is ready.
+
+        Returns:
+            MergeDecision: READY with the MR's expected target branch, or BLOCKED with the reason.
+        """
+        raise NotImplementedError("Subclasses must implement the classify_merge_request method")
+
+    def complete_ticket(self, ticket_data, code_move_ticket_id=None):
+        """
+        Update a ticket whose MRs are all merged.
+
+        Returns:
+            bool: True if every Mantis write succeeded.
+        """
+        raise NotImplementedError("Subclasses must implement the complete_ticket method")
+
+    def run(self, full_sweep=False):
+        """
+        Merge the ready MRs of every ticket of the merger's filter through the merge pipeline.
+
+        Parameters:
+            full_sweep (bool): Ignore the incremental-run state and process every ticket.
+        """
+        try:
+            self.progress["status"] = "running"
+            self.progress["percentage"] = 0
+
+            self.start_merge_queue()
+            self.start_watermark(self.filter_id, full_sweep)
+            stats = MergePipeline.from_config(self).run()
+            self.finish_watermark()
+
+            if stats["total_tickets"] == 0:
+                self.logger.info('No tickets found for the given filter.')
+                self.progress["status"] = "completed"
+                self.progress["percentage"] = 100
+                return
+
+            # Log stats
+            self.logger.info(f"Total Number of Tickets Processed: {stats['total_tickets']}")
+            self.logger.info(f"Number of MR's in the QA Verification Queue: {stats['pending_for_qa']}")
+            self.logger.info(f"Number of MR's in the Code Review Queue: {stats['pending_for_review']}")
+            self.logger.info(f"Number of MR's with Wrong Target Branches: {stats['invalid_target_branches']}")
+            self.logger.info(f"Number of MR's Successfully Merged: {stats['successful_merges']}")
+            self.logger.info(f"Number of Tickets that Failed: {stats['failed_tickets']}")
+            self.logger.info(f"Number of Mantis writes skipped as already applied: {self.mantis.get_skipped_write_count()}")
+            rate_metrics = self.mantis.get_rate_limit_metrics()
+            if rate_metrics:
+                self.logger.info(f"Mantis request rate: {rate_metrics['rate']}/s, throttled responses: {rate_metrics['throttled']}")
+
+            # Posting the stats to Google Chat
+            if self.chat_notifier:
+                self.chat_notifier.send_summary()
+
+            # Mark self.progress as completed
+            self.progress["status"] = "completed"
+            self.progress["percentage"] = 100
+
+        except Exception as e:
+            self.progress["status"] = f"error: {str(e)}"
+            self.progress["percentage"] = 0
+            self.logger.exception("Error in automation")
@@ -1,8 +1,13 @@
+import threading
 from .regression import RegressionMerger
 from .ps import PSMerger
 from core.string_constants import StringConstants
 
 class MergerFactory:
+    # Merger last used by a sweep or a webhook merge, per ticket type
+    _shared = {}
+    _shared_lock = threading.Lock()
+
     @staticmethod
     def get_merger(ticket_type):
         if ticket_type == StringConstants.REGRESSION:
@@ -11,3 +16,27 @@ class MergerFactory:
             return PSMerger()
         else:
             raise ValueError("Unsupported ticket type")
+
+    @classmethod
+    def set_shared_merger(cls, ticket_type, merger):
+        """
+        Make a merger the one reported by /progress and reused by webhook merges of its ticket type.
+        """
+        with cls._shared_lock:
+            cls._shared[ticket_type] = merger
+
+    @classmethod
+    def get_shared_merger(cls, ticket_type, create=True):
+        """
+        Return the merger last used for a ticket type by a sweep or a webhook merge.
+
+        Parameters:
+            ticket_type (str): The ticket type.
+            create (bool): Create and share a merger if none was used yet, instead of returning None.
+        """
+        with cls._shared_lock:
+            merger = cls._shared.get(ticket_type)
+            if merger is None and create:
+                merger = cls.get_merger(ticket_type)
+                cls._shared[ticket_type] = merger
+            return merger
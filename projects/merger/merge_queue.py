@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
+class MergeQueue:
+    """
+    Merge requests queued per (project, target branch).
+
+    Merges into different target branches cannot conflict with each other, so every branch has
+    its own ordered queue and the queues are drained concurrently, at most max_branches at a
+    time. Within a branch the MRs are merged one after the other in submission order, because
+    each merge moves the branch the next MR has to be merged into. An MR submitted again, e.g.
+    because several tickets link it, is merged once and shares the future of the first submit.
+    """
+
+    def __init__(self, merge_function, max_branches=4):
+        """
+        Parameters:
+            merge_function (callable): Called with the MR URL; its return value (truthy when the
+                MR was merged) becomes the result of the future returned by submit().
+            max_branches (int): Maximum number of branches merged into at the same time.
+        """
+        self.merge_function = merge_function
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_branches)), thread_name_prefix="merge-queue")
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._draining = set()
+        self._futures = []
+        self._submitted = {}
+        self._stats = {}
+
+    def submit(self, project_id, target_branch, merge_request_url):
+        """
+        Queue an MR behind the MRs already queued for the same project and target branch.
+
+        Returns:
+            Future: Resolves to the result of merge_function for this MR; the same future for
+                every submit of the same MR.
+        """
+        key = (str(project_id), target_branch)
+        with self._lock:
+            future = self._submitted.get((str(project_id), merge_request_url))
+            if future is not None:
+                return future
+            future = Future()
+            self._submitted[(str(project_id), merge_request_url)] = future
+            self._queues.setdefault(key, deque()).append((merge_request_url, future))
+            self._futures.append(future)
+            start_draining = key not in self._draining
+            if start_draining:
+                self._draining.add(key)
+        if start_draining:
+            self._executor.submit(self._drain, key)
+        return future
+
+    def _drain(self, key):
+        while True:
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    self._draining.discard(key)
+                    return
+                merge_request_url, future = queue.popleft()
+
+            started_at = time.monotonic()
+            try:
+                result = self.merge_function(merge_request_url)
+                future.set_result(result)
+            except Exception as e:
+                result = None
+                future.set_exception(e)
+            finished_at = time.monotonic()
+
+            with self._lock:
+                stats = self._stats.setdefault(key, {"merged": 0, "failed": 0, "busy_seconds": 0.0, "started_at": started_at, "finished_at": finished_at})
+                stats["merged" if result else "failed"] += 1
+                stats["busy_seconds"] += finished_at - started_at
+                stats["finished_at"] = finished_at
+
+    def join(self):
+        """
+        Block until every MR submitted so far has been processed.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def shutdown(self):
+        """
+        Process the MRs still queued and stop the worker threads.
+        """
+        self.join()
+        self._executor.shutdown(wait=True)
+
+    def get_throughput(self):
+        """
+        Return per-branch merge statistics.
+
+        Returns:
+            dict: "<project ID>/<target branch>" mapped to the number of merged and failed MRs,
+                the seconds between the first merge starting and the last one finishing, and
+                the resulting MRs per minute.
+        """
+        throughput = {}
+        with self._lock:
+            for (project_id, target_branch), stats in self._stats.items():
+                elapsed = stats["finished_at"] - stats["started_at"]
+                processed = stats["merged"] + stats["failed"]
+                throughput[f"{project_id}/{target_branch}"] = {
+                    "merged": stats["merged"],
+                    "failed": stats["failed"],
+                    "seconds": round(elapsed, 1),
+                    "per_minute": round(processed * 60 / elapsed, 1) if elapsed > 0 else float(processed)
+                }
+        return throughput
@@ -0,0 +1,163 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+MERGE_REQUEST_PATTERN = r"http://gitlab\.sibisoft\.com:7070/.*?/merge_requests/\d+"
+
+# MR states that never change again, so their data can be reused across runs
+TERMINAL_MR_STATES = ("merged", "closed")
+
+# MR fields the mergers read, kept for merged/closed MRs
+CACHED_MR_FIELDS = ("iid", "project_id", "state", "labels", "target_branch", "assignee", "author", "web_url")
+
+
+class MergeWatermark:
+    """
+    Per-filter state that lets a merger run skip work already done by a previous run.
+
+    For every ticket of the filter it keeps the ticket's updated_at, the ID of its last note and
+    the MR URLs found in its notes; for every merged or closed MR it keeps the fields the merger
+    reads. In incremental mode a ticket whose updated_at and last note are unchanged and whose
+    MRs are all merged or closed is skipped, and merged/closed MRs are served from the state
+    instead of GitLab. A full sweep ignores the stored state and rebuilds it.
+
+    The state is only written by save(), i.e. when a run completes, so a failed run never
+    advances the watermark. A ticket whose Mantis writes failed is marked with record_failure()
+    and is not skipped by the next run, since the failed write left its updated_at unchanged.
+    """
+
+    def __init__(self, state_file, filter_key, incremental=True, full_sweep_hours=24, full_sweep=False):
+        """
+        Parameters:
+            state_file (str): JSON file holding the state of every filter of a merger.
+            filter_key (str): The filter (or comma-separated filters) this run reads.
+            incremental (bool): Whether unchanged tickets may be skipped at all.
+            full_sweep_hours (float): Force a full sweep when the last one is older than this.
+            full_sweep (bool): Force a full sweep for this run.
+        """
+        self.state_file = state_file
+        self.filter_key = str(filter_key)
+        self.run_started_at = datetime.now()
+
+        self._state = self._load()
+        previous = self._state.setdefault("filters", {}).get(self.filter_key, {})
+        self._previous_tickets = previous.get("tickets", {})
+        self._terminal_mrs = dict(previous.get("terminal_mrs", {}))
+        self.last_run_started_at = previous.get("last_run_started_at")
+        self.last_full_sweep_at = previous.get("last_full_sweep_at")
+
+        self.full_sweep = not incremental or full_sweep or not self.last_full_sweep_at
+        if not self.full_sweep and full_sweep_hours:
+            last_sweep = datetime.fromisoformat(self.last_full_sweep_at)
+            self.full_sweep = self.run_started_at - last_sweep >= timedelta(hours=float(full_sweep_hours))
+
+        self._tickets = {}
+        self.stats = {"skipped_tickets": 0, "cached_mrs": 0}
+        # MRs are looked up from several pipeline workers at once
+        self._stats_lock = threading.Lock()
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            # A corrupt state only costs one full sweep
+            return {}
+
+    @staticmethod
+    def extract_merge_request_urls(ticket):
+        """
+        Return the MR URLs found in the notes of a ticket, in order of appearance.
+        """
+        urls = []
+        for note in ticket.get("notes") or []:
+            urls.extend(re.findall(MERGE_REQUEST_PATTERN, note.get("text", "")))
+        return urls
+
+    @staticmethod
+    def _signature(ticket):
+        notes = ticket.get("notes") or []
+        last_note_id = max((note.get("id", 0) for note in notes), default=0)
+        return ticket.get("updated_at"), last_note_id
+
+    def should_skip(self, ticket):
+        """
+        Record the ticket for this run and tell whether it can be skipped.
+
+        Returns:
+            bool: True if the ticket is unchanged since the last run and all its MRs are
+                merged or closed.
+        """
+        updated_at, last_note_id = self._signature(ticket)
+        mr_urls = self.extract_merge_request_urls(ticket)
+        ticket_key = str(ticket["id"])
+        self._tickets[ticket_key] = {"updated_at": updated_at, "last_note_id": last_note_id, "mrs": mr_urls}
+
+        if self.full_sweep or updated_at is None:
+            return False
+
+        previous = self._previous_tickets.get(ticket_key)
+        if not previous or previous.get("updated_at") != updated_at or previous.get("last_note_id") != last_note_id:
+            return False
+        if previous.get("failed"):
+            return False
+
+        if all(url in self._terminal_mrs for url in mr_urls):
+            self.stats["skipped_tickets"] += 1
+            return True
+        return False
+
+    def record_failure(self, ticket):
+        """
+        Mark a ticket of this run whose Mantis writes failed, so the next run processes it again.
+        """
+        entry = self._tickets.get(str(ticket["id"]))
+        if entry is not None:
+            entry["failed"] = True
+
+    def get_merge_request(self, merge_request_url):
+        """
+        Return the stored data of a merged or closed MR, or None if it must be fetched.
+        """
+        if self.full_sweep:
+            return None
+        merge_request_data = self._terminal_mrs.get(merge_request_url)
+        if merge_request_data is not None:
+            with self._stats_lock:
+                self.stats["cached_mrs"] += 1
+        return merge_request_data
+
+    def record_merge_request(self, merge_request_url, merge_request_data):
+        """
+        Keep the data of an MR once it is merged or closed, and forget it when it was reopened.
+        """
+        if merge_request_data and merge_request_data.get("state") in TERMINAL_MR_STATES:
+            self._terminal_mrs[merge_request_url] = {field: merge_request_data.get(field) for field in CACHED_MR_FIELDS}
+        elif merge_request_data:
+            self._terminal_mrs.pop(merge_request_url, None)
+
+    def save(self):
+        """
+        Persist the state of this run. Tickets that left the filter and MRs no ticket refers to are dropped.
+        """
+        referenced = {url for ticket in self._tickets.values() for url in ticket["mrs"]}
+        run_started_at = self.run_started_at.isoformat(timespec="seconds")
+        self._state["filters"][self.filter_key] = {
+            "last_run_started_at": run_started_at,
+            "last_full_sweep_at": run_started_at if self.full_sweep else self.last_full_sweep_at,
+            "tickets": self._tickets,
+            "terminal_mrs": {url: data for url, data in self._terminal_mrs.items() if url in referenced},
+        }
+
+        directory = os.path.dirname(self.state_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated state behind
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(self._state, file, indent=4)
+        os.replace(temp_path, self.state_file)
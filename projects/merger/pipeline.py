@@ -0,0 +1,366 @@
+import queue
+import threading
+from core.logging_config import LoggerSetup
+from .merge_watermark import MergeWatermark
+
+# Marks the end of the stream on a stage queue
+_DONE = object()
+
+
+class MergeDecision:
+    """
+    Readiness of one MR of a ticket.
+
+    READY and BLOCKED are decided by the ticket type's classify_merge_request(); UNRESOLVED (the MR
+    could not be read) and CLOSED are decided by the pipeline before the rules are asked.
+    """
+
+    READY = "ready"
+    BLOCKED = "blocked"
+    UNRESOLVED = "unresolved"
+    CLOSED = "closed"
+
+    __slots__ = ("verdict", "target_branch", "message", "counter", "review_awaited")
+
+    def __init__(self, verdict, target_branch=None, message=None, counter=None, review_awaited=False):
+        """
+        Parameters:
+            verdict (str): One of the verdict constants of this class.
+            target_branch (str): The branch the MR must target for this ticket type.
+            message (str): Why a BLOCKED MR cannot be merged, logged as "<message> for: <MR URL>".
+            counter (str): Run statistic incremented for a BLOCKED opened MR, e.g. "pending_for_qa".
+            review_awaited (bool): Tag the ticket with TAG_CODE_REVIEW_AWAITED.
+        """
+        self.verdict = verdict
+        self.target_branch = target_branch
+        self.message = message
+        self.counter = counter
+        self.review_awaited = review_awaited
+
+    @classmethod
+    def ready(cls, target_branch):
+        return cls(cls.READY, target_branch)
+
+    @classmethod
+    def blocked(cls, target_branch, message, counter=None, review_awaited=False):
+        return cls(cls.BLOCKED, target_branch, message, counter, review_awaited)
+
+
+class TicketWork:
+    """
+    A ticket travelling through the pipeline, with what each stage found out about it.
+    """
+
+    __slots__ = ("ticket", "context", "merge_request_urls", "merge_requests", "decisions")
+
+    def __init__(self, ticket, context):
+        self.ticket = ticket
+        self.context = context
+        self.merge_request_urls = []
+        self.merge_requests = {}
+        self.decisions = []
+
+
+class MergePipeline:
+    """
+    Staged merge run shared by every ticket type.
+
+        ticket source -> MR extraction -> MR resolution -> readiness classification -> action execution -> reporting
+
+    The source reads the merger's filter page by page and hands tickets on in chunks of
+    MERGE_PREFETCH_TICKETS; the MRs of a chunk are resolved together with batched GitLab queries.
+    Stages are connected by bounded queues of MERGE_PIPELINE_QUEUE_SIZE items, so a slow stage
+    holds back the ones before it, and every stage runs its own number of worker threads. Tickets
+    are independent of each other, so MERGE_TICKET_WORKERS tickets are acted on in parallel; their
+    log lines carry the ticket ID. The reporting stage runs on the calling thread.
+
+    The merger supplies the rules: classify_ticket(), classify_merge_request() and complete_ticket().
+    """
+
+    def __init__(self, merger, chunk_size=50, queue_size=100, resolve_workers=2, classify_workers=1, action_workers=1):
+        """
+        Parameters:
+            merger (BaseMerger): The merger whose rules, clients, watermark and merge queue are used.
+            chunk_size (int): Tickets whose MRs are resolved together.
+            queue_size (int): Capacity of every queue between two stages.
+            resolve_workers (int): Threads resolving MRs.
+            classify_workers (int): Threads applying the classification rules.
+            action_workers (int): Tickets acted on in parallel (Mantis writes and queued merges).
+        """
+        self.merger = merger
+        self.chunk_size = max(1, int(chunk_size))
+        self.queue_size = max(1, int(queue_size))
+        self.workers = {
+            "extract": 1,
+            "resolve": max(1, int(resolve_workers)),
+            "classify": max(1, int(classify_workers)),
+            "act": max(1, int(action_workers))
+        }
+        self._stats_lock = threading.Lock()
+        self.stats = {"total_tickets": 0, "pending_for_qa": 0, "pending_for_review": 0, "invalid_target_branches": 0, "successful_merges": 0, "failed_tickets": 0}
+        self._finished_tickets = 0
+        # Set by run(); single tickets processed outside a run do not report progress
+        self._fetch_stats = None
+
+    @classmethod
+    def from_config(cls, merger):
+        """
+        Create a pipeline sized by the merger's configuration.
+        """
+        config = merger.config
+        return cls(
+            merger,
+            chunk_size=config.get("MERGE_PREFETCH_TICKETS", 50),
+            queue_size=config.get("MERGE_PIPELINE_QUEUE_SIZE", 100),
+            resolve_workers=config.get("MERGE_PIPELINE_RESOLVE_WORKERS", 2),
+            classify_workers=config.get("MERGE_PIPELINE_CLASSIFY_WORKERS", 1),
+            action_workers=config.get("MERGE_TICKET_WORKERS", 1)
+        )
+
+    def _count(self, counter, amount=1):
+        with self._stats_lock:
+            self.stats[counter] += amount
+            return self.stats[counter]
+
+    def _finish_ticket(self):
+        """
+        Count a ticket as done and update the progress percentage against the known (or estimated) total.
+        """
+        if self._fetch_stats is None:
+            return
+        with self._stats_lock:
+            self._finished_tickets += 1
+            total = max(self._fetch_stats.get("total") or 0, self.stats["total_tickets"], self._finished_tickets)
+            # Computed and stored under the lock so the percentage never goes backwards
+            self.merger.progress["percentage"] = int((self._finished_tickets / total) * 100)
+
+    def run(self):
+        """
+        Run every ticket of the merger's filter through the stages.
+
+        Returns:
+            dict: Run statistics (total_tickets, pending_for_qa, pending_for_review,
+                invalid_target_branches, successful_merges, failed_tickets).
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(5)]
+        source_errors = []
+        self._fetch_stats = {}
+
+        source = threading.Thread(target=self._read_source, args=(queues[0], source_errors), name="merge-source", daemon=True)
+        threads = [source]
+        for (name, function), inbox, outbox in zip(
+            (("extract", self._extract), ("resolve", self._resolve), ("classify", self._classify), ("act", self._act)),
+            queues[:-1], queues[1:]
+        ):
+            threads.extend(self._start_stage(name, function, inbox, outbox))
+        source.start()
+
+        # Reporting: finish the tickets whose merges are done while the other stages keep going
+        while queues[-1].get() is not _DONE:
+            self._count("successful_merges", self.merger.complete_queued_tickets())
+        for thread in threads:
+            thread.join()
+        self._count("successful_merges", self.merger.finish_merge_queue())
+
+        if source_errors:
+            raise source_errors[0]
+        return dict(self.stats)
+
+    def process_ticket(self, ticket_data, statuses=None):
+        """
+        Run one ticket through the stages on the calling thread.
+
+        Parameters:
+            ticket_data (dict): The ticket, loaded with the "merger" field profile.
+            statuses (dict): MR URL -> data already read, used before any other source.
+        """
+        for chunk in self._extract([ticket_data]):
+            for work in self._resolve(chunk, statuses or {}):
+                for classified in self._classify(work):
+                    list(self._act(classified))
+
+    def _start_stage(self, name, function, inbox, outbox):
+        remaining = self.workers[name]
+        remaining_lock = threading.Lock()
+
+        def work():
+            nonlocal remaining
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    # Put back for the sibling workers; the last one to stop closes the next stage
+                    inbox.put(_DONE)
+                    with remaining_lock:
+                        remaining -= 1
+                        last = remaining == 0
+                    if last:
+                        outbox.put(_DONE)
+                    return
+                passed_on = []
+                try:
+                    for output in function(item):
+                        outbox.put(output)
+                        passed_on.append(output)
+                except Exception:
+                    self.merger.logger.exception(f"Error in the {name} stage of the merge pipeline")
+                    self._fail_tickets(item, passed_on)
+
+        threads = [threading.Thread(target=work, name=f"merge-{name}-{index}", daemon=True) for index in range(self.workers[name])]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _tickets_of(items):
+        tickets = []
+        for item in items if isinstance(items, list) else [items]:
+            if isinstance(item, list):
+                tickets.extend(MergePipeline._tickets_of(item))
+            else:
+                tickets.append(item.ticket if isinstance(item, TicketWork) else item)
+        return tickets
+
+    def _fail_tickets(self, item, passed_on):
+        """
+        Account for the tickets of an item a stage failed on, except those it already passed on.
+
+        They count as failed and as done for the progress, and the next incremental run does not skip them.
+        """
+        passed_on_ids = {ticket["id"] for ticket in self._tickets_of(passed_on)}
+        for ticket_data in self._tickets_of(item):
+            if ticket_data["id"] in passed_on_ids:
+                continue
+            self.merger.logger.info(f"Ticket {ticket_data['id']} failed in the merge pipeline, it will be processed again by the next run")
+            self._count("failed_tickets")
+            self.merger.record_write_failure(ticket_data)
+            self._finish_ticket()
+
+    # Stages
+
+    def _read_source(self, outbox, errors):
+        merger = self.merger
+        chunk = []
+        try:
+            for ticket_data in merger.mantis.iter_tickets_from_filter(merger.filter_id, stats=self._fetch_stats, fields="merger"):
+                self._count("total_tickets")
+                ticket_id = ticket_data["id"]
+                with LoggerSetup.ticket_context(ticket_id):
+                    merger.logger.info(f"Ticket to process: {merger.mantis.get_ticket_url(ticket_number=ticket_id)}")
+
+                    if merger.watermark.should_skip(ticket_data):
+                        merger.logger.info(f"Skipping ticket {ticket_id}, unchanged since the last run and all its MRs are merged or closed")
+                        self._finish_ticket()
+                        continue
+
+                chunk.append(ticket_data)
+                if len(chunk) >= self.chunk_size:
+                    outbox.put(chunk)
+                    chunk = []
+            if chunk:
+                outbox.put(chunk)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            outbox.put(_DONE)
+
+    def _extract(self, tickets):
+        """
+        Ask the ticket rules about each ticket and list the MRs linked in its notes.
+        """
+        works = []
+        for ticket_data in tickets:
+            work = TicketWork(ticket_data, self.merger.classify_ticket(ticket_data))
+            # Tickets handled as a whole by a ticket action need no MR
+            if not work.context.get("action"):
+                work.merge_request_urls = list(dict.fromkeys(MergeWatermark.extract_merge_request_urls(ticket_data)))
+            works.append(work)
+        yield works
+
+    def _resolve(self, works, statuses=None):
+        """
+        Resolve the MRs of a chunk of tickets, with batched GitLab queries unless statuses are given.
+        """
+        if statuses is None:
+            merge_request_urls = [url for work in works for url in work.merge_request_urls]
+            statuses = self.merger.gitlab.get_merge_request_statuses(merge_request_urls) if merge_request_urls else {}
+        for work in works:
+            work.merge_requests = {url: self.merger.get_merge_request(url, statuses) for url in work.merge_request_urls}
+            yield work
+
+    def _classify(self, work):
+        """
+        Decide for every MR of a ticket whether it can be merged.
+        """
+        for merge_request_url in work.merge_request_urls:
+            merge_request_data = work.merge_requests.get(merge_request_url)
+            if not merge_request_data:
+                decision = MergeDecision(MergeDecision.UNRESOLVED)
+            elif merge_request_data.get("state") == "closed":
+                decision = MergeDecision(MergeDecision.CLOSED)
+            else:
+                decision = self.merger.classify_merge_request(work.ticket, work.context, merge_request_url, merge_request_data)
+            work.decisions.append((merge_request_url, merge_request_data, decision))
+        yield work
+
+    def _act(self, work):
+        """
+        Apply the decisions of a ticket: tag it, queue its ready MRs and hand it to the reporting stage.
+        """
+        with LoggerSetup.ticket_context(work.ticket["id"]):
+            self._apply_decisions(work)
+        self._finish_ticket()
+        yield work
+
+    def _apply_decisions(self, work):
+        merger = self.merger
+        ticket_data = work.ticket
+        ticket_id = ticket_data["id"]
+
+        action = work.context.get("action")
+        if action:
+            if not action(ticket_data, work.context):
+                merger.record_write_failure(ticket_data)
+            return
+
+        if not ticket_data.get("notes"):
+            merger.logger.info(f'No notes found for ticket: {ticket_id}')
+            return
+
+        review_tag = merger.config.get("TAG_CODE_REVIEW_AWAITED")
+        all_mrs_merged = True
+        queued_merges = []
+        number_of_mrs_in_ticket = 0
+
+        for merge_request_url, merge_request_data, decision in work.decisions:
+            if decision.verdict == MergeDecision.UNRESOLVED:
+                merger.logger.info(f"Unable to fetch MR data for: {merge_request_url}")
+                merger.logger.info(f"Skipping rest of the operations for ticket {ticket_id}")
+                all_mrs_merged = False
+                continue
+
+            if decision.verdict == MergeDecision.CLOSED:
+                merger.logger.info(f"The MR {merge_request_url} is closed. Going to the next MR.")
+                continue
+
+            number_of_mrs_in_ticket = number_of_mrs_in_ticket + 1
+            merge_request_status = merge_request_data.get("state")
+
+            if decision.verdict == MergeDecision.READY:
+                if not merger.mantis.ensure_tags_detached(ticket_data, [review_tag]):
+                    merger.record_write_failure(ticket_data)
+                if merge_request_status == "opened":
+                    # Merged by the per-branch queue; the ticket is finished once its merges are done
+                    queued_merges.append(merger.queue_merge(merge_request_url, merge_request_data, decision.target_branch))
+                elif merge_request_status == "merged":
+                    merger.logger.info(f"The MR {merge_request_url} is already merged, Ticket: {merger.mantis.get_ticket_url(ticket_id)}")
+                continue
+
+            if merge_request_status == "opened": # Printing the error logs only for open MRs
+                if decision.counter:
+                    self._count(decision.counter)
+                if decision.review_awaited and not merger.mantis.ensure_tags_attached(ticket_data, [review_tag]):
+                    merger.record_write_failure(ticket_data)
+                merger.logger.info(f"{decision.message} for: {merge_request_url}")
+            all_mrs_merged = False
+
+        merger.defer_ticket(ticket_data, queued_merges, all_mrs_merged and number_of_mrs_in_ticket > 0, work.context.get("code_move_ticket_id"))
@@ -0,0 +1,98 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from core.logging_config import LoggerSetup
+from core.config_manager import ConfigurationManager
+from core.string_constants import StringConstants
+from operations.mantis_operations import MantisOperations
+from operations.gitlab_operations import GitLabOperations
+from operations.utils import get_target_project
+from operations.mr_router import MergeRequestRouter
+
+mirror_logger = LoggerSetup.setup_logger("mirror", "logs/mirror")
+
+# Progress tracking
+progress = {"status": "idle", "percentage": 0}
+
+MERGE_REQUEST_PATTERN = r"http://gitlab\.sibisoft\.com:7070/.*?/merge_requests/\d+"
+
+
+def sync_mirror():
+    """
+    Refresh the local mirror with the tickets of the configured filters and the MRs linked in their notes.
+
+    Filters listed in MIRROR_FILTER_IDS are read in full and replace their previous membership.
+    MRs already stored as merged or closed are not fetched again.
+    """
+    progress["status"] = "running"
+    progress["percentage"] = 0
+
+    try:
+        config = ConfigurationManager(config_file="configs/common.json")
+        mantis = MantisOperations(StringConstants.REGRESSION)
+        gitlab = GitLabOperations(StringConstants.REGRESSION)
+
+        if mantis.mirror is None:
+            mirror_logger.info("Local mirror is disabled, set MIRROR_ENABLED to \"true\" to use it.")
+            progress["status"] = "completed"
+            progress["percentage"] = 100
+            return
+
+        filter_ids = mantis.normalize_filter_ids(config.get("MIRROR_FILTER_IDS", ""))
+        merge_request_urls = {}
+
+        for idx, filter_id in enumerate(filter_ids):
+            tickets = list(mantis.iter_tickets_from_filter(filter_id, fields="mirror"))
+            mantis.mirror.upsert_tickets(tickets)
+            mantis.mirror.set_filter_members(filter_id, [ticket["id"] for ticket in tickets])
+            mirror_logger.info(f"[Filter {filter_id}] Mirrored {len(tickets)} tickets")
+
+            for ticket in tickets:
+                for note in ticket.get("notes") or []:
+                    for url in re.findall(MERGE_REQUEST_PATTERN, note.get("text", "")):
+                        merge_request_urls[url] = None
+
+            progress["percentage"] = int(((idx + 1) / len(filter_ids)) * 50)
+
+        pending_urls = [url for url in merge_request_urls if not _is_settled(gitlab, url)]
+        mirror_logger.info(f"Refreshing {len(pending_urls)} of {len(merge_request_urls)} merge requests")
+
+        workers = int(config.get("MANTIS_BULK_FETCH_WORKERS", 8))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for idx, _ in enumerate(executor.map(lambda url: _sync_merge_request(gitlab, url), pending_urls)):
+                progress["percentage"] = 50 + int(((idx + 1) / len(pending_urls)) * 50)
+
+        mirror_logger.info(f"Mirror sync completed: {mantis.mirror.get_stats()}")
+        progress["status"] = "completed"
+        progress["percentage"] = 100
+
+    except Exception as e:
+        progress["status"] = f"error: {str(e)}"
+        progress["percentage"] = 0
+        mirror_logger.exception("Error while syncing the local mirror")
+
+
+def _sync_merge_request(gitlab, merge_request_url):
+    """
+    Read an MR and store it in the mirror.
+
+    MRs served by the shared MR cache never reach GitLab, so nothing would store them on the way;
+    they are written here whether they came from the cache or from GitLab.
+    """
+    merge_request_data = gitlab.get_merge_request(merge_request_url)
+    merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+    if merge_request_data and merge_request_ref is not None:
+        target_project_id = get_target_project(merge_request_url)
+        gitlab.mirror.upsert_merge_request(target_project_id, merge_request_ref.iid, merge_request_data, url=merge_request_url)
+    return merge_request_data
+
+
+def _is_settled(gitlab, merge_request_url):
+    """
+    Check whether the mirror already holds the MR as merged or closed, which never changes again.
+    """
+    target_project_id = get_target_project(merge_request_url)
+    merge_request_ref = MergeRequestRouter.parse(merge_request_url)
+    if not target_project_id or merge_request_ref is None:
+        return True
+    merge_request_data = gitlab.mirror.get_merge_request(target_project_id, merge_request_ref.iid, float("inf"))
+    return merge_request_data is not None and merge_request_data.get("state") in ("merged", "closed")
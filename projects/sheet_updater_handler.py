@@ -143,6 +143,25 @@ def run_sheet_updater(sheet_url=None):
         successful_updates = 0
         failed_updates = 0
         no_mr_found = 0
+
+        # Fetch all valid tickets from Mantis up front, concurrently
+        progress["message"] = "Fetching tickets from Mantis..."
+        ticket_ids = []
+        for _, ticket_number in ticket_data:
+            ticket_id = ticket_number.replace("#", "").strip()
+            if ticket_id.isdigit() and ticket_id not in ticket_ids:
+                ticket_ids.append(ticket_id)
+
+        fetched_tickets, fetch_errors = mantis.get_tickets_data(ticket_ids, fields="sheet_updater")
+        tickets_by_id = dict(zip(ticket_ids, fetched_tickets))
+
+        # Resolve the status of every linked MR up front with a few GraphQL queries
+        progress["message"] = "Fetching merge requests from GitLab..."
+        all_mr_urls = []
+        for ticket_info in fetched_tickets:
+            if ticket_info:
+                all_mr_urls.extend(url for url in extract_merge_request_urls_from_notes(ticket_info.get("notes", [])) if "ns_cypress" not in url)
+        merge_requests = gitlab.get_merge_request_statuses(all_mr_urls)
         
         # Process each ticket
         for idx, (row_index, ticket_number) in enumerate(ticket_data):
@@ -160,11 +179,11 @@ def run_sheet_updater(sheet_url=None):
                     failed_updates += 1
                     continue
                 
-                # Get ticket data from Mantis
-                ticket_info = mantis.get_ticket_data(ticket_id)
+                # Get ticket data fetched from Mantis
+                ticket_info = tickets_by_id.get(ticket_id)
                 
                 if not ticket_info:
-                    sheet_updater_logger.warning(f"Could not fetch ticket {ticket_id} from Mantis")
+                    sheet_updater_logger.warning(f"Could not fetch ticket {ticket_id} from Mantis: {fetch_errors.get(ticket_id)}")
                     failed_updates += 1
                     continue
                 
@@ -197,7 +216,7 @@ def run_sheet_updater(sheet_url=None):
                 mr_data = None
                 for mr_url in mr_urls:
                     sheet_updater_logger.info(f"Attempting to fetch MR: {mr_url}")
-                    temp_mr_data = gitlab.get_merge_request(mr_url)
+                    temp_mr_data = merge_requests.get(mr_url) or gitlab.get_merge_request(mr_url)
                     if temp_mr_data:
                         mr_data = temp_mr_data
                         sheet_updater_logger.info(f"Successfully fetched MR data from: {mr_url}")
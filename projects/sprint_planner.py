@@ -3,6 +3,7 @@ from operations.mantis_operations import MantisOperations
 from operations.google_sheets_operations import GoogleSheetsOperations
 from operations.utils import *
 from core.string_constants import StringConstants
+from core.config_manager import ConfigurationManager
 from openpyxl import load_workbook
 
 # Initialize modules
@@ -35,10 +36,15 @@ def plan_sprint():
         workbook = load_workbook(file_path)
         sheet = workbook["Sheet1"]
 
-        for idx, ticket_id in enumerate(tickets):
-            
-            
-            ticket_data = mantis.get_ticket_data(ticket_id)
+        # Served from the local mirror when it is enabled and fresh enough
+        max_age = float(ConfigurationManager(config_file="configs/common.json").get("MIRROR_MAX_AGE", 900))
+        tickets_data, errors = mantis.get_tickets_data(tickets, fields="sprint_planner", max_age=max_age)
+        for ticket_id, error in errors.items():
+            ticket_logger.error(f"Could not fetch ticket {ticket_id}: {error}")
+
+        for idx, ticket_data in enumerate(tickets_data):
+            if not ticket_data:
+                continue
 
             sheet[f"A{idx+2}"] = f"=HYPERLINK(\"https://mantis.sibisoft.com/view.php?id={ticket_data.get("id")}\",\"{ticket_data.get("id")}\")"
             sheet[f"B{idx+2}"] = f"{ticket_data.get("category")["name"]}"
@@ -43,6 +43,10 @@ def modify_tickets():
         CONTROL_TICKET_DESC="MT#0434669: Nexus E6-B: Regression Testing Control Ticket"
         OLD_CONTROL_TICKET = 438810
 
+        # The relationships of the same ticket are removed once for the whole run
+        relationship_result = mantis.delete_all_relationships(452365)
+        ticket_logger.info(f"Deleted {len(relationship_result['deleted'])} relationships of {mantis.get_ticket_url(452365)}, {len(relationship_result['failed'])} failed")
+
         for idx, ticket_id in enumerate(tickets):
             
             
@@ -78,8 +82,6 @@ def modify_tickets():
 
             # mantis.update_status_to_for_qa(ticket_id=ticket_id)
 
-            mantis.delete_all_relationships(452365)
-
             ticket_logger.info(f"Updated the details for {mantis.get_ticket_url(ticket_id)}")
 
             
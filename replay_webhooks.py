@@ -0,0 +1,61 @@
+"""
+Replay recorded GitLab merge request webhooks, to try the event-driven merging without GitLab.
+
+Each file holds one webhook payload as JSON, or one payload per line (JSON lines), as copied
+from the "Recent events" of a GitLab project webhook.
+
+Usage:
+    python replay_webhooks.py payload.json [more.json ...]
+        POST the payloads to the running app, with the configured GITLAB_WEBHOOK_SECRET.
+    python replay_webhooks.py payload.json --url http://host:5000/gitlab/webhook
+    python replay_webhooks.py payload.json --direct
+        Process the payloads in this process, one after the other, without the Flask app.
+"""
+import argparse
+import json
+import requests
+from core.config_manager import ConfigurationManager
+
+
+def load_payloads(path):
+    with open(path, "r") as file:
+        content = file.read().strip()
+    try:
+        payload = json.loads(content)
+        return payload if isinstance(payload, list) else [payload]
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded GitLab merge request webhooks.")
+    parser.add_argument("files", nargs="+", help="JSON or JSON-lines files with recorded payloads")
+    parser.add_argument("--url", default="http://localhost:5000/gitlab/webhook", help="Webhook endpoint of the running app")
+    parser.add_argument("--direct", action="store_true", help="Process the payloads in this process instead of posting them")
+    args = parser.parse_args()
+
+    if args.direct:
+        from projects.gitlab_webhook_handler import check_event, process_merge_request_event
+
+    config = ConfigurationManager(config_file="configs/common.json")
+    headers = {
+        "X-Gitlab-Event": "Merge Request Hook",
+        "X-Gitlab-Token": config.get("GITLAB_WEBHOOK_SECRET") or "",
+        "Content-Type": "application/json"
+    }
+
+    for path in args.files:
+        for payload in load_payloads(path):
+            merge_request_url = (payload.get("object_attributes") or {}).get("url")
+            if args.direct:
+                accepted, message = check_event(payload)
+                if accepted:
+                    message = f"{process_merge_request_event(payload)} MR(s) merged"
+                print(f"{merge_request_url}: {message}")
+            else:
+                response = requests.post(args.url, headers=headers, json=payload, timeout=30)
+                print(f"{merge_request_url}: {response.status_code} {response.text.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from cryptography.fernet import Fernet
+
+from core.string_constants import StringConstants
+from encryption.token_manager import TokenManager
+from operations.async_gitlab_operations import AsyncGitLabOperations
+from operations.async_mantis_operations import AsyncMantisOperations
+
+MR_BASE = "http://gitlab.sibisoft.com:7070/root/NS61x/-/merge_requests/"
+
+
+class FakeBackend:
+    """
+    Mantis and GitLab endpoints used by the async clients, recording every request.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.throttled_merges = 0
+        self.merge_requests = {
+            1: {"iid": 1, "state": "opened", "detailed_merge_status": "mergeable", "has_conflicts": False},
+            2: {"iid": 2, "state": "merged"},
+        }
+
+    def application(self):
+        app = web.Application()
+        app.router.add_get("/api/rest/issues/{ticket_id}", self.get_issue)
+        app.router.add_get("/api/v4/projects/{project_id}/merge_requests", self.list_merge_requests)
+        app.router.add_get("/api/v4/projects/{project_id}/merge_requests/{iid}", self.get_merge_request)
+        app.router.add_put("/api/v4/projects/{project_id}/merge_requests/{iid}/merge", self.merge)
+        return app
+
+    async def get_issue(self, request):
+        self.requests.append((request.method, request.path_qs))
+        ticket_id = int(request.match_info["ticket_id"])
+        if ticket_id == 404:
+            return web.json_response({"message": "Issue not found"}, status=404)
+        return web.json_response({"issues": [{"id": ticket_id}]})
+
+    async def list_merge_requests(self, request):
+        self.requests.append((request.method, request.path_qs))
+        iids = [int(iid) for iid in request.query.getall("iids[]")]
+        return web.json_response([self.merge_requests[iid] for iid in iids if iid in self.merge_requests])
+
+    async def get_merge_request(self, request):
+        self.requests.append((request.method, request.path_qs))
+        return web.json_response(self.merge_requests[int(request.match_info["iid"])])
+
+    async def merge(self, request):
+        self.requests.append((request.method, request.path_qs))
+        if self.throttled_merges:
+            self.throttled_merges -= 1
+            return web.json_response({"message": "Too Many Requests"}, status=429, headers={"Retry-After": "0"})
+        return web.json_response({"iid": int(request.match_info["iid"]), "state": "merged"})
+
+
+class AsyncClientsTest(unittest.IsolatedAsyncioTestCase):
+    """
+    The async clients against a local aiohttp server, with configs and tokens in a temporary directory.
+    """
+
+    async def asyncSetUp(self):
+        self.backend = FakeBackend()
+        self.server = TestServer(self.backend.application())
+        await self.server.start_server()
+        base_url = str(self.server.make_url("")).rstrip("/")
+
+        self.previous_directory = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        os.makedirs("configs")
+        os.makedirs("credentials")
+        with open("configs/common.json", "w") as file:
+            json.dump({"KEY_FILE": "credentials/secret.key", "MANTIS_PATH": base_url, "GITLAB_PATH": base_url, "BO_PROJECT": "3"}, file)
+        with open(f"configs/{StringConstants.REGRESSION}.json", "w") as file:
+            json.dump({"BackOffice": "NEXUS08-BO"}, file)
+        with open("credentials/secret.key", "wb") as file:
+            file.write(Fernet.generate_key())
+        TokenManager("credentials/secret.key", f"credentials/{StringConstants.TOKEN_PREFIX}{StringConstants.REGRESSION}.txt").save_tokens("mantis", "gitlab")
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        os.chdir(self.previous_directory)
+        shutil.rmtree(self.directory)
+
+    async def test_get_tickets_data_keeps_order_and_reports_failures(self):
+        async with AsyncMantisOperations(StringConstants.REGRESSION) as mantis:
+            tickets, errors = await mantis.get_tickets_data([3, 404, 1])
+
+        self.assertEqual(tickets, [{"id": 3}, None, {"id": 1}])
+        self.assertEqual(list(errors), [404])
+
+    async def test_get_merge_requests_lists_by_iids(self):
+        async with AsyncGitLabOperations(StringConstants.REGRESSION) as gitlab:
+            merge_requests = await gitlab.get_merge_requests([MR_BASE + "1", MR_BASE + "2", MR_BASE + "1", MR_BASE + "9"])
+
+        self.assertEqual(merge_requests[MR_BASE + "2"]["state"], "merged")
+        self.assertIsNone(merge_requests[MR_BASE + "9"])
+        self.assertEqual(len(self.backend.requests), 1)
+
+    async def test_merge_merge_request_retries_throttled_merge(self):
+        self.backend.throttled_merges = 1
+        async with AsyncGitLabOperations(StringConstants.REGRESSION) as gitlab:
+            result = await gitlab.merge_merge_request(MR_BASE + "1")
+            metrics = gitlab.http.get_metrics()
+
+        self.assertTrue(result)
+        self.assertEqual([method for method, _ in self.backend.requests], ["GET", "PUT", "PUT"])
+        self.assertEqual(metrics["throttled"], 1)
+
+    async def test_merge_merge_request_reports_already_merged(self):
+        async with AsyncGitLabOperations(StringConstants.REGRESSION) as gitlab:
+            result = await gitlab.merge_merge_request(MR_BASE + "2")
+
+        self.assertEqual(result.message, "already merged")
+        self.assertNotIn("PUT", [method for method, _ in self.backend.requests])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from operations.mantis_write_batch import MantisWriteBatch
+
+
+class FakeMantis:
+    """
+    Records the PATCHes of a batch; PATCHes of failing_ids raise like a network error would.
+    """
+
+    def __init__(self, failing_ids=()):
+        self.failing_ids = set(failing_ids)
+        self.patches = []
+
+    def record_write(self, kind, sent=0, skipped=0):
+        pass
+
+    def patch_issue(self, ticket_id, payload, error_message=None):
+        self.patches.append(ticket_id)
+        if ticket_id in self.failing_ids:
+            raise ConnectionError("connection reset")
+        return True
+
+
+class MantisWriteBatchTest(unittest.TestCase):
+
+    def test_failed_patch_does_not_drop_later_tickets(self):
+        mantis = FakeMantis(failing_ids=["1"])
+        with MantisWriteBatch(mantis) as batch:
+            for ticket_id in (1, 2, 3):
+                batch.set_resolution(ticket_id, "Fixed")
+
+        self.assertEqual(mantis.patches, ["1", "2", "3"])
+        self.assertEqual(batch.results, {"1": False, "2": True, "3": True})
+
+    def test_block_exit_flushes_once(self):
+        mantis = FakeMantis()
+        issue = {"id": 1, "resolution": {"name": "open"}}
+        with MantisWriteBatch(mantis, known_issues=[issue]) as batch:
+            batch.set_resolution(1, "Fixed")
+            batch.set_status(1, "assigned")
+
+        self.assertEqual(mantis.patches, ["1"])
+        self.assertEqual(batch.results, {"1": True})
+        self.assertEqual(issue["resolution"], {"name": "Fixed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import threading
+import unittest
+
+from projects.merger.merge_queue import MergeQueue
+
+MR_URL = "http://gitlab.sibisoft.com:7070/root/NS61x/-/merge_requests/1"
+
+
+class MergeQueueDuplicateTest(unittest.TestCase):
+    """
+    An MR linked from several tickets is merged once and its result is shared by every ticket.
+    """
+
+    def test_duplicate_mr_is_merged_once(self):
+        merged = []
+        lock = threading.Lock()
+
+        def merge(url):
+            with lock:
+                merged.append(url)
+            return len(merged) == 1
+
+        queue = MergeQueue(merge, max_branches=2)
+        first = queue.submit(102711, "master", MR_URL)
+        second = queue.submit("102711", "master", MR_URL)
+        queue.shutdown()
+
+        self.assertIs(first, second)
+        self.assertEqual(merged, [MR_URL])
+        self.assertTrue(second.result())
+        self.assertEqual(queue.get_throughput()["102711/master"]["merged"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from operations.merge_request_cache import MergeRequestCache
+
+
+class MergeRequestCachePersistenceTest(unittest.TestCase):
+    """
+    Merged/closed MRs survive a restart, unless they were reopened meanwhile.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.directory, "merge_requests.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def line_count(self):
+        with open(self.cache_file) as file:
+            return len(file.readlines())
+
+    def test_closed_mr_is_reloaded(self):
+        MergeRequestCache(self.cache_file).store(3, 1, {"state": "closed"})
+        self.assertEqual(MergeRequestCache(self.cache_file).peek("3", 1), {"state": "closed"})
+
+    def test_reopened_mr_is_not_reloaded(self):
+        cache = MergeRequestCache(self.cache_file)
+        cache.store(3, 1, {"state": "closed"})
+        cache.store(3, 2, {"state": "merged"})
+        cache.store(3, 1, {"state": "opened"})
+        self.assertEqual(self.line_count(), 3)
+
+        restarted = MergeRequestCache(self.cache_file, ttl=0)
+        self.assertIsNone(restarted.peek(3, 1))
+        self.assertEqual(restarted.peek(3, 2), {"state": "merged"})
+        # Only the latest record of every MR is kept
+        self.assertEqual(self.line_count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from projects.merger.merge_watermark import MergeWatermark
+
+MR_URL = "http://gitlab.sibisoft.com:7070/root/NS61x/-/merge_requests/1"
+
+
+class MergeWatermarkFailureTest(unittest.TestCase):
+    """
+    A ticket whose Mantis writes failed keeps its updated_at, so it must not be skipped next time.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.directory, "state.json")
+        self.ticket = {"id": 10, "updated_at": "2026-01-01T00:00:00", "notes": [{"id": 1, "text": f"MR {MR_URL}"}]}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_once(self, fail=False):
+        watermark = MergeWatermark(self.state_file, "102711", incremental=True, full_sweep_hours=0)
+        skipped = watermark.should_skip(self.ticket)
+        watermark.record_merge_request(MR_URL, {"state": "merged"})
+        if fail:
+            watermark.record_failure(self.ticket)
+        watermark.save()
+        return skipped
+
+    def test_unchanged_ticket_is_skipped(self):
+        self.run_once()
+        self.assertTrue(self.run_once())
+
+    def test_failed_ticket_is_processed_again(self):
+        self.run_once(fail=True)
+        self.assertFalse(self.run_once())
+        # Once its writes succeed the ticket is skipped again
+        self.assertTrue(self.run_once())
+
+
+if __name__ == "__main__":
+    unittest.main()
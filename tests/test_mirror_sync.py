@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from operations.gitlab_operations import GitLabOperations
+from operations.local_mirror import LocalMirror
+from operations.merge_request_cache import MergeRequestCache
+from projects import mirror_sync
+
+MR_BASE = "http://gitlab.sibisoft.com:7070/root/NS61x/-/merge_requests/"
+
+
+class MirrorSyncWarmCacheTest(unittest.TestCase):
+    """
+    MRs served by the shared MR cache must still reach the mirror, so later syncs see them as settled.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.mirror = LocalMirror(os.path.join(self.directory, "mirror.sqlite3"))
+
+        # Warm cache: a merged MR (kept for good) and an opened one inside its TTL
+        self.cache = MergeRequestCache(ttl=3600)
+        self.cache.store("3", 1, {"iid": 1, "project_id": 3, "state": "merged"})
+        self.cache.store("3", 2, {"iid": 2, "project_id": 3, "state": "opened"})
+
+        self.gitlab = GitLabOperations.__new__(GitLabOperations)
+        self.gitlab.gitlab_path = "http://gitlab.test"
+        self.gitlab.headers = {}
+        self.gitlab.http = mock.Mock()
+        self.gitlab.mirror = self.mirror
+        self.gitlab.mr_cache = self.cache
+
+        self.mantis = mock.Mock()
+        self.mantis.mirror = self.mirror
+        self.mantis.normalize_filter_ids.return_value = [102711]
+        self.mantis.iter_tickets_from_filter.side_effect = lambda *args, **kwargs: iter([
+            {"id": 10, "notes": [{"id": 1, "text": f"MR {MR_BASE}1 and {MR_BASE}2"}]}
+        ])
+
+    def tearDown(self):
+        self.mirror._conn.close()
+        shutil.rmtree(self.directory)
+
+    def sync(self):
+        with mock.patch.object(mirror_sync, "MantisOperations", return_value=self.mantis), \
+                mock.patch.object(mirror_sync, "GitLabOperations", return_value=self.gitlab):
+            mirror_sync.sync_mirror()
+        self.assertEqual(mirror_sync.progress["status"], "completed")
+
+    def test_cached_merge_requests_are_mirrored(self):
+        self.sync()
+
+        self.assertEqual(self.mirror.get_merge_request("3", 1, float("inf"))["state"], "merged")
+        self.assertEqual(self.mirror.get_merge_request("3", 2, float("inf"))["state"], "opened")
+        self.gitlab.http.get.assert_not_called()
+
+    def test_second_sync_skips_settled_merge_requests(self):
+        self.sync()
+        with mock.patch.object(mirror_sync, "_sync_merge_request", wraps=mirror_sync._sync_merge_request) as sync_merge_request:
+            self.sync()
+
+        # The merged MR is settled in the mirror, only the opened one is read again
+        self.assertEqual([call.args[1] for call in sync_merge_request.call_args_list], [f"{MR_BASE}2"])
+        self.assertEqual(self.mirror.get_stats()["merge_requests"], 2)
+        self.gitlab.http.get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
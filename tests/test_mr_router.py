@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from operations.local_mirror import LocalMirror
+from operations.mr_router import MergeRequestRouter
+
+MR_BASE = "http://gitlab.sibisoft.com:7070/root/NS61x/-/merge_requests/"
+LEGACY_MR_BASE = "http://gitlab.sibisoft.com:7070/root/NS61x/merge_requests/"
+
+
+class SameMergeRequestTest(unittest.TestCase):
+    """
+    Notes may link an MR without the "/-/" GitLab puts in the URLs it sends.
+    """
+
+    def test_url_forms_match(self):
+        self.assertTrue(MergeRequestRouter.same_merge_request(LEGACY_MR_BASE + "5", MR_BASE + "5"))
+        self.assertFalse(MergeRequestRouter.same_merge_request(LEGACY_MR_BASE + "5", MR_BASE + "55"))
+        self.assertFalse(MergeRequestRouter.same_merge_request(MR_BASE + "5", "http://gitlab.sibisoft.com:7070/root/nscp30/-/merge_requests/5"))
+
+    def test_mirror_finds_tickets_with_either_form(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        mirror = LocalMirror(os.path.join(directory, "mirror.sqlite3"))
+        mirror.upsert_tickets([
+            {"id": 1, "notes": [{"id": 1, "text": f"MR {LEGACY_MR_BASE}5"}]},
+            {"id": 2, "notes": [{"id": 2, "text": f"MR {MR_BASE}5"}]},
+            {"id": 3, "notes": [{"id": 3, "text": f"MR {MR_BASE}55"}]},
+        ])
+        self.assertEqual(sorted(mirror.find_tickets_by_merge_request(MR_BASE + "5")), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import requests
+
+from operations.http_transport import HttpTransport
+from operations.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def wait_time(limiter):
+    """
+    Seconds until the limiter hands out a token (0.0 if it does now), or None while every slot is taken.
+    """
+    with limiter._cond:
+        acquired, wait = limiter._try_acquire(limiter.clock())
+    if acquired:
+        limiter.release()
+    return wait
+
+
+def make_response(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+class AimdTest(unittest.TestCase):
+    """
+    Pushback cuts the rate and concurrency multiplicatively, successes raise them additively.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveRateLimiter("test", rate=10, burst=5, min_rate=1, max_rate=12,
+                                           max_concurrency=8, clock=self.clock)
+
+    def test_throttle_halves_rate_and_concurrency(self):
+        self.limiter.acquire()
+        self.limiter.release(throttled=True)
+        metrics = self.limiter.get_metrics()
+        self.assertEqual((metrics["rate"], metrics["concurrency"], metrics["throttled"]), (5.0, 4, 1))
+        # The bucket is emptied, the next token comes after 1 / rate seconds
+        self.assertAlmostEqual(wait_time(self.limiter), 0.2)
+
+    def test_throttles_within_a_second_cut_once(self):
+        for _ in range(3):
+            self.limiter.acquire()
+        for _ in range(3):
+            self.limiter.release(throttled=True)
+        self.assertEqual(self.limiter.get_metrics()["rate"], 5.0)
+
+        self.clock.advance(1.0)
+        self.limiter.acquire()
+        self.limiter.release(throttled=True)
+        self.assertEqual(self.limiter.get_metrics()["rate"], 2.5)
+
+    def test_rate_never_drops_below_min_rate(self):
+        for _ in range(6):
+            self.clock.advance(1.0)
+            self.limiter.acquire()
+            self.limiter.release(throttled=True)
+        metrics = self.limiter.get_metrics()
+        self.assertEqual((metrics["rate"], metrics["concurrency"]), (1.0, 1))
+
+    def test_successes_recover_additively_up_to_max_rate(self):
+        self.limiter.acquire()
+        self.limiter.release(throttled=True)
+        self.clock.advance(1.0)
+        self.limiter.acquire()
+        self.limiter.release()
+        metrics = self.limiter.get_metrics()
+        # rate + increase_step / rate and concurrency + 1 / concurrency
+        self.assertEqual((metrics["rate"], metrics["concurrency"]), (5.1, 4))
+
+        for _ in range(500):
+            self.clock.advance(1.0)
+            self.limiter.acquire()
+            self.limiter.release()
+        metrics = self.limiter.get_metrics()
+        self.assertEqual((metrics["rate"], metrics["concurrency"]), (12.0, 8))
+
+    def test_failed_requests_leave_the_rate_unchanged(self):
+        self.limiter.acquire()
+        self.limiter.release(failed=True)
+        self.assertEqual(self.limiter.get_metrics()["rate"], 10.0)
+
+
+class RetryAfterTest(unittest.TestCase):
+    """
+    Retry-After is honoured in both its forms, and backoffs never exceed the cap.
+    """
+
+    def test_retry_after_blocks_until_it_has_passed(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter("test", rate=10, burst=5, clock=clock)
+        limiter.acquire()
+        limiter.release(throttled=True, retry_after=30)
+        self.assertAlmostEqual(wait_time(limiter), 30.0)
+
+        clock.advance(29.5)
+        self.assertAlmostEqual(wait_time(limiter), 0.5)
+        clock.advance(0.5)
+        self.assertEqual(wait_time(limiter), 0.0)
+
+    def test_parse_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertEqual(parse_retry_after("-5"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_parse_http_date(self):
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 2026 00:02:00 GMT", now=now), 120.0)
+        self.assertEqual(parse_retry_after("Wed, 31 Dec 2025 23:59:00 GMT", now=now), 0.0)
+
+    def test_backoff_delay_is_capped(self):
+        limiter = AdaptiveRateLimiter("test", backoff_base=1.0, backoff_cap=60.0)
+        self.assertEqual(limiter.backoff_delay(0, retry_after=600), 60.0)
+        self.assertEqual(limiter.backoff_delay(0, retry_after=12), 12.0)
+        for _ in range(100):
+            self.assertLessEqual(limiter.backoff_delay(0), 1.0)
+            self.assertLessEqual(limiter.backoff_delay(20), 60.0)
+
+
+class TransportThrottleTest(unittest.TestCase):
+    """
+    HttpTransport retries 429/503 answers through the limiter and reports them to it.
+    """
+
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter("test", rate=50, burst=10)
+        self.transport = HttpTransport("test", "http://mantis.test", rate_limiter=self.limiter, throttle_retries=2)
+
+    def test_throttled_request_is_retried(self):
+        responses = [make_response(429, retry_after="0"), make_response(200)]
+        with mock.patch.object(self.transport.session, "request", side_effect=responses) as request:
+            response = self.transport.get("http://mantis.test/api/rest/issues/1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(self.limiter.get_metrics()["throttled"], 1)
+        self.assertEqual(self.limiter.get_metrics()["in_flight"], 0)
+
+    def test_last_response_is_returned_once_retries_are_exhausted(self):
+        responses = [make_response(503, retry_after="0") for _ in range(3)]
+        with mock.patch.object(self.transport.session, "request", side_effect=responses) as request:
+            response = self.transport.get("http://mantis.test/api/rest/issues/1")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(request.call_count, 3)
+
+
+class AsyncAcquireTest(unittest.TestCase):
+    """
+    Coroutines draw from the same bucket as threads and follow its AIMD and Retry-After rules.
+    """
+
+    def test_async_callers_are_held_to_the_rate(self):
+        limiter = AdaptiveRateLimiter("test", rate=20, burst=2, max_rate=20, max_concurrency=100)
+
+        async def call():
+            await limiter.acquire_async()
+            limiter.release()
+
+        async def main():
+            await asyncio.gather(*(call() for _ in range(12)))
+
+        started = time.monotonic()
+        asyncio.run(main())
+        # 2 burst tokens, then 10 tokens at 20/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.45)
+
+    def test_retry_after_holds_async_callers(self):
+        limiter = AdaptiveRateLimiter("test", rate=50, burst=5, max_concurrency=4)
+        limiter.acquire()
+        limiter.release(throttled=True, retry_after=0.3)
+        self.assertEqual(limiter.get_metrics()["concurrency"], 2)
+
+        started = time.monotonic()
+        asyncio.run(limiter.acquire_async())
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+        limiter.release()
+
+    def test_async_callers_share_in_flight_slots_with_threads(self):
+        limiter = AdaptiveRateLimiter("test", rate=50, burst=5, max_concurrency=1)
+        limiter.acquire()
+        threading.Timer(0.2, limiter.release).start()
+
+        started = time.monotonic()
+        asyncio.run(limiter.acquire_async())
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        limiter.release()
+
+
+if __name__ == "__main__":
+    unittest.main()